@@ -1,5 +1,29 @@
+from .client_registry import (
+    CLIENT_REGISTRY,
+    MongoClientRegistry,
+    MongoClientSettings,
+    client_settings_from_env,
+    write_concern_from_env,
+)
+from .command_metrics import (
+    COMMAND_METRICS,
+    CommandMetricsListener,
+    CommandMetricsSnapshot,
+    log_command_metrics,
+    track_db_operation,
+)
 from .database import BackendDatabase
 
 __all__ = [
     'BackendDatabase',
+    'CLIENT_REGISTRY',
+    'COMMAND_METRICS',
+    'CommandMetricsListener',
+    'CommandMetricsSnapshot',
+    'MongoClientRegistry',
+    'MongoClientSettings',
+    'client_settings_from_env',
+    'log_command_metrics',
+    'track_db_operation',
+    'write_concern_from_env',
 ]
@@ -0,0 +1,188 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib.util import find_spec
+from threading import Lock
+import atexit
+import logging
+import os
+
+from pymongo import MongoClient
+from pymongo.write_concern import WriteConcern
+
+from .command_metrics import COMMAND_METRICS
+
+# Attach the command metrics listener to every client unless disabled
+COMMAND_METRICS_ENABLED = os.getenv("MONGO_COMMAND_METRICS", "1").strip().lower() not in ("0", "false", "no")
+
+# Wire compressors in preference order, with the module each one needs
+_COMPRESSOR_MODULES = {
+    "zstd": "zstandard",
+    "snappy": "snappy",
+    "zlib": None,
+}
+
+@lru_cache(maxsize=1)
+def read_server_name() -> str:
+    """Read the Mongo server name once per process."""
+    with open('src/database/db_server.txt', 'r', encoding='utf8') as serverFile:
+        return serverFile.read().strip()
+
+def _env_value(workload: str | None, name: str) -> str | None:
+    """Return ``MONGO_<WORKLOAD>_<NAME>`` when set, falling back to ``MONGO_<NAME>``."""
+    if workload is not None:
+        value = os.getenv(f"MONGO_{workload.upper()}_{name}")
+        if value is not None and value.strip() != "":
+            return value.strip()
+
+    value = os.getenv(f"MONGO_{name}")
+    if value is not None and value.strip() != "":
+        return value.strip()
+
+    return None
+
+def _env_int(workload: str | None, name: str, default: int | None) -> int | None:
+    value = _env_value(workload, name)
+    if value is None:
+        return default
+
+    try:
+        return max(0, int(value))
+    except ValueError:
+        logging.warning(f"Ignoring invalid MONGO_{name} value {value!r}")
+        return default
+
+def available_compressors(requested: str) -> tuple[str, ...]:
+    """Return the requested compressors whose Python support is installed."""
+    compressors: list[str] = []
+    for name in requested.split(","):
+        name = name.strip().lower()
+        if name == "" or name in compressors:
+            continue
+        if name not in _COMPRESSOR_MODULES:
+            logging.warning(f"Ignoring unknown Mongo compressor {name!r}")
+            continue
+
+        module = _COMPRESSOR_MODULES[name]
+        if module is not None and find_spec(module) is None:
+            logging.debug(f"Mongo compressor {name} skipped, {module} is not installed")
+            continue
+        compressors.append(name)
+
+    return tuple(compressors)
+
+@dataclass(frozen=True)
+class MongoClientSettings:
+    """Connection pool options for a shared MongoClient.
+
+    Workloads with equal settings share one client, and so one pool and one
+    set of monitor threads. Timeouts are in milliseconds; None keeps the
+    pymongo default.
+    """
+
+    max_pool_size: int = 20
+    min_pool_size: int = 0
+    max_idle_time_ms: int | None = 300_000
+    wait_queue_timeout_ms: int | None = None
+    connect_timeout_ms: int | None = 5_000
+    server_selection_timeout_ms: int | None = 10_000
+    socket_timeout_ms: int | None = None
+    compressors: tuple[str, ...] = ()
+
+    def client_options(self) -> dict[str, object]:
+        options: dict[str, object] = {
+            "maxPoolSize": self.max_pool_size,
+            "minPoolSize": self.min_pool_size,
+            "appname": "website-backend",
+        }
+        optional_options = {
+            "maxIdleTimeMS": self.max_idle_time_ms,
+            "waitQueueTimeoutMS": self.wait_queue_timeout_ms,
+            "connectTimeoutMS": self.connect_timeout_ms,
+            "serverSelectionTimeoutMS": self.server_selection_timeout_ms,
+            "socketTimeoutMS": self.socket_timeout_ms,
+        }
+        options.update({key: value for key, value in optional_options.items() if value is not None})
+        if len(self.compressors) > 0:
+            options["compressors"] = ",".join(self.compressors)
+        return options
+
+def client_settings_from_env(workload: str | None = None) -> MongoClientSettings:
+    """Build client settings from ``MONGO_*`` env vars, with per-workload overrides."""
+    defaults = MongoClientSettings()
+    return MongoClientSettings(
+        max_pool_size=max(1, _env_int(workload, "MAX_POOL_SIZE", defaults.max_pool_size) or 0),
+        min_pool_size=_env_int(workload, "MIN_POOL_SIZE", defaults.min_pool_size) or 0,
+        max_idle_time_ms=_env_int(workload, "MAX_IDLE_TIME_MS", defaults.max_idle_time_ms),
+        wait_queue_timeout_ms=_env_int(workload, "WAIT_QUEUE_TIMEOUT_MS", defaults.wait_queue_timeout_ms),
+        connect_timeout_ms=_env_int(workload, "CONNECT_TIMEOUT_MS", defaults.connect_timeout_ms),
+        server_selection_timeout_ms=_env_int(
+            workload, "SERVER_SELECTION_TIMEOUT_MS", defaults.server_selection_timeout_ms
+        ),
+        socket_timeout_ms=_env_int(workload, "SOCKET_TIMEOUT_MS", defaults.socket_timeout_ms),
+        compressors=available_compressors(
+            _env_value(workload, "COMPRESSORS") or "zstd,snappy,zlib"
+        ),
+    )
+
+def write_concern_from_env(workload: str | None = None) -> WriteConcern | None:
+    """Build the write concern for a workload from ``MONGO_*`` env vars.
+
+    Returns None when nothing is configured so the server default applies.
+    """
+    w_value = _env_value(workload, "WRITE_CONCERN_W")
+    journal_value = _env_value(workload, "WRITE_CONCERN_JOURNAL")
+    wtimeout = _env_int(workload, "WRITE_CONCERN_TIMEOUT_MS", None)
+
+    if w_value is None and journal_value is None and wtimeout is None:
+        return None
+
+    w: int | str | None = None
+    if w_value is not None:
+        w = int(w_value) if w_value.isdigit() else w_value
+
+    journal = None
+    if journal_value is not None:
+        journal = journal_value.lower() in ("1", "true", "yes")
+
+    return WriteConcern(w=w, wtimeout=wtimeout, j=journal)
+
+class MongoClientRegistry:
+    """Process-wide MongoClients keyed by server name and pool settings."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._clients: dict[tuple[str, MongoClientSettings], MongoClient] = {}
+
+    def get_client(self, settings: MongoClientSettings, server_name: str | None = None) -> MongoClient:
+        server_name = server_name if server_name is not None else read_server_name()
+        key = (server_name, settings)
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                event_listeners = [COMMAND_METRICS] if COMMAND_METRICS_ENABLED else []
+                client = MongoClient(
+                    server_name,
+                    27017,
+                    event_listeners=event_listeners,
+                    **settings.client_options(),
+                )
+                self._clients[key] = client
+                logging.debug(f"Created MongoClient for {server_name} with {settings}")
+            return client
+
+    def client_count(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def close_all(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+
+        for client in clients:
+            client.close()
+
+CLIENT_REGISTRY = MongoClientRegistry()
+
+atexit.register(CLIENT_REGISTRY.close_all)
@@ -0,0 +1,218 @@
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any
+import logging
+import os
+
+from pymongo import monitoring
+
+# Upper bounds in milliseconds for command latency histograms; a final bucket catches the rest
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Commands slower than this are logged individually
+SLOW_COMMAND_MS = max(0, int(os.getenv("MONGO_SLOW_COMMAND_MS", "200")))
+
+# Label for commands issued outside any track_db_operation block
+UNATTRIBUTED = "unattributed"
+
+# Started commands whose result never arrives are dropped past this many
+_MAX_IN_FLIGHT = 10_000
+
+_current_operation: ContextVar[str] = ContextVar("db_operation", default=UNATTRIBUTED)
+
+@contextmanager
+def track_db_operation(label: str) -> Iterator[None]:
+    """Attribute Mongo commands issued in this block, or decorated function, to ``label``."""
+    token = _current_operation.set(label)
+    try:
+        yield
+    finally:
+        _current_operation.reset(token)
+
+@dataclass(frozen=True)
+class CommandMetricsSnapshot:
+    """Point-in-time totals for one (operation, namespace, command) combination.
+
+    ``latency_counts`` has one bucket per ``LATENCY_BUCKETS_MS`` bound plus an
+    overflow bucket. ``documents`` counts documents returned or written.
+    """
+
+    operation: str
+    namespace: str
+    command: str
+    count: int
+    failures: int
+    total_ms: float
+    max_ms: float
+    documents: int
+    latency_counts: tuple[int, ...]
+
+    @property
+    def mean_ms(self) -> float | None:
+        return self.total_ms / self.count if self.count > 0 else None
+
+@dataclass
+class _CommandStats:
+    count: int = 0
+    failures: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    documents: int = 0
+    latency_counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+
+@dataclass(frozen=True)
+class _StartedCommand:
+    operation: str
+    namespace: str
+    command: str
+    documents_sent: int
+
+def _command_collection(command_name: str, command: Any) -> str | None:
+    if command_name == "getMore":
+        collection = command.get("collection")
+    else:
+        collection = command.get(command_name)
+    return collection if isinstance(collection, str) else None
+
+def _documents_sent(command_name: str, command: Any) -> int:
+    batch_field = {"insert": "documents", "update": "updates", "delete": "deletes"}.get(command_name)
+    if batch_field is None:
+        return 0
+    batch = command.get(batch_field)
+    return len(batch) if isinstance(batch, list) else 0
+
+def _documents_in_reply(reply: Any) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        batch = cursor.get("firstBatch", cursor.get("nextBatch"))
+        if isinstance(batch, list):
+            return len(batch)
+
+    values = reply.get("values")
+    if isinstance(values, list):
+        return len(values)
+
+    return 0
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Collect per-operation, per-namespace, per-command latency and document counts."""
+
+    def __init__(self, slow_command_ms: int = SLOW_COMMAND_MS) -> None:
+        self.slow_command_ms = slow_command_ms
+        self._lock = Lock()
+        self._in_flight: dict[tuple[Any, int], _StartedCommand] = {}
+        self._stats: dict[tuple[str, str, str], _CommandStats] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        collection = _command_collection(event.command_name, event.command)
+        namespace = f"{event.database_name}.{collection}" if collection else event.database_name
+        started = _StartedCommand(
+            _current_operation.get(),
+            namespace,
+            event.command_name,
+            _documents_sent(event.command_name, event.command),
+        )
+
+        with self._lock:
+            if len(self._in_flight) >= _MAX_IN_FLIGHT:
+                self._in_flight.clear()
+            self._in_flight[(event.connection_id, event.request_id)] = started
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        reply = event.reply
+        documents = _documents_in_reply(reply)
+        if documents == 0 and isinstance(reply.get("n"), int):
+            documents = reply["n"]
+        self._finish(event, documents, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, 0, failed=True)
+
+    def _finish(
+        self,
+        event: monitoring.CommandSucceededEvent | monitoring.CommandFailedEvent,
+        documents: int,
+        failed: bool,
+    ) -> None:
+        duration_ms = event.duration_micros / 1000
+
+        with self._lock:
+            started = self._in_flight.pop((event.connection_id, event.request_id), None)
+            if started is None:
+                return
+
+            documents = max(documents, started.documents_sent)
+            stats = self._stats.setdefault(
+                (started.operation, started.namespace, started.command), _CommandStats()
+            )
+            stats.count += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            stats.documents += documents
+            stats.latency_counts[bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+            if failed:
+                stats.failures += 1
+
+        if duration_ms >= self.slow_command_ms:
+            logging.warning(
+                "Slow Mongo command %s on %s took %.0f ms (operation=%s documents=%s%s)",
+                started.command,
+                started.namespace,
+                duration_ms,
+                started.operation,
+                documents,
+                " failed" if failed else "",
+            )
+
+    def snapshot(self) -> list[CommandMetricsSnapshot]:
+        """Return totals for every (operation, namespace, command) seen, slowest total first."""
+        with self._lock:
+            snapshots = [
+                CommandMetricsSnapshot(
+                    operation,
+                    namespace,
+                    command,
+                    stats.count,
+                    stats.failures,
+                    stats.total_ms,
+                    stats.max_ms,
+                    stats.documents,
+                    tuple(stats.latency_counts),
+                )
+                for (operation, namespace, command), stats in self._stats.items()
+            ]
+
+        return sorted(snapshots, key=lambda snapshot: snapshot.total_ms, reverse=True)
+
+    def time_by_operation(self) -> dict[str, float]:
+        """Return total Mongo time in milliseconds for each tracked operation."""
+        totals: dict[str, float] = {}
+        for snapshot in self.snapshot():
+            totals[snapshot.operation] = totals.get(snapshot.operation, 0.0) + snapshot.total_ms
+        return totals
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+COMMAND_METRICS = CommandMetricsListener()
+
+def log_command_metrics(limit: int = 10) -> None:
+    """Log the ``limit`` most expensive (operation, namespace, command) entries."""
+    for snapshot in COMMAND_METRICS.snapshot()[:limit]:
+        logging.info(
+            "Mongo %s %s [%s]: count=%s failures=%s total=%.0f ms mean=%.1f ms max=%.0f ms documents=%s",
+            snapshot.command,
+            snapshot.namespace,
+            snapshot.operation,
+            snapshot.count,
+            snapshot.failures,
+            snapshot.total_ms,
+            snapshot.mean_ms or 0.0,
+            snapshot.max_ms,
+            snapshot.documents,
+        )
@@ -1,17 +1,21 @@
-from pymongo import MongoClient
 from pymongo.database import Database
 from pymongo.collection import Collection
 
+from .client_registry import CLIENT_REGISTRY, client_settings_from_env, write_concern_from_env
+
 class BackendDatabase:
-    def __init__(self) -> None:
-        """Creates a Database instance, creates a connection to the Mongo DB
-        """
-        with open('src/database/db_server.txt', 'r', encoding='utf8') as serverFile:
-            serverName = serverFile.read().strip()
+    def __init__(self, workload: str | None = None) -> None:
+        """Creates a Database instance backed by the shared client for ``workload``
 
-            self.client = MongoClient(serverName, 27017)
+        Args:
+            workload (str | None, optional): Name used to look up per-workload
+                ``MONGO_<WORKLOAD>_*`` settings. Workloads with equal pool settings
+                share one MongoClient. Defaults to None, which uses ``MONGO_*`` only.
+        """
+        self.client = CLIENT_REGISTRY.get_client(client_settings_from_env(workload))
+        self.write_concern = write_concern_from_env(workload)
 
-            self.current_db: Database | None = None
+        self.current_db: Database | None = None
 
     def set_database(self, db_name: str) -> Database | None:
         """Set the database within the Mongo instance
@@ -22,13 +26,13 @@ class BackendDatabase:
         Returns:
             The database in use
         """
-        self.current_db = self.client[db_name]
+        self.current_db = self.get_database(db_name)
 
         return self.current_db
 
     def get_database(self, db_name: str) -> Database:
         """Return a database handle without changing ``current_db``."""
-        return self.client[db_name]
+        return self.client.get_database(db_name, write_concern=self.write_concern)
 
     def get_collection(self, collection_name: str, db_name: str | None = None) -> Collection | None:
         """Gets a collection object given the name of the collection and, optionally, the name of the database
@@ -42,7 +46,7 @@ class BackendDatabase:
             The collection or None if it does not exist
         """
         if db_name is not None:
-            return self.client[db_name][collection_name]
+            return self.get_database(db_name)[collection_name]
         elif self.current_db is not None:
             return self.current_db[collection_name]
         else:
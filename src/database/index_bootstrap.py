@@ -21,6 +21,7 @@ def _index_matches(
     keys: list[tuple[str, int]],
     unique: bool,
     partial_filter_expression: dict[str, Any] | None,
+    expire_after_seconds: int | None = None,
 ) -> bool:
     existing_keys = index_meta.get("key")
     existing_unique = bool(index_meta.get("unique", False))
@@ -30,6 +31,8 @@ def _index_matches(
         return False
     if existing_partial != partial_filter_expression:
         return False
+    if index_meta.get("expireAfterSeconds") != expire_after_seconds:
+        return False
     if unique and not existing_unique:
         return False
 
@@ -47,12 +50,13 @@ def _ensure_index(
     *,
     unique: bool = False,
     partial_filter_expression: dict[str, Any] | None = None,
+    expire_after_seconds: int | None = None,
 ) -> None:
     # Reuse equivalent existing indexes regardless of name to avoid name conflicts.
     existing_indexes = collection.index_information()
 
     for index_meta in existing_indexes.values():
-        if _index_matches(index_meta, keys, unique, partial_filter_expression):
+        if _index_matches(index_meta, keys, unique, partial_filter_expression, expire_after_seconds):
             return
 
     # If an index already exists on the same key pattern with different options,
@@ -72,6 +76,10 @@ def _ensure_index(
             logging.warning(
                 f"Index {collection.full_name}.{index_name} matches keys {keys} but is not unique; requested unique index ensure skipped"
             )
+        elif index_meta.get("expireAfterSeconds") != expire_after_seconds:
+            logging.warning(
+                f"Index {collection.full_name}.{index_name} matches keys {keys} but expireAfterSeconds differs; requested ensure skipped"
+            )
 
         return
 
@@ -79,6 +87,8 @@ def _ensure_index(
         create_kwargs: dict[str, Any] = {"unique": unique}
         if partial_filter_expression is not None:
             create_kwargs["partialFilterExpression"] = partial_filter_expression
+        if expire_after_seconds is not None:
+            create_kwargs["expireAfterSeconds"] = expire_after_seconds
 
         collection.create_index(keys, **create_kwargs)
     except OperationFailure as ex:
@@ -297,6 +307,7 @@ def ensure_backend_indexes() -> None:
         _ensure_index(feed_sources, [("next_refresh_at", ASCENDING)])
         _ensure_index(feed_sources, [("next_retry_at", ASCENDING)])
         _ensure_index(feed_sources, [("force_refresh_requested_at", ASCENDING)])
+        _ensure_index(feed_sources, [("last_fetched_at", ASCENDING)])
 
     feed_articles = database.get_collection("feed_articles")
     if feed_articles is not None:
@@ -323,6 +334,26 @@ def ensure_backend_indexes() -> None:
         )
         _ensure_index(feed_articles, [("feed_id", ASCENDING), ("published_at", ASCENDING)])
         _ensure_index(feed_articles, [("is_deleted", ASCENDING), ("deleted_at", ASCENDING)])
+        _ensure_index(feed_articles, [("is_deleted", ASCENDING), ("_id", ASCENDING)])
+        # Retention phases walk candidates in _id order and filter on age and the unread counter
+        _ensure_index(
+            feed_articles,
+            [
+                ("is_deleted", ASCENDING),
+                ("_id", ASCENDING),
+                ("fetched_at", ASCENDING),
+                ("unread_subscriber_count", ASCENDING),
+            ],
+        )
+        _ensure_index(
+            feed_articles,
+            [
+                ("is_deleted", ASCENDING),
+                ("_id", ASCENDING),
+                ("deleted_at", ASCENDING),
+                ("unread_subscriber_count", ASCENDING),
+            ],
+        )
         _ensure_index(feed_articles, [("_id", ASCENDING), ("feed_id", ASCENDING)])
         _ensure_text_index(
             feed_articles,
@@ -370,6 +401,27 @@ def ensure_backend_indexes() -> None:
         )
         _ensure_index(user_article_states, [("article_id", ASCENDING), ("is_read", ASCENDING)])
 
+    user_feed_unread_counts = database.get_collection("user_feed_unread_counts")
+    if user_feed_unread_counts is not None:
+        _ensure_index(
+            user_feed_unread_counts,
+            [("user_id", ASCENDING), ("feed_id", ASCENDING)],
+            unique=True,
+        )
+
+    article_image_scrape_results = database.get_collection("article_image_scrape_results")
+    if article_image_scrape_results is not None:
+        # Each result carries its own expiry time
+        _ensure_index(article_image_scrape_results, [("expires_at", ASCENDING)], expire_after_seconds=0)
+
+    article_image_scrape_jobs = database.get_collection("article_image_scrape_jobs")
+    if article_image_scrape_jobs is not None:
+        _ensure_index(
+            article_image_scrape_jobs,
+            [("priority", DESCENDING), ("available_at", ASCENDING)],
+        )
+        _ensure_index(article_image_scrape_jobs, [("article_ids", ASCENDING)])
+
     # media indexes
     database.set_database("media")
 
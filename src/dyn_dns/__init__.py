@@ -30,7 +30,7 @@ SYNOLOGY_GET_EXTERNAL_IP_METHOD = "list"
 
 
 # Get a backend database instance
-database = BackendDatabase()
+database = BackendDatabase("dyn_dns")
 
 # Set the database in use
 database.set_database("web_database")
@@ -86,9 +86,10 @@ except FileNotFoundError:
     logging.error("Failed to get the notify run endpoint. File not found.")
     NOTIFY_RUN_ENDPOINT = None
 
-from .dyn_dns import dyn_dns_loop
+from .dyn_dns import dyn_dns_loop, register_dyn_dns
 
-# Export the dyn_dns_loop function
+# Export the dyn_dns_loop and register_dyn_dns functions
 __all__ = [
     "dyn_dns_loop",
+    "register_dyn_dns",
 ]
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
 from threading import Event
 from zoneinfo import ZoneInfo
@@ -9,7 +10,7 @@ import requests
 
 from notify_run import Notify
 
-from task_scheduler import TaskScheduler
+from task_scheduler import TaskScheduler, WorkloadScheduler
 
 from . import (
     SYNOLOGY_API_BASE_URL,
@@ -37,7 +38,7 @@ class RecordType(Enum):
 
 
 class DynDns:
-    def __init__(self, scheduler: TaskScheduler) -> None:
+    def __init__(self, scheduler: TaskScheduler | WorkloadScheduler) -> None:
         # Store the scheduler
         self.scheduler = scheduler
 
@@ -283,6 +284,16 @@ class DynDns:
                         f"DNS Update Failed\nTried to update to {new_external_ip} but it failed. Current IP Address is {dyn_dns_details.current_external_ip}."
                     )
 
+    async def update_dns_async(self) -> None:
+        # The Synology login, lookup and logout calls depend on each other, so
+        # there is nothing to overlap; keep the blocking calls off the event loop
+        await asyncio.to_thread(self.update_dns)
+
+
+def register_dyn_dns(scheduler: TaskScheduler | WorkloadScheduler) -> DynDns:
+    """Create the dyn DNS worker and schedule its tasks on ``scheduler``."""
+    return DynDns(scheduler)
+
 
 def dyn_dns_loop(terminate_event: Event, log_level: int) -> None:
     # Initialise logging
@@ -294,7 +305,7 @@ def dyn_dns_loop(terminate_event: Event, log_level: int) -> None:
     scheduler = TaskScheduler()
 
     # Create a DynDns object
-    DynDns(scheduler)
+    register_dyn_dns(scheduler)
 
     # Run the task scheduler
     scheduler.run(terminate_event)
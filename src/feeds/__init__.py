@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from database import BackendDatabase
 
-DATABASE = BackendDatabase()
+DATABASE = BackendDatabase("feeds")
 DATABASE.set_database("feeds_database")
 
 FEED_SOURCES_COLLECTION = DATABASE.get_collection("feed_sources")
@@ -10,6 +10,9 @@ FEED_ARTICLES_COLLECTION = DATABASE.get_collection("feed_articles")
 USER_FEED_SUBSCRIPTIONS_COLLECTION = DATABASE.get_collection("user_feed_subscriptions")
 FEED_CATEGORIES_COLLECTION = DATABASE.get_collection("feed_categories")
 USER_ARTICLE_STATES_COLLECTION = DATABASE.get_collection("user_article_states")
+USER_FEED_UNREAD_COUNTS_COLLECTION = DATABASE.get_collection("user_feed_unread_counts")
+ARTICLE_IMAGE_SCRAPE_RESULTS_COLLECTION = DATABASE.get_collection("article_image_scrape_results")
+ARTICLE_IMAGE_SCRAPE_JOBS_COLLECTION = DATABASE.get_collection("article_image_scrape_jobs")
 
 __all__ = [
     "FEED_SOURCES_COLLECTION",
@@ -17,4 +20,7 @@ __all__ = [
     "USER_FEED_SUBSCRIPTIONS_COLLECTION",
     "FEED_CATEGORIES_COLLECTION",
     "USER_ARTICLE_STATES_COLLECTION",
+    "USER_FEED_UNREAD_COUNTS_COLLECTION",
+    "ARTICLE_IMAGE_SCRAPE_RESULTS_COLLECTION",
+    "ARTICLE_IMAGE_SCRAPE_JOBS_COLLECTION",
 ]
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from urllib.parse import urljoin
+import asyncio
+import logging
+
+import aiohttp
+
+from .url_safety import explain_public_http_url_block
+
+REDIRECT_STATUS_CODES = {301, 302, 303, 307, 308}
+# Mirrors the urllib3 Retry policy mounted on the synchronous feed session
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRY_TOTAL = 3
+RETRY_BACKOFF_SECONDS = 0.4
+
+
+class FeedFetchError(Exception):
+    """Raised when a feed URL cannot be fetched, blocked hops included."""
+
+
+@dataclass(slots=True)
+class FetchedFeedResponse:
+    """Fully read feed response with the attributes ``Feeds._store_source`` uses."""
+
+    url: str
+    status_code: int
+    headers: Mapping[str, str]
+    content: bytes
+    history: list[str] = field(default_factory=list)
+
+
+class AsyncFeedFetcher:
+    """aiohttp feed fetcher with the redirect and URL safety rules of the sync path.
+
+    One connector pool is shared by every fetch. It caps connections overall at
+    ``concurrency`` and per host at ``per_host_concurrency``, so a whole cycle of
+    sources can be awaited at once from one event loop. The session is created
+    lazily on first use, inside the running loop, and reopened if closed.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int,
+        per_host_concurrency: int,
+        timeout_seconds: float,
+        max_redirects: int,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        self.concurrency = concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.max_redirects = max_redirects
+        self.headers = dict(headers or {})
+        self._session: aiohttp.ClientSession | None = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.concurrency,
+                limit_per_host=self.per_host_concurrency,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                # requests applies its timeout to connect and to each read, not the whole body
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=self.timeout_seconds,
+                    sock_read=self.timeout_seconds,
+                ),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get_once(self, url: str, headers: Mapping[str, str]) -> FetchedFeedResponse:
+        """GET one hop without following redirects, retrying transient failures."""
+
+        for attempt in range(RETRY_TOTAL + 1):
+            retries_left = attempt < RETRY_TOTAL
+            try:
+                async with self.session.get(url, headers=headers, allow_redirects=False) as response:
+                    if response.status in RETRY_STATUS_CODES and retries_left:
+                        logging.debug(f"Retrying feed fetch {url} after HTTP {response.status}")
+                    else:
+                        content = b""
+                        if response.status not in REDIRECT_STATUS_CODES:
+                            content = await response.read()
+                        return FetchedFeedResponse(
+                            url=str(response.url),
+                            status_code=response.status,
+                            headers=response.headers.copy(),
+                            content=content,
+                        )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                if not retries_left:
+                    raise FeedFetchError(f"{type(exc).__name__}: {exc}") from exc
+                logging.debug(f"Retrying feed fetch {url} after {type(exc).__name__}: {exc}")
+
+            await asyncio.sleep(RETRY_BACKOFF_SECONDS * (2 ** attempt))
+
+        raise FeedFetchError(f"Retries exhausted for URL: {url}")
+
+    async def get_with_redirects(
+        self,
+        initial_url: str,
+        headers: Mapping[str, str],
+    ) -> FetchedFeedResponse:
+        """Fetch URL with bounded redirects while blocking non-public targets."""
+
+        current_url = str(initial_url).strip()
+        history: list[str] = []
+
+        for _ in range(self.max_redirects + 1):
+            block_reason = explain_public_http_url_block(current_url)
+            if block_reason is not None:
+                raise FeedFetchError(block_reason)
+
+            response = await self._get_once(current_url, headers)
+
+            if response.status_code not in REDIRECT_STATUS_CODES:
+                response.history = history
+                return response
+
+            redirect_location = str(response.headers.get("Location", "")).strip()
+            if redirect_location == "":
+                raise FeedFetchError(f"Redirect response missing Location header: {current_url}")
+
+            next_url = urljoin(current_url, redirect_location)
+            redirect_block_reason = explain_public_http_url_block(next_url)
+            if redirect_block_reason is not None:
+                raise FeedFetchError(redirect_block_reason)
+
+            history.append(current_url)
+            current_url = next_url
+
+        raise FeedFetchError(f"Exceeded redirect limit ({self.max_redirects}) for URL: {initial_url}")
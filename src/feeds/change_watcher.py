@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from threading import Event, Thread
+from typing import Any
+import logging
+
+from bson import ObjectId
+from pymongo.database import Database
+from pymongo.errors import OperationFailure, PyMongoError
+
+from .unread_counters import ReadStateChange
+
+# Server error codes meaning change streams are not supported by this deployment
+CHANGE_STREAMS_UNSUPPORTED_CODES = {
+    40573,  # The $changeStream stage is only supported on replica sets
+}
+# Wait before reopening a change stream after a transient error
+RESTART_DELAY_SECONDS = 5.0
+# How long one change stream read blocks before checking for shutdown
+MAX_AWAIT_TIME_MS = 1000
+
+
+def build_feed_change_pipeline(
+    sources_collection_name: str,
+    subscriptions_collection_name: str,
+    read_states_collection_name: str,
+) -> list[dict[str, Any]]:
+    """Return the pipeline selecting source inserts, force refreshes, subscription
+    inserts and deletes, and read flag changes."""
+
+    return [
+        {
+            "$match": {
+                "$or": [
+                    {
+                        "ns.coll": sources_collection_name,
+                        "operationType": "insert",
+                    },
+                    {
+                        "ns.coll": sources_collection_name,
+                        "operationType": "update",
+                        # The worker clears the marker with null on every fetch
+                        "updateDescription.updatedFields.force_refresh_requested_at": {"$type": "date"},
+                    },
+                    {
+                        "ns.coll": subscriptions_collection_name,
+                        "operationType": {"$in": ["insert", "delete"]},
+                    },
+                    {
+                        "ns.coll": read_states_collection_name,
+                        "operationType": "insert",
+                        "fullDocument.is_read": True,
+                    },
+                    {
+                        "ns.coll": read_states_collection_name,
+                        "operationType": "update",
+                        # No-op updates are not logged, so a listed flag has flipped
+                        "updateDescription.updatedFields.is_read": {"$exists": True},
+                    },
+                ]
+            }
+        },
+        {
+            "$project": {
+                "ns": 1,
+                "operationType": 1,
+                "documentKey": 1,
+                "fullDocument._id": 1,
+                "fullDocument.feed_id": 1,
+                "fullDocument.user_id": 1,
+                "fullDocument.article_id": 1,
+                "updateDescription.updatedFields.is_read": 1,
+            }
+        },
+    ]
+
+
+class FeedChangeWatcher:
+    """Background thread that reports feed sources needing an immediate fetch.
+
+    Watches ``feed_sources``, ``user_feed_subscriptions`` and read flags in
+    ``user_article_states`` with one database change stream, resuming from the
+    last seen token after errors. When the deployment does not support change
+    streams, such as a standalone mongod, it falls back to calling
+    ``poll_pending_sources`` every ``poll_interval_seconds``; subscription and
+    read flag changes are then left to periodic reloads and reconciles.
+    """
+
+    def __init__(
+        self,
+        database: Database,
+        sources_collection_name: str,
+        subscriptions_collection_name: str,
+        read_states_collection_name: str,
+        *,
+        on_sources_changed: Callable[[list[ObjectId]], None],
+        on_subscriptions_added: Callable[[list[Mapping[str, Any]]], None],
+        on_subscriptions_removed: Callable[[list[ObjectId]], None],
+        on_read_states_changed: Callable[[list[ReadStateChange]], None],
+        poll_pending_sources: Callable[[], list[ObjectId]],
+        poll_interval_seconds: float,
+    ) -> None:
+        self.database = database
+        self.sources_collection_name = sources_collection_name
+        self.subscriptions_collection_name = subscriptions_collection_name
+        self.read_states_collection_name = read_states_collection_name
+        self.on_sources_changed = on_sources_changed
+        self.on_subscriptions_added = on_subscriptions_added
+        self.on_subscriptions_removed = on_subscriptions_removed
+        self.on_read_states_changed = on_read_states_changed
+        self.poll_pending_sources = poll_pending_sources
+        self.poll_interval_seconds = poll_interval_seconds
+        self.polling = False
+
+        self._stop_event = Event()
+        self._resume_token: Mapping[str, Any] | None = None
+        self._thread: Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, name="feeds-change-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def handle_change(self, change: Mapping[str, Any]) -> None:
+        """Dispatch one change event to the matching callback."""
+
+        collection_name = change.get("ns", {}).get("coll")
+        # Update lookups return null when the document is gone by then
+        full_document = change.get("fullDocument") or {}
+        if collection_name == self.read_states_collection_name:
+            user_id = full_document.get("user_id")
+            article_id = full_document.get("article_id")
+            if change.get("operationType") == "insert":
+                is_read = True
+            else:
+                is_read = change.get("updateDescription", {}).get("updatedFields", {}).get("is_read")
+            if isinstance(user_id, str) and isinstance(article_id, ObjectId) and isinstance(is_read, bool):
+                self.on_read_states_changed([ReadStateChange(user_id, article_id, -1 if is_read else 1)])
+        elif collection_name == self.subscriptions_collection_name:
+            if change.get("operationType") == "delete":
+                subscription_id = change.get("documentKey", {}).get("_id")
+                if isinstance(subscription_id, ObjectId):
+                    self.on_subscriptions_removed([subscription_id])
+            elif isinstance(full_document.get("feed_id"), ObjectId):
+                self.on_subscriptions_added([full_document])
+        elif collection_name == self.sources_collection_name:
+            source_id = change.get("documentKey", {}).get("_id")
+            if isinstance(source_id, ObjectId):
+                self.on_sources_changed([source_id])
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            if self.polling:
+                self._poll_once()
+                self._stop_event.wait(self.poll_interval_seconds)
+                continue
+
+            try:
+                self._watch()
+            except OperationFailure as exc:
+                if exc.code in CHANGE_STREAMS_UNSUPPORTED_CODES:
+                    logging.info(f"Feed change streams unavailable, polling instead: {exc}")
+                    self.polling = True
+                    continue
+                logging.warning(f"Feed change stream failed, restarting: {exc}")
+                self._stop_event.wait(RESTART_DELAY_SECONDS)
+            except PyMongoError as exc:
+                logging.warning(f"Feed change stream failed, restarting: {exc}")
+                self._stop_event.wait(RESTART_DELAY_SECONDS)
+            except Exception as exc:
+                logging.exception(f"Feed change watcher failed unexpectedly: {exc}")
+                self._stop_event.wait(RESTART_DELAY_SECONDS)
+
+    def _watch(self) -> None:
+        pipeline = build_feed_change_pipeline(
+            self.sources_collection_name,
+            self.subscriptions_collection_name,
+            self.read_states_collection_name,
+        )
+        with self.database.watch(
+            pipeline,
+            full_document="updateLookup",
+            resume_after=self._resume_token,
+            max_await_time_ms=MAX_AWAIT_TIME_MS,
+        ) as stream:
+            # Changes missed while the stream was down are caught by the cycle
+            self._poll_once()
+
+            while not self._stop_event.is_set() and stream.alive:
+                change = stream.try_next()
+                self._resume_token = stream.resume_token
+                if change is not None:
+                    self.handle_change(change)
+
+    def _poll_once(self) -> None:
+        try:
+            source_ids = self.poll_pending_sources()
+        except PyMongoError as exc:
+            logging.warning(f"Feed pending-source poll failed: {exc}")
+            return
+
+        if len(source_ids) > 0:
+            self.on_sources_changed(source_ids)
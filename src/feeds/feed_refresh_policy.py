@@ -116,3 +116,45 @@ def source_needs_fetch(
         return next_refresh_at <= now
 
     return last_fetched_at <= (now - effective_interval)
+
+
+def source_next_due_at(
+    source_doc: dict[str, Any],
+    now: datetime,
+    default_fetch_interval: timedelta,
+    max_refresh_lag: timedelta = timedelta(minutes=2),
+) -> datetime:
+    """Return the earliest time at which ``source_needs_fetch`` becomes True.
+
+    Returns ``now`` for sources that are already due, so callers can keep
+    sources in a queue ordered by due time instead of polling each one.
+    """
+
+    last_fetched_at = _coerce_utc_datetime(source_doc.get("last_fetched_at"))
+    force_refresh_requested_at = _coerce_utc_datetime(
+        source_doc.get("force_refresh_requested_at")
+    )
+
+    if force_refresh_requested_at is not None:
+        if last_fetched_at is None or force_refresh_requested_at > last_fetched_at:
+            return now
+
+    next_refresh_at = _coerce_utc_datetime(source_doc.get("next_refresh_at"))
+
+    if last_fetched_at is None:
+        due_at = next_refresh_at if next_refresh_at is not None else now
+    else:
+        effective_interval = resolve_source_refresh_interval(source_doc, default_fetch_interval)
+        earliest_allowed_refresh = last_fetched_at + effective_interval
+        latest_allowed_refresh = earliest_allowed_refresh + max(timedelta(0), max_refresh_lag)
+
+        if next_refresh_at is None:
+            due_at = earliest_allowed_refresh
+        else:
+            due_at = min(latest_allowed_refresh, max(earliest_allowed_refresh, next_refresh_at))
+
+    next_retry_at = _coerce_utc_datetime(source_doc.get("next_retry_at"))
+    if next_retry_at is not None:
+        due_at = max(due_at, next_retry_at)
+
+    return max(now, due_at)
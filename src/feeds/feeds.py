@@ -1,38 +1,72 @@
 from __future__ import annotations
 
 from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
 from html import unescape
+import asyncio
+import codecs
 import hashlib
+import json
 import logging
 import os
 import re
 from threading import Lock, Thread
-from time import mktime, monotonic, sleep
-from typing import Any
+from time import mktime, monotonic
+from typing import Any, Callable, Iterable, Iterator, Mapping
 from urllib.parse import urljoin, urlparse, urlunparse
 
 import feedparser
 from bson import ObjectId
-from pymongo.errors import AutoReconnect, DuplicateKeyError, NetworkTimeout, ServerSelectionTimeoutError
+from pymongo.errors import (
+    AutoReconnect,
+    BulkWriteError,
+    DuplicateKeyError,
+    NetworkTimeout,
+    PyMongoError,
+    ServerSelectionTimeoutError,
+)
+from pymongo import ASCENDING, DESCENDING
+from pymongo.operations import UpdateOne
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from task_scheduler import TaskScheduler
+from database import track_db_operation
+from task_scheduler import MisfirePolicy, TaskPolicy, TaskScheduler, WorkloadScheduler
 
+from .async_fetch import REDIRECT_STATUS_CODES, AsyncFeedFetcher, FeedFetchError, FetchedFeedResponse
+from .change_watcher import FeedChangeWatcher
 from .feed_entry_media import extract_largest_media_image_url
 from .feed_refresh_policy import (
     MIN_REFRESH_INTERVAL,
     MAX_REFRESH_INTERVAL,
     resolve_source_refresh_interval,
     source_needs_fetch,
+    source_next_due_at,
+)
+from .image_result_cache import ArticleImageResultCache
+from .meta_image_scanner import scan_meta_image_url
+from .scrape_host_queue import HostScrapeQueue
+from .scrape_job_store import DEFAULT_SCRAPE_PRIORITY, LeasedScrapeJob, ScrapeJobStore
+from .source_due_queue import SourceDueQueue
+from .subscription_cache import SubscriptionCache
+from .unread_counters import (
+    UNREAD_COUNTER_FIELD,
+    read_users_by_article,
+    reconcile_unread_counters,
+    record_articles_inserted,
+    record_read_state_changes,
+    record_subscription_added,
 )
 from .feed_summary_images import extract_first_summary_image_url, strip_duplicate_summary_image
 from .url_safety import explain_public_http_url_block, is_public_http_url
 
 from . import (
+    ARTICLE_IMAGE_SCRAPE_JOBS_COLLECTION,
+    ARTICLE_IMAGE_SCRAPE_RESULTS_COLLECTION,
+    DATABASE,
     FEED_ARTICLES_COLLECTION,
     FEED_SOURCES_COLLECTION,
     USER_ARTICLE_STATES_COLLECTION,
@@ -73,17 +107,82 @@ FETCH_INTERVAL = timedelta(
 CYCLE_INTERVAL = timedelta(
     seconds=max(5, int(os.getenv("FEEDS_CYCLE_INTERVAL_SECONDS", "15")))
 )
+CYCLE_TIMEOUT = timedelta(
+    seconds=max(30, int(os.getenv("FEEDS_CYCLE_TIMEOUT_SECONDS", "300")))
+)
+# Source fetches in flight at once, overall and against any one hostname
+FETCH_CONCURRENCY = _read_env_positive_int("FEEDS_FETCH_CONCURRENCY", 8)
+FETCH_PER_HOST_CONCURRENCY = _read_env_positive_int("FEEDS_FETCH_PER_HOST_CONCURRENCY", 2)
 MAX_SCHEDULE_LAG = timedelta(
     seconds=min(120, max(0, int(os.getenv("FEEDS_MAX_REFRESH_LAG_SECONDS", "120"))))
 )
+# "sweep" checks every source each CYCLE_INTERVAL; "deadline" fetches each
+# source from an in-memory queue at exactly its next due time
+SCHEDULING_MODE = os.getenv("FEEDS_SCHEDULING_MODE", "sweep").strip().lower()
+# Subscribed flags on feed_sources are reconciled against subscriptions this often
+SUBSCRIPTION_SYNC_INTERVAL = timedelta(
+    seconds=_read_env_positive_int("FEEDS_SUBSCRIPTION_SYNC_SECONDS", 300)
+)
+# Shared by every task that fetches and stores sources (and their _async variants),
+# so a cycle, a due run and a requested run never fetch the same source at once
+SOURCE_FETCH_CONCURRENCY_KEY = "feeds-source-fetch"
+# Fetch force-refreshed and newly subscribed sources, and apply read flips to the
+# unread counters, as soon as Mongo reports them
+CHANGE_WATCH_ENABLED = os.getenv("FEEDS_CHANGE_WATCH", "1").strip().lower() in ("1", "true", "yes")
+# Poll interval for pending sources when change streams are unavailable
+CHANGE_POLL_INTERVAL_SECONDS = _read_env_positive_int("FEEDS_CHANGE_POLL_SECONDS", 5)
 SOFT_DELETE_AFTER = timedelta(days=max(1, int(os.getenv("FEEDS_SOFT_DELETE_DAYS", "7"))))
 HARD_DELETE_AFTER = timedelta(days=max(1, int(os.getenv("FEEDS_HARD_DELETE_DAYS", "30"))))
+# Unchanged articles still listed by their feed only get fetched_at refreshed
+# once it is this old, which keeps them well clear of the soft-delete cutoff.
+ARTICLE_FETCHED_AT_REFRESH_AFTER = SOFT_DELETE_AFTER / 2
+# Retention runs apart from ingestion; each run stops at its time or article budget
+# and the next run resumes after the last article it examined
+RETENTION_INTERVAL = timedelta(
+    seconds=_read_env_positive_int("FEEDS_RETENTION_INTERVAL_SECONDS", 600)
+)
+RETENTION_TIME_BUDGET = timedelta(
+    seconds=_read_env_positive_int("FEEDS_RETENTION_BUDGET_SECONDS", 20)
+)
+RETENTION_MAX_ARTICLES = _read_env_positive_int("FEEDS_RETENTION_MAX_ARTICLES", 20_000)
+# Retention candidates are checked for unread subscribers and removed this many at a time
+RETENTION_BATCH_SIZE = _read_env_positive_int("FEEDS_RETENTION_BATCH_SIZE", 1000)
+# Unread counters are recomputed from read states this often to repair drift
+UNREAD_RECONCILE_INTERVAL = timedelta(
+    seconds=_read_env_positive_int("FEEDS_UNREAD_RECONCILE_SECONDS", 3600)
+)
+# Without change streams read flips are not applied as they happen, so the
+# reconcile is the only thing that lowers the counters and runs this often
+UNREAD_RECONCILE_FALLBACK_INTERVAL = timedelta(
+    seconds=_read_env_positive_int("FEEDS_UNREAD_RECONCILE_FALLBACK_SECONDS", 300)
+)
 REQUEST_TIMEOUT_SECONDS = 20
 ARTICLE_IMAGE_REQUEST_TIMEOUT_SECONDS = _read_env_positive_int(
     "FEEDS_ARTICLE_IMAGE_REQUEST_TIMEOUT_SECONDS",
     default=8,
     minimum=2,
 )
+ARTICLE_IMAGE_SCRAPE_WORKERS = _read_env_positive_int("FEEDS_ARTICLE_IMAGE_SCRAPE_WORKERS", 4)
+# Durable scrape jobs held in memory at once; the rest wait in Mongo
+ARTICLE_IMAGE_SCRAPE_PREFETCH = ARTICLE_IMAGE_SCRAPE_WORKERS * 4
+# Cap per host so one slow or backed-off host cannot take the whole prefetch
+ARTICLE_IMAGE_SCRAPE_PREFETCH_PER_HOST = 2
+ARTICLE_IMAGE_SCRAPE_LEASE_SECONDS = _read_env_positive_int(
+    "FEEDS_ARTICLE_IMAGE_SCRAPE_LEASE_SECONDS",
+    default=900,
+    minimum=60,
+)
+ARTICLE_IMAGE_SCRAPE_MAX_ATTEMPTS = _read_env_positive_int("FEEDS_ARTICLE_IMAGE_SCRAPE_MAX_ATTEMPTS", 5)
+ARTICLE_IMAGE_SCRAPE_RETRY_BASE_SECONDS = _read_env_positive_int(
+    "FEEDS_ARTICLE_IMAGE_SCRAPE_RETRY_BASE_SECONDS",
+    default=300,
+    minimum=30,
+)
+ARTICLE_IMAGE_SCRAPE_POLL_INTERVAL = timedelta(
+    seconds=_read_env_positive_int("FEEDS_ARTICLE_IMAGE_SCRAPE_POLL_SECONDS", 60)
+)
+# Scrapes for sources a user just subscribed to or refreshed go first
+ARTICLE_IMAGE_SCRAPE_PRIORITY_REQUESTED = DEFAULT_SCRAPE_PRIORITY + 1
 ARTICLE_IMAGE_SCRAPE_MIN_INTERVAL_SECONDS = max(
     0.25,
     _read_env_non_negative_float(
@@ -120,11 +219,13 @@ SOURCE_FETCH_MAX_REDIRECTS = _read_env_positive_int(
     default=5,
     minimum=1,
 )
+# Byte budget for the streamed article page prefix scanned for meta images
 ARTICLE_IMAGE_SCAN_MAX_CHARS = _read_env_positive_int(
     "FEEDS_ARTICLE_IMAGE_SCAN_MAX_CHARS",
     default=200_000,
     minimum=10_000,
 )
+ARTICLE_IMAGE_STREAM_CHUNK_BYTES = 16_384
 ARTICLE_IMAGE_RESULT_CACHE_TTL_SECONDS = _read_env_non_negative_float(
     "FEEDS_ARTICLE_IMAGE_SCRAPE_RESULT_CACHE_TTL_SECONDS",
     default=3600.0,
@@ -136,6 +237,29 @@ ARTICLE_IMAGE_RESULT_CACHE_MAX_ENTRIES = _read_env_positive_int(
 )
 MAX_SUMMARY_LENGTH = 60_000
 FAILURE_MODE = os.getenv("FEEDS_FAILURE_MODE", "none").strip().lower()
+# Source fields read by the fetch, store and failure paths
+SOURCE_FETCH_PROJECTION = {
+    "_id": 1,
+    "normalized_url": 1,
+    "title": 1,
+    "image_url": 1,
+    "etag": 1,
+    "last_modified": 1,
+    "last_fetched_at": 1,
+    "next_refresh_at": 1,
+    "next_retry_at": 1,
+    "refresh_interval_seconds": 1,
+    "force_refresh_requested_at": 1,
+}
+# Source fields needed to work out when a source is next due
+SOURCE_SCHEDULE_PROJECTION = {
+    "_id": 1,
+    "last_fetched_at": 1,
+    "next_refresh_at": 1,
+    "next_retry_at": 1,
+    "refresh_interval_seconds": 1,
+    "force_refresh_requested_at": 1,
+}
 HTML_TAG_RE = re.compile(r"<[a-zA-Z][^>]*>")
 SUMMARY_ANCHOR_HREF_RE = re.compile(
     r"(<a\b[^>]*\bhref\s*=\s*)(?:\"([^\"]*)\"|'([^']*)'|([^\s\"'=<>`]+))",
@@ -145,25 +269,12 @@ SUMMARY_ELEMENT_ID_RE = re.compile(
     r"\bid\s*=\s*(?:\"([^\"]+)\"|'([^']+)'|([^\s\"'=<>`]+))",
     re.IGNORECASE,
 )
-META_TAG_RE = re.compile(r"<meta\b[^>]*>", re.IGNORECASE)
-META_ATTR_RE = re.compile(
-    r"\b([a-zA-Z_:][-a-zA-Z0-9_:.]*)\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s\"'=<>`]+))",
+HTML_HEAD_END_RE = re.compile(rb"</head\s*>", re.IGNORECASE)
+HTML_META_CHARSET_RE = re.compile(
+    rb"<meta\b[^>]*\bcharset\s*=\s*[\"']?\s*([-a-zA-Z0-9_:.]+)",
     re.IGNORECASE,
 )
-
-META_IMAGE_PROPERTY_VALUES = {
-    "og:image",
-    "og:image:url",
-    "og:image:secure_url",
-}
-META_IMAGE_NAME_VALUES = {
-    "twitter:image",
-    "twitter:image:src",
-    "og:image",
-    "og:image:url",
-    "og:image:secure_url",
-}
-REDIRECT_STATUS_CODES = {301, 302, 303, 307, 308}
+CONTENT_TYPE_CHARSET_RE = re.compile(r"\bcharset\s*=\s*[\"']?([-a-zA-Z0-9_:.]+)", re.IGNORECASE)
 
 
 @dataclass(slots=True)
@@ -181,6 +292,27 @@ class ParsedEntry:
     media_image_url: str | None
 
 
+@dataclass(slots=True)
+class SourceFetchResult:
+    """Outcome of the network stage of one source refresh."""
+
+    source_doc: dict[str, Any]
+    source_id: ObjectId
+    source_url: str
+    response: requests.Response | FetchedFeedResponse | None = None
+    failure_reason: str | None = None
+
+
+@dataclass(slots=True)
+class RetentionBatch:
+    """One batch of retention candidates split by unread state."""
+
+    last_id: ObjectId
+    examined: int
+    removable_ids: list[ObjectId]
+    skipped_unread: int
+
+
 @dataclass(slots=True)
 class ArticleImageScrapeJob:
     """Represents one deferred article page image scrape request."""
@@ -189,136 +321,136 @@ class ArticleImageScrapeJob:
     article_url: str
 
 
+class ArticleImageScrapeDeferred(Exception):
+    """Raised when an article page could not be scraped yet and should be retried."""
+
+
 class Feeds:
     """Background feed worker that fetches unique subscriptions and applies retention."""
 
-    def __init__(self, scheduler: TaskScheduler) -> None:
+    def __init__(self, scheduler: TaskScheduler | WorkloadScheduler) -> None:
         self.scheduler = scheduler
         self.requests_session = self._build_session(enable_retries=True)
         self.article_scrape_session = self._build_session(enable_retries=False)
-        self._next_article_image_scrape_at_monotonic = 0.0
+        self.async_fetcher = AsyncFeedFetcher(
+            concurrency=FETCH_CONCURRENCY,
+            per_host_concurrency=FETCH_PER_HOST_CONCURRENCY,
+            timeout_seconds=REQUEST_TIMEOUT_SECONDS,
+            max_redirects=SOURCE_FETCH_MAX_REDIRECTS,
+            headers={
+                name: value
+                for name, value in self.requests_session.headers.items()
+                if name in ("User-Agent", "Accept")
+            },
+        )
         self._next_article_image_scrape_at_by_host_monotonic: dict[str, float] = {}
         self._article_image_scrape_host_backoff_until_monotonic: dict[str, float] = {}
-        self._article_image_scrape_result_cache: dict[str, tuple[float, str | None]] = {}
-        self._article_image_scrape_queue: deque[ArticleImageScrapeJob] = deque()
-        self._article_image_scrape_thread: Thread | None = None
-        self._article_image_scrape_lock = Lock()
-
+        self.article_image_result_cache = ArticleImageResultCache(
+            ARTICLE_IMAGE_SCRAPE_RESULTS_COLLECTION,
+            ARTICLE_IMAGE_RESULT_CACHE_TTL_SECONDS,
+            ARTICLE_IMAGE_RESULT_CACHE_MAX_ENTRIES,
+        )
+        # Guards the host pacing and backoff maps shared by scrape workers
+        self._article_image_state_lock = Lock()
+        self._article_image_scrape_queue: HostScrapeQueue[LeasedScrapeJob] = HostScrapeQueue(
+            self._article_image_host_ready_at,
+            ARTICLE_IMAGE_SCRAPE_MIN_INTERVAL_SECONDS,
+        )
+        self.article_image_scrape_store: ScrapeJobStore | None = None
+        if ARTICLE_IMAGE_SCRAPE_JOBS_COLLECTION is not None:
+            self.article_image_scrape_store = ScrapeJobStore(
+                ARTICLE_IMAGE_SCRAPE_JOBS_COLLECTION,
+                lease_seconds=ARTICLE_IMAGE_SCRAPE_LEASE_SECONDS,
+                max_attempts=ARTICLE_IMAGE_SCRAPE_MAX_ATTEMPTS,
+                retry_base_seconds=ARTICLE_IMAGE_SCRAPE_RETRY_BASE_SECONDS,
+            )
+        self._article_image_scrape_fill_lock = Lock()
+        # Normalized URLs of leased jobs this process holds, queued or in progress
+        self._article_image_scrape_held_urls: set[str] = set()
+        self._next_subscription_sync_at_monotonic = 0.0
+        # Newest subscription _id seen, for picking up inserts between full syncs;
+        # written by the change watcher and scheduler workers
+        self._subscription_high_water_id: ObjectId | None = None
+        self._subscription_high_water_lock = Lock()
+        # Shared by fetch selection, article inserts and retention
+        self.subscription_cache = SubscriptionCache(
+            USER_FEED_SUBSCRIPTIONS_COLLECTION,
+            SUBSCRIPTION_SYNC_INTERVAL.total_seconds(),
+        )
+        self._due_queue = SourceDueQueue()
+        self._due_queue_loaded = False
+        self._due_queue_lock = Lock()
+        self._requested_source_ids: set[ObjectId] = set()
+        self._requested_sources_lock = Lock()
+        self.change_watcher: FeedChangeWatcher | None = None
+        self._next_unread_reconcile_at_monotonic = 0.0
+        # Last article _id examined by each retention phase that ran out of budget
+        self._retention_resume_after: dict[str, ObjectId] = {}
+
+        # Never overlap two cycles, or a cycle with a due or requested run; a cycle
+        # still running at the next tick skips it.
+        # Ticks missed during a stall are dropped rather than run back-to-back.
         self.scheduler.schedule_task(
             datetime.now(timezone.utc),
             self.run_cycle,
             CYCLE_INTERVAL,
+            policy=TaskPolicy(
+                max_concurrency=1,
+                concurrency_key=SOURCE_FETCH_CONCURRENCY_KEY,
+                timeout=CYCLE_TIMEOUT,
+                misfire=MisfirePolicy.SKIP,
+                jitter=CYCLE_INTERVAL / 5,
+            ),
         )
-
-    def _wait_for_article_image_scrape_slot(self, hostname: str | None) -> None:
-        """Apply global + host-specific pace limits to article image scrape requests."""
-
-        if (
-            ARTICLE_IMAGE_SCRAPE_MIN_INTERVAL_SECONDS <= 0
-            and ARTICLE_IMAGE_HOST_MIN_INTERVAL_SECONDS <= 0
-        ):
-            return
-
-        now_monotonic = monotonic()
-        next_allowed_at = self._next_article_image_scrape_at_monotonic
-        if isinstance(hostname, str) and hostname != "":
-            next_allowed_at = max(
-                next_allowed_at,
-                self._next_article_image_scrape_at_by_host_monotonic.get(hostname, 0.0),
-            )
-
-        wait_seconds = next_allowed_at - now_monotonic
-        if wait_seconds > 0:
-            sleep(wait_seconds)
-            now_monotonic = monotonic()
-
-        if ARTICLE_IMAGE_SCRAPE_MIN_INTERVAL_SECONDS > 0:
-            self._next_article_image_scrape_at_monotonic = (
-                now_monotonic + ARTICLE_IMAGE_SCRAPE_MIN_INTERVAL_SECONDS
-            )
-
-        if (
-            isinstance(hostname, str)
-            and hostname != ""
-            and ARTICLE_IMAGE_HOST_MIN_INTERVAL_SECONDS > 0
-        ):
-            self._next_article_image_scrape_at_by_host_monotonic[hostname] = (
-                now_monotonic + ARTICLE_IMAGE_HOST_MIN_INTERVAL_SECONDS
-            )
-
-    def _prune_article_image_result_cache(self, now_monotonic: float) -> None:
-        """Keep result cache bounded and remove stale URL entries."""
-
-        if ARTICLE_IMAGE_RESULT_CACHE_TTL_SECONDS <= 0:
-            self._article_image_scrape_result_cache.clear()
-            return
-
-        if (
-            len(self._article_image_scrape_result_cache)
-            <= ARTICLE_IMAGE_RESULT_CACHE_MAX_ENTRIES
-        ):
-            return
-
-        cutoff = now_monotonic - ARTICLE_IMAGE_RESULT_CACHE_TTL_SECONDS
-        stale_urls = [
-            article_url
-            for article_url, (cached_at, _) in self._article_image_scrape_result_cache.items()
-            if cached_at <= cutoff
-        ]
-        for article_url in stale_urls:
-            self._article_image_scrape_result_cache.pop(article_url, None)
-
-        overflow = (
-            len(self._article_image_scrape_result_cache)
-            - ARTICLE_IMAGE_RESULT_CACHE_MAX_ENTRIES
+        self.scheduler.schedule_task(
+            datetime.now(timezone.utc) + RETENTION_INTERVAL,
+            self.run_retention,
+            RETENTION_INTERVAL,
+            policy=TaskPolicy(
+                max_concurrency=1,
+                timeout=CYCLE_TIMEOUT,
+                misfire=MisfirePolicy.SKIP,
+                jitter=RETENTION_INTERVAL / 5,
+            ),
         )
-        if overflow <= 0:
-            return
-
-        oldest_first_urls = sorted(
-            self._article_image_scrape_result_cache.items(),
-            key=lambda item: item[1][0],
+        # Resumes the durable scrape backlog after restarts and picks up retries
+        self.scheduler.schedule_task(
+            datetime.now(timezone.utc),
+            self.run_article_image_scrapes,
+            ARTICLE_IMAGE_SCRAPE_POLL_INTERVAL,
+            policy=TaskPolicy(
+                max_concurrency=1,
+                misfire=MisfirePolicy.SKIP,
+                jitter=ARTICLE_IMAGE_SCRAPE_POLL_INTERVAL / 5,
+            ),
+        )
+        # Runs at the fallback interval and skips runs while read flips are streamed
+        self.scheduler.schedule_task(
+            datetime.now(timezone.utc),
+            self.run_unread_reconcile,
+            UNREAD_RECONCILE_FALLBACK_INTERVAL,
+            policy=TaskPolicy(
+                max_concurrency=1,
+                timeout=CYCLE_TIMEOUT,
+                misfire=MisfirePolicy.SKIP,
+                jitter=UNREAD_RECONCILE_FALLBACK_INTERVAL / 5,
+            ),
         )
-        for article_url, _ in oldest_first_urls[:overflow]:
-            self._article_image_scrape_result_cache.pop(article_url, None)
-
-    def _get_cached_article_meta_image_url(
-        self,
-        normalized_article_url: str,
-        now_monotonic: float,
-    ) -> tuple[bool, str | None]:
-        """Return a cached scrape result for an article URL when still fresh."""
-
-        if ARTICLE_IMAGE_RESULT_CACHE_TTL_SECONDS <= 0:
-            return False, None
-
-        cache_entry = self._article_image_scrape_result_cache.get(normalized_article_url)
-        if cache_entry is None:
-            return False, None
-
-        cached_at, cached_media_image_url = cache_entry
-        if (now_monotonic - cached_at) > ARTICLE_IMAGE_RESULT_CACHE_TTL_SECONDS:
-            self._article_image_scrape_result_cache.pop(normalized_article_url, None)
-            return False, None
 
-        return True, cached_media_image_url
+        if CHANGE_WATCH_ENABLED:
+            self._start_change_watcher()
 
-    def _cache_article_meta_image_url(
-        self,
-        normalized_article_url: str,
-        media_image_url: str | None,
-    ) -> None:
-        """Store the scrape outcome for an article URL to avoid repeat requests."""
+    def _article_image_host_ready_at(self, hostname: str) -> float:
+        """Return the earliest monotonic time ``hostname`` may be scraped again."""
 
-        if ARTICLE_IMAGE_RESULT_CACHE_TTL_SECONDS <= 0:
-            return
+        if hostname == "":
+            return 0.0
 
-        now_monotonic = monotonic()
-        self._article_image_scrape_result_cache[normalized_article_url] = (
-            now_monotonic,
-            media_image_url,
-        )
-        self._prune_article_image_result_cache(now_monotonic)
+        with self._article_image_state_lock:
+            return max(
+                self._next_article_image_scrape_at_by_host_monotonic.get(hostname, 0.0),
+                self._article_image_scrape_host_backoff_until_monotonic.get(hostname, 0.0),
+            )
 
     def _is_article_image_host_backed_off(
         self,
@@ -327,13 +459,14 @@ class Feeds:
     ) -> bool:
         """Check whether a host is currently in cooldown after failures or 429."""
 
-        backed_off_until = self._article_image_scrape_host_backoff_until_monotonic.get(hostname)
-        if backed_off_until is None:
-            return False
+        with self._article_image_state_lock:
+            backed_off_until = self._article_image_scrape_host_backoff_until_monotonic.get(hostname)
+            if backed_off_until is None:
+                return False
 
-        if now_monotonic >= backed_off_until:
-            self._article_image_scrape_host_backoff_until_monotonic.pop(hostname, None)
-            return False
+            if now_monotonic >= backed_off_until:
+                self._article_image_scrape_host_backoff_until_monotonic.pop(hostname, None)
+                return False
 
         return True
 
@@ -359,9 +492,10 @@ class Feeds:
             max(ARTICLE_IMAGE_HOST_MIN_INTERVAL_SECONDS, retry_after_seconds),
         )
 
-        self._article_image_scrape_host_backoff_until_monotonic[hostname] = (
-            monotonic() + bounded_backoff
-        )
+        with self._article_image_state_lock:
+            self._article_image_scrape_host_backoff_until_monotonic[hostname] = (
+                monotonic() + bounded_backoff
+            )
 
     def _mark_article_image_host_request(
         self,
@@ -376,35 +510,40 @@ class Feeds:
         normalized_request_count = max(1, request_count)
         holdoff_seconds = ARTICLE_IMAGE_HOST_MIN_INTERVAL_SECONDS * normalized_request_count
 
-        self._next_article_image_scrape_at_by_host_monotonic[hostname] = max(
-            self._next_article_image_scrape_at_by_host_monotonic.get(hostname, 0.0),
-            monotonic() + holdoff_seconds,
-        )
+        with self._article_image_state_lock:
+            self._next_article_image_scrape_at_by_host_monotonic[hostname] = max(
+                self._next_article_image_scrape_at_by_host_monotonic.get(hostname, 0.0),
+                monotonic() + holdoff_seconds,
+            )
 
     def _extract_article_meta_image_url(self, article_url: str) -> str | None:
-        """Fetch article HTML and extract a representative meta-image URL."""
+        """Fetch article HTML and extract a representative meta-image URL.
+
+        Raises ``ArticleImageScrapeDeferred`` for failures worth retrying:
+        request errors, 429 and 5xx responses, and hosts in backoff. Only
+        results that will not change on retry are cached.
+        """
 
         normalized_article_url = normalize_feed_asset_url(article_url, article_url)
         if normalized_article_url is None:
             return None
 
-        now_monotonic = monotonic()
-        has_cached_result, cached_media_image_url = self._get_cached_article_meta_image_url(
-            normalized_article_url,
-            now_monotonic,
+        has_cached_result, cached_media_image_url = self.article_image_result_cache.get(
+            normalized_article_url
         )
         if has_cached_result:
             return cached_media_image_url
 
+        now_monotonic = monotonic()
+
         requested_hostname = urlparse(normalized_article_url).netloc.strip().lower()
         if requested_hostname != "" and self._is_article_image_host_backed_off(
             requested_hostname,
             now_monotonic,
         ):
-            return None
-
-        self._wait_for_article_image_scrape_slot(requested_hostname)
+            raise ArticleImageScrapeDeferred(f"{requested_hostname} is backed off")
 
+        # Pacing already happened in the scrape queue before this job was handed out
         try:
             response = self._safe_get_with_redirects(
                 session=self.article_scrape_session,
@@ -414,6 +553,7 @@ class Feeds:
                 },
                 timeout=ARTICLE_IMAGE_REQUEST_TIMEOUT_SECONDS,
                 max_redirects=ARTICLE_IMAGE_MAX_REDIRECTS,
+                stream=True,
             )
         except requests.RequestException as exc:
             logging.debug(
@@ -423,8 +563,7 @@ class Feeds:
             )
             if requested_hostname != "":
                 self._set_article_image_host_backoff(requested_hostname, None)
-            self._cache_article_meta_image_url(normalized_article_url, None)
-            return None
+            raise ArticleImageScrapeDeferred(str(exc)) from exc
 
         host_request_counts: Counter[str] = Counter()
         for hop_response in [*response.history, response]:
@@ -438,6 +577,7 @@ class Feeds:
         response_hostname = urlparse(str(response.url).strip()).netloc.strip().lower()
 
         if response.status_code == 429 or response.status_code >= 500:
+            response.close()
             if requested_hostname != "":
                 self._set_article_image_host_backoff(
                     requested_hostname,
@@ -448,88 +588,207 @@ class Feeds:
                     response_hostname,
                     response.headers.get("Retry-After"),
                 )
+            raise ArticleImageScrapeDeferred(f"HTTP {response.status_code}")
 
         if response.status_code >= 400:
-            self._cache_article_meta_image_url(normalized_article_url, None)
+            response.close()
+            self.article_image_result_cache.put(normalized_article_url, None)
             return None
 
         page_url = str(response.url).strip() or normalized_article_url
-        html_body = response.text
-        if html_body.strip() == "":
-            self._cache_article_meta_image_url(normalized_article_url, None)
-            return None
-
-        if len(html_body) > ARTICLE_IMAGE_SCAN_MAX_CHARS:
-            html_body = html_body[:ARTICLE_IMAGE_SCAN_MAX_CHARS]
+        try:
+            media_image_url = scan_meta_image_url(
+                decode_html_chunks(
+                    iter_html_head_chunks(response, ARTICLE_IMAGE_SCAN_MAX_CHARS),
+                    response.headers.get("Content-Type"),
+                ),
+                page_url,
+            )
+        except requests.RequestException as exc:
+            logging.debug(
+                "Article meta-image body read failed for %s: %s",
+                normalized_article_url,
+                exc,
+            )
+            raise ArticleImageScrapeDeferred(str(exc)) from exc
+        finally:
+            # The scan usually stops before the body is exhausted
+            response.close()
 
-        media_image_url = extract_meta_image_url(html_body, page_url)
-        self._cache_article_meta_image_url(normalized_article_url, media_image_url)
+        self.article_image_result_cache.put(normalized_article_url, media_image_url)
         return media_image_url
 
-    def _enqueue_article_image_scrape_jobs(self, jobs: list[ArticleImageScrapeJob]) -> None:
-        """Queue first-seen no-image articles for background meta-image scraping."""
+    def _enqueue_article_image_scrape_jobs(
+        self,
+        jobs: list[ArticleImageScrapeJob],
+        priority: int = DEFAULT_SCRAPE_PRIORITY,
+    ) -> None:
+        """Queue first-seen no-image articles for background meta-image scraping.
+
+        Jobs are stored in Mongo when the jobs collection is configured, merged
+        by normalized article URL, and otherwise only held in memory.
+        """
+
+        article_ids_by_url: dict[str, list[ObjectId]] = {}
+        for job in jobs:
+            normalized_article_url = normalize_feed_asset_url(job.article_url, job.article_url)
+            if normalized_article_url is not None:
+                article_ids_by_url.setdefault(normalized_article_url, []).append(job.article_id)
 
-        if len(jobs) == 0:
+        if len(article_ids_by_url) == 0:
             return
 
-        with self._article_image_scrape_lock:
-            self._article_image_scrape_queue.extend(jobs)
+        if self.article_image_scrape_store is not None:
+            try:
+                self.article_image_scrape_store.enqueue(article_ids_by_url, priority)
+            except PyMongoError as exc:
+                logging.warning(f"Article image scrape jobs not stored, keeping them in memory: {exc}")
+            else:
+                self._fill_article_image_scrape_queue()
+                return
+
+        for article_url, article_ids in article_ids_by_url.items():
+            self._article_image_scrape_queue.push(
+                article_image_scrape_host(article_url),
+                LeasedScrapeJob(article_url, tuple(article_ids), priority=priority),
+            )
+        self._start_article_image_scrape_workers()
+
+    def _fill_article_image_scrape_queue(self) -> None:
+        """Lease stored scrape jobs into the in-memory host queue, up to the prefetch limits.
 
-        self._start_article_image_scrape_thread_if_idle()
+        Hosts backed off past the lease length are skipped, as their jobs would
+        sit in memory until the lease ran out, and their held jobs do not count
+        against the prefetch limit.
+        """
 
-    def _start_article_image_scrape_thread_if_idle(self) -> None:
-        """Ensure at most one background article-image scrape thread is active."""
+        if self.article_image_scrape_store is None:
+            return
 
-        thread_to_start: Thread | None = None
+        with self._article_image_scrape_fill_lock:
+            lease_horizon_monotonic = monotonic() + ARTICLE_IMAGE_SCRAPE_LEASE_SECONDS
+            with self._article_image_state_lock:
+                held_urls = set(self._article_image_scrape_held_urls)
+                held_hosts = {article_image_scrape_host(article_url) for article_url in held_urls}
+                blocked_hosts = {
+                    hostname
+                    for hostname, backed_off_until in self._article_image_scrape_host_backoff_until_monotonic.items()
+                    if backed_off_until > lease_horizon_monotonic
+                }
 
-        with self._article_image_scrape_lock:
-            active_thread = self._article_image_scrape_thread
-            if active_thread is not None and active_thread.is_alive():
+            blocked_hosts.update(
+                hostname
+                for hostname in held_hosts
+                if self._article_image_host_ready_at(hostname) > lease_horizon_monotonic
+            )
+            room = ARTICLE_IMAGE_SCRAPE_PREFETCH - sum(
+                1 for article_url in held_urls if article_image_scrape_host(article_url) not in blocked_hosts
+            )
+            if room <= 0:
                 return
 
-            if len(self._article_image_scrape_queue) == 0:
-                self._article_image_scrape_thread = None
+            try:
+                leased_jobs = self.article_image_scrape_store.lease(
+                    room,
+                    held_urls=held_urls,
+                    exclude_hosts=blocked_hosts,
+                    max_per_host=ARTICLE_IMAGE_SCRAPE_PREFETCH_PER_HOST,
+                )
+            except PyMongoError as exc:
+                logging.warning(f"Article image scrape job lease failed: {exc}")
                 return
 
-            thread_to_start = Thread(
+            with self._article_image_state_lock:
+                self._article_image_scrape_held_urls.update(job.article_url for job in leased_jobs)
+            for job in leased_jobs:
+                self._article_image_scrape_queue.push(article_image_scrape_host(job.article_url), job)
+
+        self._start_article_image_scrape_workers()
+
+    def run_article_image_scrapes(self) -> None:
+        """Lease stored scrape jobs that are due, including retries and a backlog left by a restart."""
+
+        self._fill_article_image_scrape_queue()
+
+    def _start_article_image_scrape_workers(self) -> None:
+        """Start scrape workers for queued jobs, up to ``ARTICLE_IMAGE_SCRAPE_WORKERS``."""
+
+        for _ in range(self._article_image_scrape_queue.claim_workers(ARTICLE_IMAGE_SCRAPE_WORKERS)):
+            Thread(
                 target=self._run_article_image_scrape_worker,
                 name="feeds-article-image-scraper",
                 daemon=True,
-            )
-            self._article_image_scrape_thread = thread_to_start
-
-        if thread_to_start is not None:
-            thread_to_start.start()
+            ).start()
 
     def _run_article_image_scrape_worker(self) -> None:
-        """Process queued article image scrape jobs sequentially."""
+        """Process article image scrape jobs from whichever host is ready next."""
 
         while True:
-            with self._article_image_scrape_lock:
-                if len(self._article_image_scrape_queue) == 0:
-                    self._article_image_scrape_thread = None
-                    return
-
-                job = self._article_image_scrape_queue.popleft()
+            next_job = self._article_image_scrape_queue.take()
+            if next_job is None:
+                return
 
+            hostname, job = next_job
             try:
-                self._process_article_image_scrape_job(job)
+                if self._renew_article_image_scrape_lease(job):
+                    self._process_article_image_scrape_job(job)
             except Exception as exc:
+                # A stored job's lease runs out and it is picked up again
                 logging.exception("Article image scrape job failed unexpectedly: %s", exc)
+            finally:
+                with self._article_image_state_lock:
+                    self._article_image_scrape_held_urls.discard(job.article_url)
+                self._article_image_scrape_queue.done(hostname)
+
+            if len(self._article_image_scrape_queue) < ARTICLE_IMAGE_SCRAPE_PREFETCH // 2:
+                self._fill_article_image_scrape_queue()
+
+    def _renew_article_image_scrape_lease(self, job: LeasedScrapeJob) -> bool:
+        """Restart a stored job's lease as it is handed to a worker.
+
+        A job may wait in memory behind its host for longer than the lease.
+        Returns False if another process has leased it since.
+        """
+
+        if self.article_image_scrape_store is None or not job.stored:
+            return True
+
+        try:
+            if self.article_image_scrape_store.renew(job):
+                return True
+        except PyMongoError as exc:
+            logging.warning(f"Article image scrape lease renewal failed for {job.article_url}: {exc}")
+            return True
 
-    def _process_article_image_scrape_job(self, job: ArticleImageScrapeJob) -> None:
+        logging.debug(f"Article image scrape for {job.article_url} skipped, leased elsewhere")
+        return False
+
+    def _process_article_image_scrape_job(self, job: LeasedScrapeJob) -> None:
         """Fetch and persist one deferred article image when available."""
 
         if FEED_ARTICLES_COLLECTION is None:
             return
 
-        media_image_url = self._extract_article_meta_image_url(job.article_url)
+        store = self.article_image_scrape_store if job.stored else None
+        try:
+            media_image_url = self._extract_article_meta_image_url(job.article_url)
+        except ArticleImageScrapeDeferred as exc:
+            if store is not None and store.retry(job):
+                logging.debug(f"Article image scrape for {job.article_url} deferred: {exc}")
+            else:
+                logging.debug(f"Article image scrape for {job.article_url} given up: {exc}")
+            return
+
+        article_ids = list(job.article_ids)
+        if store is not None:
+            article_ids = store.complete(job)
+
         if media_image_url is None:
             return
 
-        FEED_ARTICLES_COLLECTION.update_one(
+        FEED_ARTICLES_COLLECTION.update_many(
             {
-                "_id": job.article_id,
+                "_id": {"$in": article_ids},
                 "$or": [
                     {"media_image_url": None},
                     {"media_image_url": ""},
@@ -580,8 +839,13 @@ class Feeds:
         headers: dict[str, str],
         timeout: int,
         max_redirects: int,
+        stream: bool = False,
     ) -> requests.Response:
-        """Fetch URL with bounded redirects while blocking non-public targets."""
+        """Fetch URL with bounded redirects while blocking non-public targets.
+
+        With ``stream`` the final body is left unread for the caller, who must
+        consume or close the response.
+        """
 
         current_url = str(initial_url).strip()
         history: list[requests.Response] = []
@@ -596,6 +860,7 @@ class Feeds:
                 headers=headers,
                 timeout=timeout,
                 allow_redirects=False,
+                stream=stream,
             )
 
             if response.status_code not in REDIRECT_STATUS_CODES:
@@ -653,9 +918,7 @@ class Feeds:
 
         return last_refresh_at + normalized_interval + timedelta(seconds=stagger_seconds)
 
-    def run_cycle(self) -> None:
-        """Execute one ingestion/retention cycle."""
-
+    def _feed_collections_configured(self) -> bool:
         if (
             FEED_SOURCES_COLLECTION is None
             or FEED_ARTICLES_COLLECTION is None
@@ -663,87 +926,599 @@ class Feeds:
             or USER_ARTICLE_STATES_COLLECTION is None
         ):
             logging.error("Feed collections are not configured; skipping cycle.")
+            return False
+
+        return True
+
+    def run_cycle(self) -> None:
+        """Execute one ingestion cycle.
+
+        In deadline scheduling mode the cycle only refreshes the due queue;
+        ``run_due_sources`` does the fetching.
+        """
+
+        if not self._feed_collections_configured():
             return
 
         try:
-            pending_scrape_jobs: list[ArticleImageScrapeJob] = []
+            if SCHEDULING_MODE == "deadline":
+                self._refresh_due_queue()
+                return
 
             sources = self._list_fetchable_sources()
             if len(sources) == 0:
                 logging.debug("No subscribed feeds to fetch.")
-            for source in sources:
-                pending_scrape_jobs.extend(self._fetch_and_store_source(source))
 
-            if len(pending_scrape_jobs) > 0:
-                self._enqueue_article_image_scrape_jobs(pending_scrape_jobs)
+            self._store_sources(self._fetch_sources(sources))
+        except (ServerSelectionTimeoutError, NetworkTimeout, AutoReconnect) as exc:
+            logging.error(f"Feed cycle DB connectivity error: {exc}")
+        except Exception as exc:
+            logging.exception(f"Feed cycle failed unexpectedly: {exc}")
 
-            self._apply_retention()
+    async def run_cycle_async(self) -> None:
+        """Execute one ingestion cycle with source fetches overlapped.
+
+        Used by AsyncTaskScheduler in place of ``run_cycle``. Every source is
+        fetched with aiohttp on the event loop, capped by the fetcher's shared
+        connector pool like ``_fetch_sources``; parsing and database writes then
+        run in source order off the event loop.
+        """
+
+        if not self._feed_collections_configured():
+            return
+
+        try:
+            if SCHEDULING_MODE == "deadline":
+                await asyncio.to_thread(self._refresh_due_queue)
+                return
+
+            sources = await asyncio.to_thread(self._list_fetchable_sources)
+            if len(sources) == 0:
+                logging.debug("No subscribed feeds to fetch.")
+
+            fetch_results = await asyncio.gather(
+                *(self._fetch_source_async(source) for source in sources)
+            )
+            await asyncio.to_thread(self._store_sources, fetch_results)
         except (ServerSelectionTimeoutError, NetworkTimeout, AutoReconnect) as exc:
             logging.error(f"Feed cycle DB connectivity error: {exc}")
         except Exception as exc:
             logging.exception(f"Feed cycle failed unexpectedly: {exc}")
 
-    def _list_fetchable_sources(self) -> list[dict[str, Any]]:
-        """Return deduplicated source documents for currently subscribed feeds."""
+    def _fetch_sources(
+        self,
+        sources: list[dict[str, Any]],
+    ) -> Iterator[SourceFetchResult | None]:
+        """Fetch sources on a thread pool and yield the results in source order.
+
+        At most ``FETCH_CONCURRENCY`` fetches run at once and no more than
+        ``FETCH_PER_HOST_CONCURRENCY`` against one hostname. Sources for a busy
+        host wait without holding a worker, so one slow host cannot stall the
+        rest of the cycle. Results are yielded as soon as every earlier source
+        has finished, letting the caller store them while later fetches run.
+        """
+
+        if len(sources) == 0:
+            return
 
-        if FEED_SOURCES_COLLECTION is None or USER_FEED_SUBSCRIPTIONS_COLLECTION is None:
-            return []
+        pending = deque(enumerate(sources))
+        in_flight: dict[Future[SourceFetchResult | None], tuple[int, str]] = {}
+        in_flight_by_host: Counter[str] = Counter()
+        completed: dict[int, SourceFetchResult | None] = {}
+        next_index = 0
+
+        with ThreadPoolExecutor(
+            max_workers=min(FETCH_CONCURRENCY, len(sources)),
+            thread_name_prefix="feed-fetch",
+        ) as executor:
+            while next_index < len(sources):
+                waiting: deque[tuple[int, dict[str, Any]]] = deque()
+                while len(pending) > 0 and len(in_flight) < FETCH_CONCURRENCY:
+                    index, source_doc = pending.popleft()
+                    host = source_fetch_host(source_doc)
+                    if in_flight_by_host[host] >= FETCH_PER_HOST_CONCURRENCY:
+                        waiting.append((index, source_doc))
+                        continue
+
+                    in_flight_by_host[host] += 1
+                    in_flight[executor.submit(self._fetch_source, source_doc)] = (index, host)
+                pending.extendleft(reversed(waiting))
+
+                if len(in_flight) > 0:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, host = in_flight.pop(future)
+                        in_flight_by_host[host] -= 1
+                        try:
+                            completed[index] = future.result()
+                        except Exception as exc:
+                            source_doc = sources[index]
+                            source_id = source_doc.get("_id")
+                            logging.exception(f"Feed source fetch failed unexpectedly: {exc}")
+                            completed[index] = (
+                                SourceFetchResult(
+                                    source_doc,
+                                    source_id,
+                                    str(source_doc.get("normalized_url", "")).strip(),
+                                    failure_reason=f"Fetch error: {exc}",
+                                )
+                                if isinstance(source_id, ObjectId)
+                                else None
+                            )
+
+                while next_index in completed:
+                    yield completed.pop(next_index)
+                    next_index += 1
+
+    def run_due_sources(self) -> None:
+        """Fetch and store the sources whose due time has passed (deadline mode)."""
+
+        if not self._feed_collections_configured():
+            return
+
+        try:
+            sources = self._take_due_sources()
+            self._store_due_fetch_results(self._fetch_sources(sources))
+        except (ServerSelectionTimeoutError, NetworkTimeout, AutoReconnect) as exc:
+            logging.error(f"Feed due-source run DB connectivity error: {exc}")
+            self._schedule_due_run()
+        except Exception as exc:
+            logging.exception(f"Feed due-source run failed unexpectedly: {exc}")
+            self._schedule_due_run()
+
+    async def run_due_sources_async(self) -> None:
+        """``run_due_sources`` with fetches made by the aiohttp fetcher."""
+
+        if not self._feed_collections_configured():
+            return
 
-        feed_ids = USER_FEED_SUBSCRIPTIONS_COLLECTION.distinct("feed_id")
-        normalized_feed_ids = [feed_id for feed_id in feed_ids if isinstance(feed_id, ObjectId)]
+        try:
+            sources = await asyncio.to_thread(self._take_due_sources)
+            fetch_results = await asyncio.gather(
+                *(self._fetch_source_async(source) for source in sources)
+            )
+            await asyncio.to_thread(self._store_due_fetch_results, fetch_results)
+        except (ServerSelectionTimeoutError, NetworkTimeout, AutoReconnect) as exc:
+            logging.error(f"Feed due-source run DB connectivity error: {exc}")
+            self._schedule_due_run()
+        except Exception as exc:
+            logging.exception(f"Feed due-source run failed unexpectedly: {exc}")
+            self._schedule_due_run()
+
+    def _store_sources(
+        self,
+        fetch_results: Iterable[SourceFetchResult | None],
+        scrape_priority: int = DEFAULT_SCRAPE_PRIORITY,
+    ) -> list[ObjectId]:
+        """Store fetched sources, queue their image scrapes and return the stored ids."""
+
+        stored_source_ids: list[ObjectId] = []
+        pending_scrape_jobs: list[ArticleImageScrapeJob] = []
+        for fetch_result in fetch_results:
+            if fetch_result is not None:
+                pending_scrape_jobs.extend(self._store_source(fetch_result))
+                stored_source_ids.append(fetch_result.source_id)
+
+        if len(pending_scrape_jobs) > 0:
+            self._enqueue_article_image_scrape_jobs(pending_scrape_jobs, scrape_priority)
+
+        return stored_source_ids
+
+    def _store_due_fetch_results(
+        self,
+        fetch_results: Iterable[SourceFetchResult | None],
+    ) -> None:
+        """Store fetched sources, then queue them again at their new due times."""
+
+        self._requeue_sources(self._store_sources(fetch_results))
+        self._schedule_due_run()
+
+    def _update_due_queue(self, source_docs: Iterable[dict[str, Any]], replace: bool = False) -> None:
+        now = datetime.now(timezone.utc)
+        with self._due_queue_lock:
+            if replace:
+                self._due_queue.clear()
+            for source_doc in source_docs:
+                source_id = source_doc.get("_id")
+                if isinstance(source_id, ObjectId):
+                    self._due_queue.update(
+                        source_id,
+                        source_next_due_at(source_doc, now, FETCH_INTERVAL, MAX_SCHEDULE_LAG),
+                    )
+
+    def _refresh_due_queue(self) -> None:
+        """Load the due queue from Mongo, or pick up sources that became due externally.
+
+        The queue is rebuilt from every subscribed source whenever subscribed
+        flags are reconciled. In between, only sources with a pending force
+        refresh or without a schedule yet are read, through indexed fields.
+        """
+
+        if FEED_SOURCES_COLLECTION is None:
+            return
+
+        synced = self._sync_subscribed_sources()
+        if synced or not self._due_queue_loaded:
+            self._update_due_queue(
+                FEED_SOURCES_COLLECTION.find(
+                    {"is_subscribed": {"$ne": False}},
+                    SOURCE_SCHEDULE_PROJECTION,
+                ),
+                replace=True,
+            )
+            self._due_queue_loaded = True
+        else:
+            self._update_due_queue(
+                FEED_SOURCES_COLLECTION.find(
+                    build_pending_sources_query(),
+                    SOURCE_SCHEDULE_PROJECTION,
+                )
+            )
+
+        self._schedule_due_run()
+
+    def _requeue_sources(self, source_ids: list[ObjectId]) -> None:
+        if FEED_SOURCES_COLLECTION is None or len(source_ids) == 0:
+            return
 
-        if len(normalized_feed_ids) == 0:
+        self._update_due_queue(
+            FEED_SOURCES_COLLECTION.find(
+                {"_id": {"$in": source_ids}, "is_subscribed": {"$ne": False}},
+                SOURCE_SCHEDULE_PROJECTION,
+            )
+        )
+
+    def _take_due_sources(self) -> list[dict[str, Any]]:
+        """Pop due sources from the queue and load them, re-queueing any not due yet."""
+
+        if FEED_SOURCES_COLLECTION is None:
             return []
 
         now = datetime.now(timezone.utc)
-        cursor = FEED_SOURCES_COLLECTION.find({"_id": {"$in": normalized_feed_ids}})
+        with self._due_queue_lock:
+            due_source_ids = self._due_queue.pop_due(now)
+
+        if len(due_source_ids) == 0:
+            return []
 
-        sources: list[dict[str, Any]] = []
-        for source in cursor:
+        sources_by_id = {
+            source["_id"]: source
+            for source in FEED_SOURCES_COLLECTION.find(
+                {"_id": {"$in": due_source_ids}, "is_subscribed": {"$ne": False}},
+                SOURCE_FETCH_PROJECTION,
+            )
+        }
+
+        due_sources: list[dict[str, Any]] = []
+        not_due_sources: list[dict[str, Any]] = []
+        for source_id in due_source_ids:
+            source = sources_by_id.get(source_id)
+            if source is None:
+                continue
             if source_needs_fetch(source, now, FETCH_INTERVAL, MAX_SCHEDULE_LAG):
-                sources.append(source)
-
-        earliest = datetime.min.replace(tzinfo=timezone.utc)
-        sources.sort(
-            key=lambda source: (
-                coerce_utc_datetime(source.get("next_refresh_at"))
-                or coerce_utc_datetime(source.get("last_fetched_at"))
-                or earliest
+                due_sources.append(source)
+            else:
+                not_due_sources.append(source)
+
+        # Another writer moved these sources' schedule since they were queued
+        self._update_due_queue(not_due_sources)
+        return due_sources
+
+    def _schedule_due_run(self) -> None:
+        """Schedule ``run_due_sources`` for the earliest due source, if any."""
+
+        with self._due_queue_lock:
+            next_due_at = self._due_queue.next_due_at()
+
+        if next_due_at is not None:
+            self.scheduler.schedule_earlier_task(
+                next_due_at,
+                self.run_due_sources,
+                policy=TaskPolicy(
+                    max_concurrency=1,
+                    timeout=CYCLE_TIMEOUT,
+                    concurrency_key=SOURCE_FETCH_CONCURRENCY_KEY,
+                ),
             )
+
+    def _start_change_watcher(self) -> None:
+        if DATABASE.current_db is None or FEED_SOURCES_COLLECTION is None:
+            logging.error("Feed database is not configured; change watcher not started.")
+            return
+        if USER_FEED_SUBSCRIPTIONS_COLLECTION is None or USER_ARTICLE_STATES_COLLECTION is None:
+            logging.error("Feed user collections are not configured; change watcher not started.")
+            return
+
+        self.change_watcher = FeedChangeWatcher(
+            DATABASE.current_db,
+            FEED_SOURCES_COLLECTION.name,
+            USER_FEED_SUBSCRIPTIONS_COLLECTION.name,
+            USER_ARTICLE_STATES_COLLECTION.name,
+            on_sources_changed=self.request_source_fetch,
+            on_subscriptions_added=self._handle_subscriptions_added,
+            on_subscriptions_removed=self._handle_subscriptions_removed,
+            on_read_states_changed=record_read_state_changes,
+            poll_pending_sources=self._list_pending_source_ids,
+            poll_interval_seconds=CHANGE_POLL_INTERVAL_SECONDS,
+        )
+        self.change_watcher.start()
+
+    def request_source_fetch(self, source_ids: Iterable[ObjectId]) -> None:
+        """Fetch ``source_ids`` as soon as a worker is free, if they are due.
+
+        Requests made before the run starts are coalesced into one run. The
+        usual due rules still apply, so a source already fetched since its
+        force refresh was requested is not fetched again.
+        """
+
+        with self._requested_sources_lock:
+            self._requested_source_ids.update(source_ids)
+            if len(self._requested_source_ids) == 0:
+                return
+
+        self.scheduler.schedule_earlier_task(
+            datetime.now(timezone.utc),
+            self.run_requested_sources,
+            policy=TaskPolicy(
+                max_concurrency=1,
+                timeout=CYCLE_TIMEOUT,
+                concurrency_key=SOURCE_FETCH_CONCURRENCY_KEY,
+            ),
         )
 
-        return sources
+    def _handle_subscriptions_added(self, subscriptions: list[Mapping[str, Any]]) -> None:
+        """Cache new subscriptions, count their feed's articles as unread for the
+        new subscriber, and fetch the subscribed sources straight away."""
+
+        if FEED_SOURCES_COLLECTION is None or len(subscriptions) == 0:
+            return
+
+        feed_ids: list[ObjectId] = []
+        for subscription in subscriptions:
+            self.subscription_cache.add(subscription)
+            subscription_id = subscription.get("_id")
+            if isinstance(subscription_id, ObjectId):
+                # Keeps the poll from replaying inserts the change stream delivered
+                self._advance_subscription_high_water(subscription_id)
+            feed_id = subscription.get("feed_id")
+            user_id = subscription.get("user_id")
+            if isinstance(feed_id, ObjectId) and isinstance(user_id, str):
+                record_subscription_added(feed_id, user_id)
+                feed_ids.append(feed_id)
+
+        if len(feed_ids) == 0:
+            return
+
+        # The periodic reconcile would only pick up a resubscribed source later
+        FEED_SOURCES_COLLECTION.update_many(
+            {"_id": {"$in": feed_ids}, "is_subscribed": {"$ne": True}},
+            {"$set": {"is_subscribed": True}},
+        )
+        self.request_source_fetch(feed_ids)
 
-    def _fetch_and_store_source(self, source_doc: dict[str, Any]) -> list[ArticleImageScrapeJob]:
-        """Fetch one source and upsert parsed entries."""
+    def _handle_subscriptions_removed(self, subscription_ids: list[ObjectId]) -> None:
+        for subscription_id in subscription_ids:
+            self.subscription_cache.remove(subscription_id)
 
+    def _list_pending_source_ids(self) -> list[ObjectId]:
         if FEED_SOURCES_COLLECTION is None:
             return []
 
-        pending_scrape_jobs: list[ArticleImageScrapeJob] = []
+        return [
+            source["_id"]
+            for source in FEED_SOURCES_COLLECTION.find(build_pending_sources_query(), {"_id": 1})
+        ]
 
-        source_id = source_doc.get("_id")
-        source_url = str(source_doc.get("normalized_url", "")).strip()
+    def run_requested_sources(self) -> None:
+        """Fetch and store the sources passed to ``request_source_fetch``."""
 
-        if not isinstance(source_id, ObjectId) or source_url == "":
-            return []
+        if not self._feed_collections_configured():
+            return
 
-        if FAILURE_MODE == "timeout":
-            self._record_fetch_failure(
-                source_doc,
-                source_id,
-                "Simulated timeout failure mode.",
+        try:
+            sources = self._take_requested_sources()
+            self._store_requested_fetch_results(self._fetch_sources(sources))
+        except (ServerSelectionTimeoutError, NetworkTimeout, AutoReconnect) as exc:
+            logging.error(f"Feed requested-source run DB connectivity error: {exc}")
+        except Exception as exc:
+            logging.exception(f"Feed requested-source run failed unexpectedly: {exc}")
+
+    async def run_requested_sources_async(self) -> None:
+        """``run_requested_sources`` with fetches made by the aiohttp fetcher."""
+
+        if not self._feed_collections_configured():
+            return
+
+        try:
+            sources = await asyncio.to_thread(self._take_requested_sources)
+            fetch_results = await asyncio.gather(
+                *(self._fetch_source_async(source) for source in sources)
             )
+            await asyncio.to_thread(self._store_requested_fetch_results, fetch_results)
+        except (ServerSelectionTimeoutError, NetworkTimeout, AutoReconnect) as exc:
+            logging.error(f"Feed requested-source run DB connectivity error: {exc}")
+        except Exception as exc:
+            logging.exception(f"Feed requested-source run failed unexpectedly: {exc}")
+
+    def _take_requested_sources(self) -> list[dict[str, Any]]:
+        """Clear the requested ids and load those sources that are due for a fetch."""
+
+        if FEED_SOURCES_COLLECTION is None:
             return []
 
-        if FAILURE_MODE == "http500":
-            self._record_fetch_failure(
-                source_doc,
-                source_id,
-                "Simulated upstream HTTP 500 failure mode.",
+        with self._requested_sources_lock:
+            source_ids = list(self._requested_source_ids)
+            self._requested_source_ids.clear()
+
+        if len(source_ids) == 0:
+            return []
+
+        now = datetime.now(timezone.utc)
+        cursor = FEED_SOURCES_COLLECTION.find(
+            {"_id": {"$in": source_ids}, "is_subscribed": {"$ne": False}},
+            SOURCE_FETCH_PROJECTION,
+        )
+
+        return [
+            source
+            for source in cursor
+            if source_needs_fetch(source, now, FETCH_INTERVAL, MAX_SCHEDULE_LAG)
+        ]
+
+    def _store_requested_fetch_results(
+        self,
+        fetch_results: Iterable[SourceFetchResult | None],
+    ) -> None:
+        """Store fetched sources and, in deadline mode, queue them at their new due times."""
+
+        stored_source_ids = self._store_sources(fetch_results, ARTICLE_IMAGE_SCRAPE_PRIORITY_REQUESTED)
+        if SCHEDULING_MODE == "deadline" and len(stored_source_ids) > 0:
+            self._requeue_sources(stored_source_ids)
+            self._schedule_due_run()
+
+    def _sync_subscribed_sources(self, force: bool = False) -> bool:
+        """Keep the ``is_subscribed`` flag on sources in line with current subscriptions.
+
+        New subscriptions are applied as they are seen, by the change watcher
+        or else by ``_poll_new_subscriptions`` on every call. A full reconcile
+        runs at most once per ``SUBSCRIPTION_SYNC_INTERVAL`` as a repair pass,
+        mainly to clear the flag on sources that lost their last subscriber,
+        and only writes sources whose flag changed. Sources without the flag,
+        such as ones just added for a new subscription, are treated as
+        subscribed. Returns True when a full reconcile ran.
+        """
+
+        if FEED_SOURCES_COLLECTION is None or USER_FEED_SUBSCRIPTIONS_COLLECTION is None:
+            return False
+
+        now_monotonic = monotonic()
+        if not force and now_monotonic < self._next_subscription_sync_at_monotonic:
+            self._poll_new_subscriptions()
+            return False
+        self._next_subscription_sync_at_monotonic = (
+            now_monotonic + SUBSCRIPTION_SYNC_INTERVAL.total_seconds()
+        )
+
+        with self._subscription_high_water_lock:
+            high_water_id = self._subscription_high_water_id
+
+        if high_water_id is None:
+            # Start the mark before the reload so no insert falls between the two
+            newest_subscription = USER_FEED_SUBSCRIPTIONS_COLLECTION.find_one(
+                {}, {"_id": 1}, sort=[("_id", DESCENDING)]
             )
+            if newest_subscription is not None:
+                self._advance_subscription_high_water(newest_subscription["_id"])
+        else:
+            # Inserts since the last poll still need their unread counts and fetch
+            self._poll_new_subscriptions()
+
+        self.subscription_cache.reload()
+        subscribed_feed_ids = self.subscription_cache.feed_ids()
+
+        subscribed_result = FEED_SOURCES_COLLECTION.update_many(
+            {"_id": {"$in": subscribed_feed_ids}, "is_subscribed": {"$ne": True}},
+            {"$set": {"is_subscribed": True}},
+        )
+        unsubscribed_result = FEED_SOURCES_COLLECTION.update_many(
+            {"_id": {"$nin": subscribed_feed_ids}, "is_subscribed": {"$ne": False}},
+            {"$set": {"is_subscribed": False}},
+        )
+        logging.debug(
+            "Subscribed source sync: subscribed=%d unsubscribed=%d",
+            subscribed_result.modified_count,
+            unsubscribed_result.modified_count,
+        )
+        return True
+
+    def _poll_new_subscriptions(self) -> None:
+        """Apply subscriptions inserted since the newest one seen, when no change stream delivers them.
+
+        Subscription ids are ObjectIds, so the lookup is an ``_id`` range scan.
+        One inserted with a lagging client clock can sort below the mark and is
+        left to the next full reconcile.
+        """
+
+        if USER_FEED_SUBSCRIPTIONS_COLLECTION is None:
+            return
+        if self.change_watcher is not None and not self.change_watcher.polling:
+            return
+
+        with self._subscription_high_water_lock:
+            high_water_id = self._subscription_high_water_id
+        if high_water_id is None:
+            return
+
+        found_subscriptions = list(
+            USER_FEED_SUBSCRIPTIONS_COLLECTION.find(
+                {"_id": {"$gt": high_water_id}},
+                {"_id": 1, "feed_id": 1, "user_id": 1},
+            ).sort([("_id", ASCENDING)])
+        )
+
+        # A concurrent poll may have applied some of these already
+        with self._subscription_high_water_lock:
+            high_water_id = self._subscription_high_water_id
+            subscriptions = [
+                subscription
+                for subscription in found_subscriptions
+                if high_water_id is None or subscription["_id"] > high_water_id
+            ]
+            if len(subscriptions) > 0:
+                self._subscription_high_water_id = subscriptions[-1]["_id"]
+
+        if len(subscriptions) > 0:
+            self._handle_subscriptions_added(subscriptions)
+
+    def _advance_subscription_high_water(self, subscription_id: ObjectId) -> None:
+        with self._subscription_high_water_lock:
+            if self._subscription_high_water_id is None or subscription_id > self._subscription_high_water_id:
+                self._subscription_high_water_id = subscription_id
+
+    def _list_fetchable_sources(self) -> list[dict[str, Any]]:
+        """Return subscribed source documents that are due for a fetch, most overdue first.
+
+        Mongo returns only candidates from the indexed scheduling fields, sorted
+        server-side, so cycle cost scales with due sources rather than all
+        sources. ``source_needs_fetch`` then applies the exact due rules.
+        """
+
+        if FEED_SOURCES_COLLECTION is None or USER_FEED_SUBSCRIPTIONS_COLLECTION is None:
             return []
 
+        self._sync_subscribed_sources()
+
+        now = datetime.now(timezone.utc)
+        cursor = FEED_SOURCES_COLLECTION.find(
+            build_due_sources_query(now, MAX_SCHEDULE_LAG),
+            SOURCE_FETCH_PROJECTION,
+        ).sort([("next_refresh_at", ASCENDING), ("_id", ASCENDING)])
+
+        return [
+            source
+            for source in cursor
+            if source_needs_fetch(source, now, FETCH_INTERVAL, MAX_SCHEDULE_LAG)
+        ]
+
+    def _begin_source_fetch(
+        self,
+        source_doc: dict[str, Any],
+    ) -> tuple[SourceFetchResult, dict[str, str]] | None:
+        """Return the fetch result to fill in and the conditional request headers."""
+
+        source_id = source_doc.get("_id")
+        source_url = str(source_doc.get("normalized_url", "")).strip()
+
+        if not isinstance(source_id, ObjectId) or source_url == "":
+            return None
+
+        fetch_result = SourceFetchResult(source_doc, source_id, source_url)
+
+        if FAILURE_MODE == "timeout":
+            fetch_result.failure_reason = "Simulated timeout failure mode."
+        elif FAILURE_MODE == "http500":
+            fetch_result.failure_reason = "Simulated upstream HTTP 500 failure mode."
+
         request_headers: dict[str, str] = {}
         etag = source_doc.get("etag")
         if isinstance(etag, str) and etag.strip() != "":
@@ -753,8 +1528,22 @@ class Feeds:
         if isinstance(last_modified, str) and last_modified.strip() != "":
             request_headers["If-Modified-Since"] = last_modified
 
+        return fetch_result, request_headers
+
+    def _fetch_source(self, source_doc: dict[str, Any]) -> SourceFetchResult | None:
+        """Run the network stage of one source refresh without touching the database."""
+
+        begun_fetch = self._begin_source_fetch(source_doc)
+        if begun_fetch is None:
+            return None
+
+        fetch_result, request_headers = begun_fetch
+        if fetch_result.failure_reason is not None:
+            return fetch_result
+
+        source_url = fetch_result.source_url
         try:
-            response = self._safe_get_with_redirects(
+            fetch_result.response = self._safe_get_with_redirects(
                 session=self.requests_session,
                 initial_url=source_url,
                 headers=request_headers,
@@ -762,7 +1551,57 @@ class Feeds:
                 max_redirects=SOURCE_FETCH_MAX_REDIRECTS,
             )
         except requests.RequestException as exc:
-            self._record_fetch_failure(source_doc, source_id, f"Network error: {exc}")
+            fetch_result.failure_reason = f"Network error: {exc}"
+
+        return fetch_result
+
+    async def _fetch_source_async(self, source_doc: dict[str, Any]) -> SourceFetchResult | None:
+        """aiohttp counterpart of ``_fetch_source`` using the shared async fetcher."""
+
+        begun_fetch = self._begin_source_fetch(source_doc)
+        if begun_fetch is None:
+            return None
+
+        fetch_result, request_headers = begun_fetch
+        if fetch_result.failure_reason is not None:
+            return fetch_result
+
+        try:
+            fetch_result.response = await self.async_fetcher.get_with_redirects(
+                fetch_result.source_url,
+                request_headers,
+            )
+        except FeedFetchError as exc:
+            fetch_result.failure_reason = f"Network error: {exc}"
+
+        return fetch_result
+
+    async def aclose(self) -> None:
+        """Stop the change watcher and close the async fetcher's connection pool."""
+
+        if self.change_watcher is not None:
+            await asyncio.to_thread(self.change_watcher.stop, REQUEST_TIMEOUT_SECONDS)
+        await self.async_fetcher.close()
+
+    def _store_source(self, fetch_result: SourceFetchResult) -> list[ArticleImageScrapeJob]:
+        """Persist a fetched source and upsert its parsed entries."""
+
+        if FEED_SOURCES_COLLECTION is None:
+            return []
+
+        pending_scrape_jobs: list[ArticleImageScrapeJob] = []
+
+        source_doc = fetch_result.source_doc
+        source_id = fetch_result.source_id
+        source_url = fetch_result.source_url
+        response = fetch_result.response
+
+        if fetch_result.failure_reason is not None or response is None:
+            self._record_fetch_failure(
+                source_doc,
+                source_id,
+                fetch_result.failure_reason or "No response received.",
+            )
             return []
 
         effective_source_url = (
@@ -868,13 +1707,13 @@ class Feeds:
             },
         )
 
+        parsed_entries: list[ParsedEntry] = []
         for entry in entries:
             normalized = self._parse_feed_entry(effective_source_url, entry)
-            if normalized is None:
-                continue
-            scrape_job = self._upsert_article(source_id, normalized)
-            if scrape_job is not None:
-                pending_scrape_jobs.append(scrape_job)
+            if normalized is not None:
+                parsed_entries.append(normalized)
+
+        pending_scrape_jobs.extend(self._upsert_articles(source_id, parsed_entries))
 
         return pending_scrape_jobs
 
@@ -944,43 +1783,152 @@ class Feeds:
             media_image_url = extract_first_summary_image_url(summary_html, source_url)
         summary_html = strip_duplicate_summary_image(summary_html, media_image_url, source_url)
 
-        if summary_html is not None and len(summary_html) > MAX_SUMMARY_LENGTH:
-            summary_html = summary_html[:MAX_SUMMARY_LENGTH]
+        if summary_html is not None and len(summary_html) > MAX_SUMMARY_LENGTH:
+            summary_html = summary_html[:MAX_SUMMARY_LENGTH]
+
+        published_at = parse_entry_published_at(entry)
+        author = str(entry.get("author", "")).strip() or None
+
+        dedupe_material = build_article_dedupe_material(
+            canonical_url=canonical_url,
+            external_id=external_id,
+            source_url=source_url,
+            title=title,
+            published_at=published_at,
+        )
+        dedupe_key = hashlib.sha256(dedupe_material.encode("utf-8")).hexdigest()
+
+        return ParsedEntry(
+            dedupe_key=dedupe_key,
+            canonical_url=canonical_url,
+            external_id=external_id,
+            title=title,
+            link=canonical_url or source_url,
+            author=author,
+            summary_html=summary_html,
+            published_at=published_at,
+            media_image_url=media_image_url,
+        )
+
+    def _article_update_payload(
+        self,
+        feed_id: ObjectId,
+        parsed_entry: ParsedEntry,
+        media_image_url: str | None,
+        now: datetime,
+        unread_subscriber_count: int,
+    ) -> dict[str, Any]:
+        """Build the upsert update document for one parsed entry.
+
+        A new article starts unread for every current subscriber of its feed;
+        updates leave the counter to read-state tracking.
+        """
+
+        article_document = FeedArticleDocument(
+            feed_id=feed_id,
+            dedupe_key=parsed_entry.dedupe_key,
+            canonical_url=parsed_entry.canonical_url,
+            external_id=parsed_entry.external_id,
+            title=parsed_entry.title,
+            link=parsed_entry.link,
+            author=parsed_entry.author,
+            summary_html=parsed_entry.summary_html,
+            published_at=parsed_entry.published_at,
+            media_image_url=media_image_url,
+            content_fingerprint=article_content_fingerprint(parsed_entry),
+            fetched_at=now,
+            is_deleted=False,
+            deleted_at=None,
+        )
+
+        return {
+            "$set": article_document.model_dump(
+                by_alias=True,
+                exclude={"id", UNREAD_COUNTER_FIELD},
+            ),
+            "$setOnInsert": {
+                "created_at": now,
+                UNREAD_COUNTER_FIELD: unread_subscriber_count,
+            },
+        }
+
+    def _resolve_duplicate_article(
+        self,
+        feed_id: ObjectId,
+        parsed_entry: ParsedEntry,
+        update_payload: dict[str, Any],
+    ) -> ObjectId | None:
+        """Apply an upsert that hit a duplicate key and return the dedupe owner id."""
+
+        if FEED_ARTICLES_COLLECTION is None:
+            return None
+
+        # Legacy rows may share link/canonical identities while differing in
+        # dedupe_key. Resolve conflicts by targeting the dedupe-key owner
+        # directly, then optionally try weaker identity fallbacks.
+        dedupe_owner_query = {
+            "feed_id": feed_id,
+            "dedupe_key": parsed_entry.dedupe_key,
+        }
+        dedupe_owner_result = FEED_ARTICLES_COLLECTION.update_one(
+            dedupe_owner_query,
+            update_payload,
+            upsert=False,
+        )
+
+        if dedupe_owner_result.matched_count == 0:
+            fallback_clauses: list[dict[str, Any]] = []
+            if parsed_entry.external_id is not None:
+                fallback_clauses.append(
+                    {
+                        "feed_id": feed_id,
+                        "external_id": parsed_entry.external_id,
+                    }
+                )
+            if parsed_entry.canonical_url is not None:
+                fallback_clauses.append(
+                    {
+                        "feed_id": feed_id,
+                        "canonical_url": parsed_entry.canonical_url,
+                    }
+                )
+                fallback_clauses.append(
+                    {
+                        "feed_id": feed_id,
+                        "link": parsed_entry.canonical_url,
+                    }
+                )
 
-        published_at = parse_entry_published_at(entry)
-        author = str(entry.get("author", "")).strip() or None
+            if len(fallback_clauses) > 0:
+                FEED_ARTICLES_COLLECTION.update_one(
+                    {"$or": fallback_clauses},
+                    update_payload,
+                    upsert=False,
+                )
 
-        dedupe_material = build_article_dedupe_material(
-            canonical_url=canonical_url,
-            external_id=external_id,
-            source_url=source_url,
-            title=title,
-            published_at=published_at,
-        )
-        dedupe_key = hashlib.sha256(dedupe_material.encode("utf-8")).hexdigest()
+        dedupe_owner = FEED_ARTICLES_COLLECTION.find_one(dedupe_owner_query, {"_id": 1})
+        if isinstance(dedupe_owner, dict):
+            possible_article_id = dedupe_owner.get("_id")
+            if isinstance(possible_article_id, ObjectId):
+                return possible_article_id
 
-        return ParsedEntry(
-            dedupe_key=dedupe_key,
-            canonical_url=canonical_url,
-            external_id=external_id,
-            title=title,
-            link=canonical_url or source_url,
-            author=author,
-            summary_html=summary_html,
-            published_at=published_at,
-            media_image_url=media_image_url,
-        )
+        return None
 
+    @track_db_operation("Feeds._upsert_article")
     def _upsert_article(
         self,
         feed_id: ObjectId,
         parsed_entry: ParsedEntry,
+        subscriber_ids: list[str] | None = None,
     ) -> ArticleImageScrapeJob | None:
         """Upsert one article record keyed by canonical URL (fallback external_id/dedupe)."""
 
         if FEED_ARTICLES_COLLECTION is None:
             return None
 
+        if subscriber_ids is None:
+            subscriber_ids = self.subscription_cache.subscribers(feed_id)
+
         now = datetime.now(timezone.utc)
         dedupe_owner_doc = FEED_ARTICLES_COLLECTION.find_one(
             {
@@ -1011,42 +1959,18 @@ class Feeds:
                 },
             )
 
-        existing_media_image_url: str | None = None
-        if isinstance(existing_doc, dict):
-            existing_media_candidate = str(existing_doc.get("media_image_url", "")).strip()
-            if existing_media_candidate != "":
-                existing_media_image_url = existing_media_candidate
-
         media_image_url = parsed_entry.media_image_url
-        if media_image_url is None and existing_media_image_url is not None:
-            media_image_url = existing_media_image_url
+        if media_image_url is None:
+            media_image_url = existing_article_media_image_url(existing_doc)
 
-        article_document = FeedArticleDocument(
-            feed_id=feed_id,
-            dedupe_key=parsed_entry.dedupe_key,
-            canonical_url=parsed_entry.canonical_url,
-            external_id=parsed_entry.external_id,
-            title=parsed_entry.title,
-            link=parsed_entry.link,
-            author=parsed_entry.author,
-            summary_html=parsed_entry.summary_html,
-            published_at=parsed_entry.published_at,
-            media_image_url=media_image_url,
-            fetched_at=now,
-            is_deleted=False,
-            deleted_at=None,
+        update_payload = self._article_update_payload(
+            feed_id,
+            parsed_entry,
+            media_image_url,
+            now,
+            len(subscriber_ids),
         )
 
-        update_payload = {
-            "$set": article_document.model_dump(
-                by_alias=True,
-                exclude={"id"},
-            ),
-            "$setOnInsert": {
-                "created_at": now,
-            },
-        }
-
         resolved_article_id: ObjectId | None = None
         upserted_article_id: ObjectId | None = None
 
@@ -1059,61 +1983,13 @@ class Feeds:
             possible_upserted_id = upsert_result.upserted_id
             if isinstance(possible_upserted_id, ObjectId):
                 upserted_article_id = possible_upserted_id
+                record_articles_inserted(feed_id, subscriber_ids, 1)
         except DuplicateKeyError:
-            # Legacy rows may share link/canonical identities while differing in
-            # dedupe_key. Resolve conflicts by targeting the dedupe-key owner
-            # directly, then optionally try weaker identity fallbacks.
-            dedupe_owner_query = {
-                "feed_id": feed_id,
-                "dedupe_key": parsed_entry.dedupe_key,
-            }
-            dedupe_owner_result = FEED_ARTICLES_COLLECTION.update_one(
-                dedupe_owner_query,
+            resolved_article_id = self._resolve_duplicate_article(
+                feed_id,
+                parsed_entry,
                 update_payload,
-                upsert=False,
-            )
-
-            if dedupe_owner_result.matched_count == 0:
-                fallback_clauses: list[dict[str, Any]] = []
-                if parsed_entry.external_id is not None:
-                    fallback_clauses.append(
-                        {
-                            "feed_id": feed_id,
-                            "external_id": parsed_entry.external_id,
-                        }
-                    )
-                if parsed_entry.canonical_url is not None:
-                    fallback_clauses.append(
-                        {
-                            "feed_id": feed_id,
-                            "canonical_url": parsed_entry.canonical_url,
-                        }
-                    )
-                    fallback_clauses.append(
-                        {
-                            "feed_id": feed_id,
-                            "link": parsed_entry.canonical_url,
-                        }
-                    )
-
-                if len(fallback_clauses) > 0:
-                    FEED_ARTICLES_COLLECTION.update_one(
-                        {"$or": fallback_clauses},
-                        update_payload,
-                        upsert=False,
-                    )
-
-            dedupe_owner = FEED_ARTICLES_COLLECTION.find_one(
-                {
-                    "feed_id": feed_id,
-                    "dedupe_key": parsed_entry.dedupe_key,
-                },
-                {"_id": 1},
             )
-            if isinstance(dedupe_owner, dict):
-                possible_article_id = dedupe_owner.get("_id")
-                if isinstance(possible_article_id, ObjectId):
-                    resolved_article_id = possible_article_id
 
         should_enqueue_deferred_scrape = (
             existing_doc is None and media_image_url is None
@@ -1152,8 +2028,247 @@ class Feeds:
             article_url=parsed_entry.link,
         )
 
+    @track_db_operation("Feeds._upsert_articles")
+    def _upsert_articles(
+        self,
+        feed_id: ObjectId,
+        parsed_entries: list[ParsedEntry],
+    ) -> list[ArticleImageScrapeJob]:
+        """Upsert a source's parsed entries with one prefetch and one bulk write.
+
+        Existing articles are loaded with a single ``$in`` query. New or changed
+        entries become unordered ``UpdateOne`` upserts; entries whose content
+        fingerprint matches the stored article are not rewritten, and only get
+        ``fetched_at`` refreshed or are revived when retention needs it. Entries
+        whose identity repeats within the batch, or whose upsert hits a duplicate
+        key, fall back to the per-entry path so they resolve exactly as
+        ``_upsert_article`` would.
+        """
+
+        if FEED_ARTICLES_COLLECTION is None or len(parsed_entries) == 0:
+            return []
+
+        batch_entries: list[ParsedEntry] = []
+        sequential_entries: list[ParsedEntry] = []
+        claimed_identities: set[tuple[str, str]] = set()
+        for parsed_entry in parsed_entries:
+            identities = article_identity_keys(parsed_entry)
+            if claimed_identities.isdisjoint(identities):
+                batch_entries.append(parsed_entry)
+            else:
+                sequential_entries.append(parsed_entry)
+            claimed_identities.update(identities)
+
+        existing_docs = ExistingArticleIndex(
+            FEED_ARTICLES_COLLECTION.find(
+                build_batch_article_prefetch_query(feed_id, batch_entries),
+                {
+                    "_id": 1,
+                    "dedupe_key": 1,
+                    "canonical_url": 1,
+                    "link": 1,
+                    "external_id": 1,
+                    "media_image_url": 1,
+                    "content_fingerprint": 1,
+                    "fetched_at": 1,
+                    "is_deleted": 1,
+                },
+            )
+        )
+
+        now = datetime.now(timezone.utc)
+        fetched_at_refresh_cutoff = now - ARTICLE_FETCHED_AT_REFRESH_AFTER
+        subscriber_ids = self.subscription_cache.subscribers(feed_id)
+        operations: list[UpdateOne] = []
+        operation_entries: list[ParsedEntry] = []
+        update_payloads: list[dict[str, Any]] = []
+        needs_scrape: list[bool] = []
+        unchanged_count = 0
+        for parsed_entry in batch_entries:
+            existing_doc = existing_docs.match(parsed_entry)
+            if (
+                existing_doc is not None
+                and existing_doc.get("content_fingerprint") == article_content_fingerprint(parsed_entry)
+            ):
+                unchanged_count += 1
+                fetched_at = coerce_utc_datetime(existing_doc.get("fetched_at"))
+                if (
+                    bool(existing_doc.get("is_deleted"))
+                    or fetched_at is None
+                    or fetched_at <= fetched_at_refresh_cutoff
+                ):
+                    operations.append(
+                        UpdateOne(
+                            {"_id": existing_doc["_id"]},
+                            {
+                                "$set": {
+                                    "fetched_at": now,
+                                    "is_deleted": False,
+                                    "deleted_at": None,
+                                }
+                            },
+                        )
+                    )
+                    operation_entries.append(parsed_entry)
+                    update_payloads.append({})
+                    needs_scrape.append(False)
+                continue
+
+            if existing_doc is not None:
+                article_query: dict[str, Any] = {"_id": existing_doc["_id"]}
+            else:
+                article_query = build_article_identity_query(feed_id, parsed_entry)
+
+            media_image_url = parsed_entry.media_image_url
+            if media_image_url is None:
+                media_image_url = existing_article_media_image_url(existing_doc)
+
+            update_payload = self._article_update_payload(
+                feed_id,
+                parsed_entry,
+                media_image_url,
+                now,
+                len(subscriber_ids),
+            )
+            operations.append(UpdateOne(article_query, update_payload, upsert=True))
+            operation_entries.append(parsed_entry)
+            update_payloads.append(update_payload)
+            needs_scrape.append(existing_doc is None and media_image_url is None)
+
+        logging.debug(
+            "Article upsert batch: entries=%d writes=%d unchanged=%d",
+            len(parsed_entries),
+            len(operations),
+            unchanged_count,
+        )
+
+        article_ids: dict[int, ObjectId] = {}
+        failed_indexes: set[int] = set()
+        duplicate_indexes: list[int] = []
+        try:
+            if len(operations) > 0:
+                bulk_result = FEED_ARTICLES_COLLECTION.bulk_write(operations, ordered=False)
+                article_ids.update(bulk_result.upserted_ids or {})
+        except BulkWriteError as exc:
+            details = exc.details or {}
+            for upserted in details.get("upserted", []):
+                article_ids[int(upserted["index"])] = upserted["_id"]
+            for write_error in details.get("writeErrors", []):
+                index = int(write_error.get("index", -1))
+                if write_error.get("code") == 11000:
+                    duplicate_indexes.append(index)
+                else:
+                    failed_indexes.add(index)
+                    logging.warning(
+                        "Failed to upsert article %s: %s",
+                        operation_entries[index].link,
+                        write_error.get("errmsg", "unknown error"),
+                    )
+
+        record_articles_inserted(feed_id, subscriber_ids, len(article_ids))
+
+        for index in duplicate_indexes:
+            resolved_article_id = self._resolve_duplicate_article(
+                feed_id,
+                operation_entries[index],
+                update_payloads[index],
+            )
+            if resolved_article_id is not None:
+                article_ids[index] = resolved_article_id
+
+        scrape_indexes = [
+            index
+            for index, should_scrape in enumerate(needs_scrape)
+            if should_scrape and index not in failed_indexes
+        ]
+        unresolved_dedupe_keys = [
+            operation_entries[index].dedupe_key
+            for index in scrape_indexes
+            if not isinstance(article_ids.get(index), ObjectId)
+        ]
+        if len(unresolved_dedupe_keys) > 0:
+            ids_by_dedupe_key = {
+                doc.get("dedupe_key"): doc.get("_id")
+                for doc in FEED_ARTICLES_COLLECTION.find(
+                    {
+                        "feed_id": feed_id,
+                        "dedupe_key": {"$in": unresolved_dedupe_keys},
+                    },
+                    {"_id": 1, "dedupe_key": 1},
+                )
+            }
+            for index in scrape_indexes:
+                if not isinstance(article_ids.get(index), ObjectId):
+                    possible_article_id = ids_by_dedupe_key.get(operation_entries[index].dedupe_key)
+                    if isinstance(possible_article_id, ObjectId):
+                        article_ids[index] = possible_article_id
+
+        scrape_jobs = [
+            ArticleImageScrapeJob(
+                article_id=article_ids[index],
+                article_url=operation_entries[index].link,
+            )
+            for index in scrape_indexes
+            if isinstance(article_ids.get(index), ObjectId)
+        ]
+
+        for parsed_entry in sequential_entries:
+            scrape_job = self._upsert_article(feed_id, parsed_entry, subscriber_ids)
+            if scrape_job is not None:
+                scrape_jobs.append(scrape_job)
+
+        return scrape_jobs
+
+    def run_unread_reconcile(self) -> None:
+        """Repair drift in the unread counters from current read states.
+
+        While a change stream applies read flips, this only runs once per
+        ``UNREAD_RECONCILE_INTERVAL``; otherwise it is what lowers counters
+        after reads and runs every ``UNREAD_RECONCILE_FALLBACK_INTERVAL``.
+        """
+
+        if not self._feed_collections_configured():
+            return
+
+        now_monotonic = monotonic()
+        read_flips_streamed = self.change_watcher is not None and not self.change_watcher.polling
+        if read_flips_streamed and now_monotonic < self._next_unread_reconcile_at_monotonic:
+            return
+        self._next_unread_reconcile_at_monotonic = now_monotonic + UNREAD_RECONCILE_INTERVAL.total_seconds()
+
+        try:
+            reconcile_unread_counters(self.subscription_cache.feed_user_map(), RETENTION_BATCH_SIZE)
+        except (ServerSelectionTimeoutError, NetworkTimeout, AutoReconnect) as exc:
+            logging.error(f"Feed unread reconcile DB connectivity error: {exc}")
+        except Exception as exc:
+            logging.exception(f"Feed unread reconcile failed unexpectedly: {exc}")
+
+    def run_retention(self) -> None:
+        """Run one budgeted retention pass, scheduled apart from ingestion."""
+
+        if not self._feed_collections_configured():
+            return
+
+        try:
+            self._apply_retention()
+        except (ServerSelectionTimeoutError, NetworkTimeout, AutoReconnect) as exc:
+            logging.error(f"Feed retention DB connectivity error: {exc}")
+        except Exception as exc:
+            logging.exception(f"Feed retention failed unexpectedly: {exc}")
+
+    @track_db_operation("Feeds._apply_retention")
     def _apply_retention(self) -> None:
-        """Apply soft/hard retention while preserving unread user articles."""
+        """Apply soft/hard retention while preserving unread user articles.
+
+        Each phase gets half of ``RETENTION_TIME_BUDGET`` and
+        ``RETENTION_MAX_ARTICLES``, so a soft-delete backlog cannot starve hard
+        purges. Candidates are walked in ``_id`` order and a phase that runs out
+        of budget resumes after its last examined article on the next run.
+
+        Articles whose unread counter is positive are never read. Counters can
+        lag behind subscriptions, so a zero or missing counter is only a hint
+        and those articles are still checked against read states.
+        """
 
         if (
             FEED_ARTICLES_COLLECTION is None
@@ -1165,86 +2280,123 @@ class Feeds:
         now = datetime.now(timezone.utc)
         soft_cutoff = now - SOFT_DELETE_AFTER
         hard_cutoff = now - HARD_DELETE_AFTER
+        phase_seconds = RETENTION_TIME_BUDGET.total_seconds() / 2
+        phase_max_articles = max(1, RETENTION_MAX_ARTICLES // 2)
 
-        feed_user_map = build_feed_user_map()
-
-        # Retention uses first-seen age (fetched_at), not publication date, so
-        # freshly fetched back-catalog articles are not deleted immediately.
-        soft_delete_query = {
-            "is_deleted": False,
-            "fetched_at": {"$lte": soft_cutoff},
-        }
-
-        soft_candidates = FEED_ARTICLES_COLLECTION.find(
-            soft_delete_query,
-            {"_id": 1, "feed_id": 1},
-        )
-
-        soft_delete_ids: list[ObjectId] = []
-        soft_skipped_unread = 0
-        for article_doc in soft_candidates:
-            article_id = article_doc.get("_id")
-            feed_id = article_doc.get("feed_id")
-            if not isinstance(article_id, ObjectId):
-                continue
-
-            if article_has_unread_subscribers(article_id, feed_id, feed_user_map):
-                soft_skipped_unread += 1
-                continue
-
-            soft_delete_ids.append(article_id)
+        feed_user_map = self.subscription_cache.feed_user_map()
 
-        if len(soft_delete_ids) > 0:
+        def soft_delete(article_ids: list[ObjectId]) -> None:
             FEED_ARTICLES_COLLECTION.update_many(
-                {"_id": {"$in": soft_delete_ids}},
+                {"_id": {"$in": article_ids}},
                 {
                     "$set": {
                         "is_deleted": True,
                         "deleted_at": now,
+                        UNREAD_COUNTER_FIELD: 0,
                     }
                 },
             )
 
+        def hard_delete(article_ids: list[ObjectId]) -> None:
+            FEED_ARTICLES_COLLECTION.delete_many({"_id": {"$in": article_ids}})
+            USER_ARTICLE_STATES_COLLECTION.delete_many({"article_id": {"$in": article_ids}})
+
+        # Retention uses first-seen age (fetched_at), not publication date, so
+        # freshly fetched back-catalog articles are not deleted immediately.
+        soft_marked, soft_skipped_unread, soft_finished = self._drain_retention_phase(
+            "soft",
+            {
+                "is_deleted": False,
+                "fetched_at": {"$lte": soft_cutoff},
+                UNREAD_COUNTER_FIELD: {"$not": {"$gt": 0}},
+            },
+            soft_delete,
+            feed_user_map,
+            monotonic() + phase_seconds,
+            phase_max_articles,
+        )
+
         logging.debug(
-            "Retention soft-delete: marked=%d skipped_unread=%d",
-            len(soft_delete_ids),
+            "Retention soft-delete: marked=%d skipped_unread=%d finished=%s",
+            soft_marked,
             soft_skipped_unread,
+            soft_finished,
         )
 
-        hard_candidates = FEED_ARTICLES_COLLECTION.find(
+        hard_purged, hard_skipped_unread, hard_finished = self._drain_retention_phase(
+            "hard",
             {
                 "is_deleted": True,
                 "deleted_at": {"$lte": hard_cutoff},
+                UNREAD_COUNTER_FIELD: {"$not": {"$gt": 0}},
             },
-            {"_id": 1, "feed_id": 1},
+            hard_delete,
+            feed_user_map,
+            monotonic() + phase_seconds,
+            phase_max_articles,
         )
 
-        hard_delete_ids: list[ObjectId] = []
-        hard_skipped_unread = 0
-        for article_doc in hard_candidates:
-            article_id = article_doc.get("_id")
-            feed_id = article_doc.get("feed_id")
-            if not isinstance(article_id, ObjectId):
-                continue
-
-            if article_has_unread_subscribers(article_id, feed_id, feed_user_map):
-                hard_skipped_unread += 1
-                continue
+        logging.debug(
+            "Retention hard-purge: purged=%d skipped_unread=%d finished=%s",
+            hard_purged,
+            hard_skipped_unread,
+            hard_finished,
+        )
 
-            hard_delete_ids.append(article_id)
+    def _drain_retention_phase(
+        self,
+        phase: str,
+        candidate_query: dict[str, Any],
+        remove: Callable[[list[ObjectId]], None],
+        feed_user_map: dict[ObjectId, set[str]],
+        deadline_monotonic: float,
+        max_articles: int,
+    ) -> tuple[int, int, bool]:
+        """Remove candidates batch by batch until done or out of budget.
+
+        Returns the removed and skipped-unread counts, and whether every
+        candidate was examined. The checkpoint is cleared once the phase
+        finishes, so the next pass starts from the oldest article again.
+        """
 
-        if len(hard_delete_ids) > 0:
-            FEED_ARTICLES_COLLECTION.delete_many({"_id": {"$in": hard_delete_ids}})
-            USER_ARTICLE_STATES_COLLECTION.delete_many(
-                {"article_id": {"$in": hard_delete_ids}}
+        if FEED_ARTICLES_COLLECTION is None:
+            return 0, 0, True
+
+        query = dict(candidate_query)
+        resume_after = self._retention_resume_after.get(phase)
+        if resume_after is not None:
+            query["_id"] = {"$gt": resume_after}
+
+        candidates = (
+            FEED_ARTICLES_COLLECTION.find(
+                query,
+                {"_id": 1, "feed_id": 1, UNREAD_COUNTER_FIELD: 1},
+                batch_size=RETENTION_BATCH_SIZE,
             )
-
-        logging.debug(
-            "Retention hard-purge: purged=%d skipped_unread=%d",
-            len(hard_delete_ids),
-            hard_skipped_unread,
+            .sort("_id", ASCENDING)
+            .limit(max_articles)
         )
 
+        removed = 0
+        skipped_unread = 0
+        examined = 0
+        for batch in iter_retention_batches(candidates, feed_user_map):
+            if len(batch.removable_ids) > 0:
+                remove(batch.removable_ids)
+            removed += len(batch.removable_ids)
+            skipped_unread += batch.skipped_unread
+            examined += batch.examined
+            self._retention_resume_after[phase] = batch.last_id
+
+            if monotonic() >= deadline_monotonic:
+                return removed, skipped_unread, False
+
+        if examined >= max_articles:
+            return removed, skipped_unread, False
+
+        self._retention_resume_after.pop(phase, None)
+        return removed, skipped_unread, True
+
 
 def parse_entry_published_at(entry: dict[str, Any]) -> datetime | None:
     """Parse published/updated values from a feed entry into UTC datetime."""
@@ -1750,6 +2902,170 @@ def build_article_identity_query(feed_id: ObjectId, parsed_entry: ParsedEntry) -
     }
 
 
+def build_due_sources_query(now: datetime, max_refresh_lag: timedelta) -> dict[str, Any]:
+    """Return the indexed query for subscribed sources that may be due at ``now``.
+
+    Each ``$or`` branch is served by a ``feed_sources`` index. Every fetch
+    stores ``next_refresh_at`` no later than the end of the allowed refresh lag,
+    and failures store the same time as ``next_retry_at``, so the first three
+    branches cover sources this worker scheduled. The ``last_fetched_at`` branch
+    catches rows with a later ``next_refresh_at`` from older scheduling rules.
+    """
+
+    return {
+        "is_subscribed": {"$ne": False},
+        "$or": [
+            {"force_refresh_requested_at": {"$ne": None}},
+            {"next_refresh_at": {"$lte": now}},
+            {"next_refresh_at": None},
+            {"last_fetched_at": {"$lte": now - MAX_REFRESH_INTERVAL - max_refresh_lag}},
+        ],
+    }
+
+
+def build_pending_sources_query() -> dict[str, Any]:
+    """Return a query for subscribed sources with a pending force refresh or no schedule yet."""
+
+    return {
+        "is_subscribed": {"$ne": False},
+        "$or": [
+            {"force_refresh_requested_at": {"$ne": None}},
+            {"next_refresh_at": None},
+        ],
+    }
+
+
+def source_fetch_host(source_doc: dict[str, Any]) -> str:
+    """Return the lower-cased hostname a source is fetched from, for per-host limits."""
+
+    source_url = str(source_doc.get("normalized_url", "")).strip()
+    return (urlparse(source_url).hostname or "").lower()
+
+
+def article_image_scrape_host(article_url: str) -> str:
+    """Return the host key article image scrapes are paced by, matching the request bookkeeping."""
+
+    normalized_article_url = normalize_feed_asset_url(article_url, article_url)
+    if normalized_article_url is None:
+        return ""
+
+    return urlparse(normalized_article_url).netloc.strip().lower()
+
+
+def article_content_fingerprint(parsed_entry: ParsedEntry) -> str:
+    """Return a stable hash of every parsed field an article upsert writes."""
+
+    fingerprint_material = json.dumps(
+        [
+            parsed_entry.dedupe_key,
+            parsed_entry.canonical_url,
+            parsed_entry.external_id,
+            parsed_entry.title,
+            parsed_entry.link,
+            parsed_entry.author,
+            parsed_entry.summary_html,
+            parsed_entry.published_at.isoformat() if parsed_entry.published_at is not None else None,
+            parsed_entry.media_image_url,
+        ],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(fingerprint_material.encode("utf-8")).hexdigest()
+
+
+def article_identity_keys(parsed_entry: ParsedEntry) -> set[tuple[str, str]]:
+    """Return every identity an upsert for this entry could match an article by."""
+
+    identities = {("dedupe_key", parsed_entry.dedupe_key)}
+    if parsed_entry.canonical_url is not None:
+        identities.add(("url", parsed_entry.canonical_url))
+    if parsed_entry.external_id is not None:
+        identities.add(("external_id", parsed_entry.external_id))
+    return identities
+
+
+def build_batch_article_prefetch_query(
+    feed_id: ObjectId,
+    parsed_entries: list[ParsedEntry],
+) -> dict[str, Any]:
+    """Return one query matching every existing article a batch of entries could update."""
+
+    dedupe_keys = [parsed_entry.dedupe_key for parsed_entry in parsed_entries]
+    canonical_urls = [
+        parsed_entry.canonical_url
+        for parsed_entry in parsed_entries
+        if parsed_entry.canonical_url is not None
+    ]
+    external_ids = [
+        parsed_entry.external_id
+        for parsed_entry in parsed_entries
+        if parsed_entry.external_id is not None
+    ]
+
+    identity_clauses: list[dict[str, Any]] = [{"dedupe_key": {"$in": dedupe_keys}}]
+    if len(canonical_urls) > 0:
+        identity_clauses.append({"canonical_url": {"$in": canonical_urls}})
+        identity_clauses.append({"link": {"$in": canonical_urls}})
+    if len(external_ids) > 0:
+        identity_clauses.append({"external_id": {"$in": external_ids}})
+
+    return {
+        "feed_id": feed_id,
+        "$or": identity_clauses,
+    }
+
+
+def existing_article_media_image_url(existing_doc: dict[str, Any] | None) -> str | None:
+    """Return the stored media image URL of an existing article, if any."""
+
+    if not isinstance(existing_doc, dict):
+        return None
+
+    existing_media_candidate = str(existing_doc.get("media_image_url", "")).strip()
+    return existing_media_candidate if existing_media_candidate != "" else None
+
+
+class ExistingArticleIndex:
+    """In-memory lookup of prefetched articles by the fields upserts match on."""
+
+    def __init__(self, docs: Iterable[dict[str, Any]]) -> None:
+        self._by_field: dict[str, dict[Any, dict[str, Any]]] = {
+            "dedupe_key": {},
+            "canonical_url": {},
+            "link": {},
+            "external_id": {},
+        }
+        for doc in docs:
+            if not isinstance(doc.get("_id"), ObjectId):
+                continue
+            for field, docs_by_value in self._by_field.items():
+                value = doc.get(field)
+                if value is not None:
+                    docs_by_value.setdefault(value, doc)
+
+    def _lookup(self, field: str, value: Any) -> dict[str, Any] | None:
+        return self._by_field[field].get(value) if value is not None else None
+
+    def match(self, parsed_entry: ParsedEntry) -> dict[str, Any] | None:
+        """Return the article an upsert would target, mirroring the per-entry lookups.
+
+        The dedupe-key owner wins, then ``build_article_identity_query`` clauses.
+        """
+
+        dedupe_owner = self._lookup("dedupe_key", parsed_entry.dedupe_key)
+        if dedupe_owner is not None:
+            return dedupe_owner
+
+        if parsed_entry.canonical_url is not None:
+            return (
+                self._lookup("canonical_url", parsed_entry.canonical_url)
+                or self._lookup("link", parsed_entry.canonical_url)
+                or self._lookup("external_id", parsed_entry.external_id)
+            )
+
+        return self._lookup("external_id", parsed_entry.external_id)
+
+
 def normalize_feed_asset_url(candidate: Any, source_url: str) -> str | None:
     """Normalize feed-level image/icon URLs to absolute HTTP(S) URLs."""
 
@@ -1767,59 +3083,71 @@ def normalize_feed_asset_url(candidate: Any, source_url: str) -> str | None:
     return normalized
 
 
-def _extract_meta_attributes(meta_tag: str) -> dict[str, str]:
-    """Parse one <meta> tag string into lowercase attribute mappings."""
+def iter_html_head_chunks(response: requests.Response, max_bytes: int) -> Iterator[bytes]:
+    """Yield a streamed HTML body up to ``</head>`` or ``max_bytes``.
 
-    attributes: dict[str, str] = {}
+    Meta image tags live in the head, so the rest of the page is never
+    downloaded. Callers close the response, since they may stop early.
+    """
 
-    for match in META_ATTR_RE.finditer(meta_tag):
-        attribute_name = str(match.group(1)).strip().lower()
-        if attribute_name == "":
+    bytes_read = 0
+    tail = b""
+    for chunk in response.iter_content(chunk_size=ARTICLE_IMAGE_STREAM_CHUNK_BYTES):
+        if not chunk:
             continue
 
-        raw_value = ""
-        for group_value in match.groups()[1:]:
-            if isinstance(group_value, str) and group_value.strip() != "":
-                raw_value = group_value.strip()
-                break
+        chunk = chunk[: max_bytes - bytes_read]
+        bytes_read += len(chunk)
 
-        if raw_value == "":
-            continue
+        # Keep a little of the previous chunk so a closing tag split across chunks is found
+        window = tail + chunk
+        head_end = HTML_HEAD_END_RE.search(window)
+        if head_end is not None:
+            yield chunk[: max(0, head_end.end() - len(tail))]
+            return
 
-        attributes[attribute_name] = unescape(raw_value)
+        yield chunk
+        if bytes_read >= max_bytes:
+            return
+        tail = window[-16:]
 
-    return attributes
 
+def detect_html_charset(prefix: bytes, content_type: str | None) -> str:
+    """Return the header charset, then a ``<meta>`` charset in ``prefix``, then UTF-8."""
 
-def extract_meta_image_url(page_html: str, article_url: str) -> str | None:
-    """Extract the first valid og/twitter image candidate from article HTML."""
+    charset_match = CONTENT_TYPE_CHARSET_RE.search(str(content_type or ""))
+    if charset_match is not None:
+        charset = charset_match.group(1)
+    else:
+        meta_charset_match = HTML_META_CHARSET_RE.search(prefix)
+        charset = meta_charset_match.group(1).decode("ascii") if meta_charset_match is not None else "utf-8"
 
-    if not isinstance(page_html, str) or page_html.strip() == "":
-        return None
+    try:
+        return codecs.lookup(charset).name
+    except LookupError:
+        return "utf-8"
 
-    for meta_match in META_TAG_RE.finditer(page_html):
-        attributes = _extract_meta_attributes(meta_match.group(0))
-        if len(attributes) == 0:
-            continue
 
-        content_value = str(attributes.get("content", "")).strip()
-        if content_value == "":
-            continue
+def decode_html_chunks(chunks: Iterable[bytes], content_type: str | None) -> Iterator[str]:
+    """Decode streamed HTML incrementally, picking the charset from the first chunk."""
 
-        property_value = str(attributes.get("property", "")).strip().lower()
-        name_value = str(attributes.get("name", "")).strip().lower()
-        itemprop_value = str(attributes.get("itemprop", "")).strip().lower()
+    decoder: codecs.IncrementalDecoder | None = None
+    for chunk in chunks:
+        if decoder is None:
+            decoder = codecs.getincrementaldecoder(detect_html_charset(chunk, content_type))(errors="replace")
+        yield decoder.decode(chunk)
 
-        if (
-            property_value in META_IMAGE_PROPERTY_VALUES
-            or name_value in META_IMAGE_NAME_VALUES
-            or itemprop_value == "image"
-        ):
-            normalized = normalize_feed_asset_url(content_value, article_url)
-            if normalized is not None:
-                return normalized
+    if decoder is not None:
+        yield decoder.decode(b"", final=True)
 
-    return None
+
+def extract_meta_image_url(page_html: str, article_url: str) -> str | None:
+    """Extract the best og/twitter image candidate from article HTML."""
+
+    if not isinstance(page_html, str) or page_html.strip() == "":
+        return None
+
+    return scan_meta_image_url([page_html], article_url)
 
 
 def extract_feed_image_url(feed_data: Any, source_url: str) -> str | None:
@@ -1868,49 +3196,67 @@ def coerce_utc_datetime(value: Any) -> datetime | None:
     return value.astimezone(timezone.utc)
 
 
-def build_feed_user_map() -> dict[ObjectId, set[str]]:
-    """Build a mapping of feed_id to subscribed usernames."""
-
-    if USER_FEED_SUBSCRIPTIONS_COLLECTION is None:
-        return {}
-
-    mapping: dict[ObjectId, set[str]] = {}
-
-    for sub in USER_FEED_SUBSCRIPTIONS_COLLECTION.find({}, {"feed_id": 1, "user_id": 1}):
-        feed_id = sub.get("feed_id")
-        user_id = sub.get("user_id")
-
-        if not isinstance(feed_id, ObjectId) or not isinstance(user_id, str):
+def find_articles_with_unread_subscribers(
+    article_docs: list[dict[str, Any]],
+    feed_user_map: dict[ObjectId, set[str]],
+) -> set[ObjectId]:
+    """Return ids of articles that some subscriber of their feed has not read yet.
+
+    Read states for the whole batch come from one aggregation on the
+    ``(article_id, is_read)`` index, grouped into the set of readers per
+    article, so the cost is one query per batch rather than one per article.
+    """
+
+    subscribers_by_article: dict[ObjectId, set[str]] = {}
+    for article_doc in article_docs:
+        article_id = article_doc.get("_id")
+        feed_id = article_doc.get("feed_id")
+        if not isinstance(article_id, ObjectId) or not isinstance(feed_id, ObjectId):
             continue
 
-        mapping.setdefault(feed_id, set()).add(user_id)
+        subscribed_users = feed_user_map.get(feed_id, set())
+        if len(subscribed_users) > 0:
+            subscribers_by_article[article_id] = subscribed_users
+
+    readers_by_article = read_users_by_article(list(subscribers_by_article))
 
-    return mapping
+    return {
+        article_id
+        for article_id, subscribed_users in subscribers_by_article.items()
+        if not subscribed_users <= readers_by_article.get(article_id, set())
+    }
 
 
-def article_has_unread_subscribers(
-    article_id: ObjectId,
-    feed_id: Any,
+def iter_retention_batches(
+    candidates: Iterable[dict[str, Any]],
     feed_user_map: dict[ObjectId, set[str]],
-) -> bool:
-    """Return True when any subscribed user has not read this article yet."""
+    batch_size: int = RETENTION_BATCH_SIZE,
+) -> Iterator[RetentionBatch]:
+    """Split retention candidates into batches of removable and still-unread articles."""
 
-    if USER_ARTICLE_STATES_COLLECTION is None:
-        return False
+    batch: list[dict[str, Any]] = []
+    for article_doc in candidates:
+        if isinstance(article_doc.get("_id"), ObjectId):
+            batch.append(article_doc)
+        if len(batch) >= batch_size:
+            yield _split_retention_batch(batch, feed_user_map)
+            batch = []
 
-    if not isinstance(feed_id, ObjectId):
-        return False
+    if len(batch) > 0:
+        yield _split_retention_batch(batch, feed_user_map)
 
-    subscribed_users = feed_user_map.get(feed_id, set())
-    if len(subscribed_users) == 0:
-        return False
 
-    read_count = USER_ARTICLE_STATES_COLLECTION.count_documents(
-        {
-            "article_id": article_id,
-            "user_id": {"$in": list(subscribed_users)},
-            "is_read": True,
-        }
+def _split_retention_batch(
+    batch: list[dict[str, Any]],
+    feed_user_map: dict[ObjectId, set[str]],
+) -> RetentionBatch:
+    unread_ids = find_articles_with_unread_subscribers(batch, feed_user_map)
+    removable_ids = [
+        article_doc["_id"] for article_doc in batch if article_doc["_id"] not in unread_ids
+    ]
+    return RetentionBatch(
+        last_id=batch[-1]["_id"],
+        examined=len(batch),
+        removable_ids=removable_ids,
+        skipped_unread=len(unread_ids),
     )
-
-    return read_count < len(subscribed_users)
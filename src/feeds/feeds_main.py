@@ -3,11 +3,17 @@ from __future__ import annotations
 from threading import Event
 import logging
 
-from task_scheduler import TaskScheduler
+from task_scheduler import TaskScheduler, WorkloadScheduler
 
 from .feeds import Feeds
 
 
+def register_feeds(scheduler: TaskScheduler | WorkloadScheduler) -> Feeds:
+    """Create the feed worker and schedule its tasks on ``scheduler``."""
+
+    return Feeds(scheduler)
+
+
 def feeds_loop(terminate_event: Event, log_level: int) -> None:
     """Start the feed worker scheduler loop."""
 
@@ -16,6 +22,7 @@ def feeds_loop(terminate_event: Event, log_level: int) -> None:
         level=log_level,
     )
 
-    scheduler = TaskScheduler()
-    Feeds(scheduler)
+    # Run cycles on a worker so a slow fetch does not stall dispatch of other tasks
+    scheduler = TaskScheduler(max_workers=2)
+    register_feeds(scheduler)
     scheduler.run(terminate_event)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from time import monotonic
+import logging
+
+from pymongo.collection import Collection
+from pymongo.errors import PyMongoError
+
+
+class ArticleImageResultCache:
+    """Article meta-image scrape results keyed by normalized article URL.
+
+    An in-memory LRU of up to ``max_entries`` sits in front of a Mongo
+    collection that holds one document per URL, with ``expires_at`` read
+    by a TTL index. Found and not-found (``None``) results are both cached,
+    so restarts and other worker processes skip pages already scraped. Mongo
+    errors degrade to memory-only caching. A ``ttl_seconds`` of 0 disables
+    the cache. Safe to share between threads.
+    """
+
+    def __init__(self, collection: Collection | None, ttl_seconds: float, max_entries: int) -> None:
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = Lock()
+        self._entries: OrderedDict[str, tuple[float, str | None]] = OrderedDict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, article_url: str) -> tuple[bool, str | None]:
+        """Return ``(found, media_image_url)`` for a fresh cached result."""
+
+        if self.ttl_seconds <= 0:
+            return False, None
+
+        with self._lock:
+            entry = self._entries.get(article_url)
+            if entry is not None:
+                expires_at_monotonic, media_image_url = entry
+                if monotonic() < expires_at_monotonic:
+                    self._entries.move_to_end(article_url)
+                    return True, media_image_url
+                del self._entries[article_url]
+
+        if self.collection is None:
+            return False, None
+
+        now = datetime.now(timezone.utc)
+        try:
+            # The TTL monitor only runs once a minute, so expiry is checked here too
+            doc = self.collection.find_one(
+                {"_id": article_url, "expires_at": {"$gt": now}},
+                {"_id": 0, "media_image_url": 1, "expires_at": 1},
+            )
+        except PyMongoError as exc:
+            logging.debug(f"Article image result cache read failed for {article_url}: {exc}")
+            return False, None
+
+        if doc is None:
+            return False, None
+
+        media_image_url = doc.get("media_image_url")
+        expires_at = doc["expires_at"]
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        self._remember(article_url, media_image_url, (expires_at - now).total_seconds())
+        return True, media_image_url
+
+    def put(self, article_url: str, media_image_url: str | None) -> None:
+        """Cache a scrape result in memory and in Mongo."""
+
+        if self.ttl_seconds <= 0:
+            return
+
+        self._remember(article_url, media_image_url, self.ttl_seconds)
+        if self.collection is None:
+            return
+
+        now = datetime.now(timezone.utc)
+        try:
+            self.collection.update_one(
+                {"_id": article_url},
+                {
+                    "$set": {
+                        "media_image_url": media_image_url,
+                        "cached_at": now,
+                        "expires_at": now + timedelta(seconds=self.ttl_seconds),
+                    }
+                },
+                upsert=True,
+            )
+        except PyMongoError as exc:
+            logging.debug(f"Article image result cache write failed for {article_url}: {exc}")
+
+    def _remember(self, article_url: str, media_image_url: str | None, ttl_seconds: float) -> None:
+        with self._lock:
+            self._entries[article_url] = (monotonic() + ttl_seconds, media_image_url)
+            self._entries.move_to_end(article_url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from html import unescape
+from urllib.parse import urljoin
+import re
+
+from .url_safety import is_public_http_url
+
+META_IMAGE_PROPERTY_VALUES = {
+    "og:image",
+    "og:image:url",
+    "og:image:secure_url",
+}
+META_IMAGE_NAME_VALUES = {
+    "twitter:image",
+    "twitter:image:src",
+    "og:image",
+    "og:image:url",
+    "og:image:secure_url",
+}
+
+# Tags the scanner acts on; raw text elements and comments are skipped whole
+HEAD_TOKEN_RE = re.compile(
+    r"<(?:(?P<meta>meta)\b[^>]*>"
+    r"|(?P<raw>script|style|noscript|template)\b[^>]*>"
+    r"|(?P<comment>!--)"
+    r"|(?P<end>/head\s*>|body\b))",
+    re.IGNORECASE,
+)
+RAW_TEXT_END_RES = {
+    name: re.compile(rf"</{name}\s*>", re.IGNORECASE)
+    for name in ("script", "style", "noscript", "template")
+}
+COMMENT_END_RE = re.compile(r"-->")
+META_ATTR_RE = re.compile(
+    r"([a-zA-Z_:][-a-zA-Z0-9_:.]*)\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s\"'=<>`]+))",
+)
+RAW_TEXT_END_OVERLAP = 16
+# A longer unterminated tag is treated as garbage rather than carried over
+MAX_PARTIAL_TAG_CHARS = 8_192
+
+# Lower ranks win; an accepted og image ends the scan
+OG_IMAGE_RANK = 0
+TWITTER_IMAGE_RANK = 1
+ITEMPROP_IMAGE_RANK = 2
+
+
+def normalize_meta_image_url(candidate: str, page_url: str) -> str | None:
+    """Resolve a meta image URL against the page and keep public HTTP(S) URLs only."""
+
+    trimmed = candidate.strip()
+    if trimmed == "":
+        return None
+
+    normalized = urljoin(page_url, trimmed)
+    if not is_public_http_url(normalized, require_dns_resolution=False):
+        return None
+
+    return normalized
+
+
+def meta_image_rank(attributes: dict[str, str]) -> int | None:
+    """Return the candidate rank of one ``<meta>`` tag's lowercased attributes."""
+
+    property_value = attributes.get("property", "").strip().lower()
+    name_value = attributes.get("name", "").strip().lower()
+
+    if property_value in META_IMAGE_PROPERTY_VALUES or (
+        name_value in META_IMAGE_NAME_VALUES and name_value.startswith("og:")
+    ):
+        return OG_IMAGE_RANK
+    if name_value in META_IMAGE_NAME_VALUES:
+        return TWITTER_IMAGE_RANK
+    if attributes.get("itemprop", "").strip().lower() == "image":
+        return ITEMPROP_IMAGE_RANK
+
+    return None
+
+
+class MetaImageScanner:
+    """Incremental ``<meta>`` image scanner for an article page head.
+
+    Feed decoded chunks as they arrive. Tags are found with one regex pass
+    per chunk, and a tag cut off at a chunk boundary is carried into the
+    next chunk. Script, style and comment contents are skipped. The scan is
+    ``done`` at ``</head>``, at ``<body>`` or at the first accepted og image;
+    later chunks are ignored. ``image_url`` is the best accepted candidate
+    so far, og:image over twitter:image over ``itemprop="image"``, earliest
+    first within a rank.
+    """
+
+    def __init__(self, page_url: str) -> None:
+        self.page_url = page_url
+        self.image_url: str | None = None
+        self.done = False
+        self._image_rank: int | None = None
+        self._pending = ""
+        self._raw_text_end_re: re.Pattern[str] | None = None
+
+    def feed(self, data: str) -> None:
+        if self.done:
+            return
+
+        text = self._pending + data
+        self._pending = ""
+        position = 0
+
+        while not self.done:
+            if self._raw_text_end_re is not None:
+                raw_text_end = self._raw_text_end_re.search(text, position)
+                if raw_text_end is None:
+                    # Keep enough to match a closing tag split across chunks
+                    self._pending = text[-RAW_TEXT_END_OVERLAP:]
+                    return
+                self._raw_text_end_re = None
+                position = raw_text_end.end()
+
+            token = HEAD_TOKEN_RE.search(text, position)
+            if token is None:
+                self._keep_partial_tag(text, position)
+                return
+
+            position = token.end()
+            if token.group("meta") is not None:
+                self._handle_meta(token.group(0))
+            elif token.group("raw") is not None:
+                self._raw_text_end_re = RAW_TEXT_END_RES[token.group("raw").lower()]
+            elif token.group("comment") is not None:
+                self._raw_text_end_re = COMMENT_END_RE
+            else:
+                self.done = True
+
+    def close(self) -> None:
+        self._pending = ""
+
+    def _keep_partial_tag(self, text: str, position: int) -> None:
+        tag_start = text.rfind("<", position)
+        if tag_start >= 0 and text.find(">", tag_start) < 0 and len(text) - tag_start <= MAX_PARTIAL_TAG_CHARS:
+            self._pending = text[tag_start:]
+
+    def _handle_meta(self, meta_tag: str) -> None:
+        # Most head meta tags are not images; skip parsing their attributes
+        if "image" not in meta_tag.lower():
+            return
+
+        attributes = _meta_attributes(meta_tag)
+        rank = meta_image_rank(attributes)
+        if rank is None or (self._image_rank is not None and rank >= self._image_rank):
+            return
+
+        normalized = normalize_meta_image_url(attributes.get("content", ""), self.page_url)
+        if normalized is None:
+            return
+
+        self.image_url = normalized
+        self._image_rank = rank
+        if rank == OG_IMAGE_RANK:
+            self.done = True
+
+
+def _meta_attributes(meta_tag: str) -> dict[str, str]:
+    attributes: dict[str, str] = {}
+    for match in META_ATTR_RE.finditer(meta_tag):
+        value = next((group for group in match.groups()[1:] if group is not None), "")
+        attributes.setdefault(match.group(1).lower(), unescape(value))
+
+    return attributes
+
+
+def scan_meta_image_url(chunks: Iterable[str], page_url: str) -> str | None:
+    """Return the best meta image URL from HTML chunks, reading only as far as needed."""
+
+    scanner = MetaImageScanner(page_url)
+    for chunk in chunks:
+        scanner.feed(chunk)
+        if scanner.done:
+            break
+
+    scanner.close()
+    return scanner.image_url
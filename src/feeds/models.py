@@ -28,6 +28,7 @@ class FeedSourceDocument(MongoDocumentModel):
     last_error: str | None = None
     next_retry_at: datetime | None = None
     force_refresh_requested_at: datetime | None = None
+    is_subscribed: bool | None = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
@@ -46,6 +47,41 @@ class FeedArticleDocument(MongoDocumentModel):
     summary_html: str | None = None
     media_image_url: str | None = None
     published_at: datetime | None = None
+    content_fingerprint: str | None = None
     fetched_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     is_deleted: bool = False
     deleted_at: datetime | None = None
+    # Subscribers who have not read the article; maintained by feeds.unread_counters
+    unread_subscriber_count: int | None = None
+
+
+class ArticleImageScrapeResultDocument(MongoDocumentModel):
+    """Represents one cached article meta-image scrape result, keyed by normalized article URL."""
+
+    id: str = Field(alias="_id")
+    media_image_url: str | None = None
+    cached_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    expires_at: datetime
+
+
+class ArticleImageScrapeJobDocument(MongoDocumentModel):
+    """Represents one queued article page image scrape, keyed by normalized article URL."""
+
+    id: str = Field(alias="_id")
+    host: str = ""
+    article_ids: list[ObjectId] = Field(default_factory=list)
+    priority: int = 0
+    attempts: int = 0
+    available_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    lease_owner: str | None = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class UserFeedUnreadCountDocument(MongoDocumentModel):
+    """Represents one user's count of unread live articles in one subscribed feed."""
+
+    id: ObjectId | None = Field(default=None, alias="_id")
+    user_id: str
+    feed_id: ObjectId
+    unread_count: int = 0
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from itertools import count
+from threading import Condition
+from time import monotonic
+from typing import Generic, TypeVar
+import heapq
+
+JobT = TypeVar("JobT")
+
+
+class HostScrapeQueue(Generic[JobT]):
+    """Scrape jobs grouped per host and handed out by host ready time.
+
+    Each host keeps its own FIFO of jobs and at most one heap entry, so a host
+    waiting out its pace limit or a backoff never holds up jobs for other
+    hosts. A host is handed to one worker at a time and is only re-queued when
+    that worker calls ``done``. Dispatches are also spaced by
+    ``global_min_interval_seconds`` across all hosts.
+
+    ``host_ready_at`` returns the earliest monotonic time a host may be
+    requested again. It is checked when the host reaches the head of the heap,
+    since redirects and backoffs can push a queued host later. Safe to share
+    between threads.
+    """
+
+    def __init__(
+        self,
+        host_ready_at: Callable[[str], float],
+        global_min_interval_seconds: float,
+    ) -> None:
+        self.host_ready_at = host_ready_at
+        self.global_min_interval_seconds = global_min_interval_seconds
+        self._condition = Condition()
+        self._jobs_by_host: dict[str, deque[JobT]] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._sequence = count()
+        self._active_hosts: set[str] = set()
+        self._pending_count = 0
+        self._next_dispatch_at_monotonic = 0.0
+        self._worker_count = 0
+
+    def __len__(self) -> int:
+        with self._condition:
+            return self._pending_count
+
+    def push(self, host: str, job: JobT) -> None:
+        """Queue ``job`` behind any earlier jobs for ``host``."""
+
+        with self._condition:
+            host_jobs = self._jobs_by_host.get(host)
+            if host_jobs is None:
+                host_jobs = deque()
+                self._jobs_by_host[host] = host_jobs
+                if host not in self._active_hosts:
+                    self._push_host_locked(host, 0.0)
+
+            host_jobs.append(job)
+            self._pending_count += 1
+            self._condition.notify()
+
+    def claim_workers(self, max_workers: int) -> int:
+        """Reserve and return how many more workers should start.
+
+        Workers are counted until ``take`` tells them to exit, so a job pushed
+        while the last worker is leaving still gets one.
+        """
+
+        with self._condition:
+            wanted = min(max_workers, self._pending_count) - self._worker_count
+            if wanted <= 0:
+                return 0
+
+            self._worker_count += wanted
+            return wanted
+
+    def take(self) -> tuple[str, JobT] | None:
+        """Block until some host is ready and return its oldest job.
+
+        Returns ``None`` once no jobs are pending; the caller must then exit.
+        """
+
+        with self._condition:
+            while True:
+                if self._pending_count == 0:
+                    self._worker_count -= 1
+                    return None
+
+                if len(self._heap) == 0:
+                    # Every host with jobs is in flight on another worker
+                    self._condition.wait()
+                    continue
+
+                queued_ready_at, _, host = self._heap[0]
+                ready_at = max(queued_ready_at, self.host_ready_at(host))
+                if ready_at > queued_ready_at:
+                    heapq.heapreplace(self._heap, (ready_at, next(self._sequence), host))
+                    continue
+
+                now_monotonic = monotonic()
+                wait_seconds = max(ready_at, self._next_dispatch_at_monotonic) - now_monotonic
+                if wait_seconds > 0:
+                    self._condition.wait(wait_seconds)
+                    continue
+
+                heapq.heappop(self._heap)
+                job = self._jobs_by_host[host].popleft()
+                self._pending_count -= 1
+                self._active_hosts.add(host)
+                self._next_dispatch_at_monotonic = now_monotonic + self.global_min_interval_seconds
+                return host, job
+
+    def done(self, host: str) -> None:
+        """Release ``host`` after its job finished so its next job can be scheduled."""
+
+        with self._condition:
+            self._active_hosts.discard(host)
+            host_jobs = self._jobs_by_host.get(host)
+            if host_jobs is None:
+                return
+
+            if len(host_jobs) == 0:
+                del self._jobs_by_host[host]
+            else:
+                self._push_host_locked(host, self.host_ready_at(host))
+            # Idle workers may be waiting for a host or for the queue to drain
+            self._condition.notify_all()
+
+    def _push_host_locked(self, host: str, ready_at: float) -> None:
+        heapq.heappush(self._heap, (ready_at, next(self._sequence), host))
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+from collections.abc import Collection as AbstractCollection, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+import os
+import socket
+import uuid
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+from pymongo.collection import Collection
+from pymongo.operations import UpdateOne
+
+# Priority of scrapes queued by ordinary feed cycles
+DEFAULT_SCRAPE_PRIORITY = 0
+
+
+@dataclass(frozen=True, slots=True)
+class LeasedScrapeJob:
+    """One article page to scrape, with every article id that links to it."""
+
+    article_url: str
+    article_ids: tuple[ObjectId, ...]
+    attempts: int = 0
+    priority: int = DEFAULT_SCRAPE_PRIORITY
+    # False for jobs only held in memory because the store was unavailable
+    stored: bool = False
+
+
+def scrape_job_host(article_url: str) -> str:
+    """Return the host a normalized article URL is stored and capped under."""
+
+    return urlparse(article_url).netloc.strip().lower()
+
+
+class ScrapeJobStore:
+    """Article image scrape jobs kept in Mongo so a restart resumes the backlog.
+
+    One document per normalized article URL, with ``_id`` set to the URL and
+    the linking article ids in ``article_ids``, so repeat enqueues of a URL or
+    an article merge into the existing job. Jobs become eligible at
+    ``available_at`` and are leased highest ``priority`` first, then oldest
+    first. A lease pushes ``available_at`` out by ``lease_seconds`` and counts
+    an attempt, so a job held by a crashed worker comes back on its own.
+    Callers renew the lease when they start a job, as a leased job may wait
+    in memory behind its host. Failed jobs are retried with exponential backoff and dropped after
+    ``max_attempts``.
+    """
+
+    def __init__(
+        self,
+        collection: Collection,
+        *,
+        lease_seconds: float,
+        max_attempts: int,
+        retry_base_seconds: float,
+    ) -> None:
+        self.collection = collection
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def enqueue(self, article_ids_by_url: Mapping[str, list[ObjectId]], priority: int) -> None:
+        """Add or merge jobs; a job keeps the highest priority it was queued with.
+
+        URLs must already be normalized. Articles already queued under another
+        URL are left with that job.
+        """
+
+        all_article_ids = [article_id for article_ids in article_ids_by_url.values() for article_id in article_ids]
+        if len(all_article_ids) == 0:
+            return
+
+        queued_urls_by_article_id: dict[ObjectId, str] = {}
+        for doc in self.collection.find({"article_ids": {"$in": all_article_ids}}, {"article_ids": 1}):
+            for article_id in doc.get("article_ids", []):
+                queued_urls_by_article_id[article_id] = doc["_id"]
+
+        new_article_ids_by_url: dict[str, list[ObjectId]] = {}
+        for article_url, article_ids in article_ids_by_url.items():
+            new_article_ids = [
+                article_id
+                for article_id in article_ids
+                if queued_urls_by_article_id.get(article_id, article_url) == article_url
+            ]
+            if len(new_article_ids) > 0:
+                new_article_ids_by_url[article_url] = new_article_ids
+
+        if len(new_article_ids_by_url) == 0:
+            return
+
+        now = datetime.now(timezone.utc)
+        self.collection.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": article_url},
+                    {
+                        "$addToSet": {"article_ids": {"$each": article_ids}},
+                        "$max": {"priority": priority},
+                        "$setOnInsert": {
+                            "host": scrape_job_host(article_url),
+                            "attempts": 0,
+                            "available_at": now,
+                            "lease_owner": None,
+                            "created_at": now,
+                        },
+                    },
+                    upsert=True,
+                )
+                for article_url, article_ids in new_article_ids_by_url.items()
+            ],
+            ordered=False,
+        )
+
+    def lease(
+        self,
+        limit: int,
+        *,
+        held_urls: AbstractCollection[str] = (),
+        exclude_hosts: AbstractCollection[str] = (),
+        max_per_host: int | None = None,
+    ) -> list[LeasedScrapeJob]:
+        """Claim up to ``limit`` eligible jobs for this process.
+
+        ``held_urls`` are jobs the caller already holds. They are not leased
+        again, as their lease may have run out while they waited and leasing
+        them would count an attempt that never happened. Jobs for
+        ``exclude_hosts``, and for hosts with ``max_per_host`` jobs held or
+        leased here, are left for later so one slow host cannot fill the batch.
+        """
+
+        now = datetime.now(timezone.utc)
+        self.collection.delete_many({"attempts": {"$gte": self.max_attempts}, "available_at": {"$lte": now}})
+
+        query: dict[str, object] = {"available_at": {"$lte": now}, "attempts": {"$lt": self.max_attempts}}
+        if len(held_urls) > 0:
+            query["_id"] = {"$nin": list(held_urls)}
+
+        excluded_hosts = set(exclude_hosts)
+        count_by_host: dict[str, int] = {}
+        if max_per_host is not None:
+            for article_url in held_urls:
+                host = scrape_job_host(article_url)
+                count_by_host[host] = count_by_host.get(host, 0) + 1
+            excluded_hosts.update(host for host, count in count_by_host.items() if count >= max_per_host)
+
+        leased: list[LeasedScrapeJob] = []
+        for _ in range(limit):
+            if len(excluded_hosts) > 0:
+                query["host"] = {"$nin": sorted(excluded_hosts)}
+
+            doc = self.collection.find_one_and_update(
+                query,
+                {
+                    "$set": {
+                        "available_at": now + timedelta(seconds=self.lease_seconds),
+                        "lease_owner": self.owner,
+                    },
+                    "$inc": {"attempts": 1},
+                },
+                sort=[("priority", DESCENDING), ("available_at", ASCENDING)],
+                return_document=ReturnDocument.AFTER,
+            )
+            if doc is None:
+                break
+
+            job = LeasedScrapeJob(
+                article_url=doc["_id"],
+                article_ids=tuple(doc.get("article_ids", [])),
+                attempts=int(doc.get("attempts", 1)),
+                priority=int(doc.get("priority", DEFAULT_SCRAPE_PRIORITY)),
+                stored=True,
+            )
+            leased.append(job)
+
+            if max_per_host is not None:
+                host = scrape_job_host(job.article_url)
+                count_by_host[host] = count_by_host.get(host, 0) + 1
+                if count_by_host[host] >= max_per_host:
+                    excluded_hosts.add(host)
+
+        return leased
+
+    def renew(self, job: LeasedScrapeJob) -> bool:
+        """Extend a held lease from now; returns False if another process has taken the job."""
+
+        result = self.collection.update_one(
+            {"_id": job.article_url, "lease_owner": self.owner},
+            {"$set": {"available_at": datetime.now(timezone.utc) + timedelta(seconds=self.lease_seconds)}},
+        )
+        return result.matched_count > 0
+
+    def complete(self, job: LeasedScrapeJob) -> list[ObjectId]:
+        """Remove a finished job and return every article id now linked to it.
+
+        Articles merged into the job after it was leased are included, so they
+        get the same result.
+        """
+
+        doc = self.collection.find_one_and_delete(
+            {"_id": job.article_url, "lease_owner": self.owner},
+            projection={"article_ids": 1},
+        )
+        article_ids = list(job.article_ids)
+        if doc is not None:
+            article_ids.extend(
+                article_id for article_id in doc.get("article_ids", []) if article_id not in job.article_ids
+            )
+        return article_ids
+
+    def retry(self, job: LeasedScrapeJob) -> bool:
+        """Release a failed job for a later attempt; returns False once it is given up."""
+
+        if job.attempts >= self.max_attempts:
+            self.collection.delete_one({"_id": job.article_url, "lease_owner": self.owner})
+            return False
+
+        delay_seconds = self.retry_base_seconds * (2 ** max(0, job.attempts - 1))
+        self.collection.update_one(
+            {"_id": job.article_url, "lease_owner": self.owner},
+            {
+                "$set": {
+                    "available_at": datetime.now(timezone.utc) + timedelta(seconds=delay_seconds),
+                    "lease_owner": None,
+                }
+            },
+        )
+        return True
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from datetime import datetime
+import heapq
+
+from bson import ObjectId
+
+
+class SourceDueQueue:
+    """Feed source ids ordered by next due time.
+
+    Updating a source pushes a new heap entry and leaves the old one in place;
+    stale entries are skipped when they reach the head and the heap is rebuilt
+    once they outnumber live ones. Not thread-safe, callers hold their own lock.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime, ObjectId]] = []
+        self._due_at: dict[ObjectId, datetime] = {}
+
+    def __len__(self) -> int:
+        return len(self._due_at)
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._due_at.clear()
+
+    def update(self, source_id: ObjectId, due_at: datetime) -> None:
+        """Set when ``source_id`` is next due, replacing any earlier due time."""
+
+        if self._due_at.get(source_id) == due_at:
+            return
+
+        self._due_at[source_id] = due_at
+        heapq.heappush(self._heap, (due_at, source_id))
+
+        if len(self._heap) > 2 * len(self._due_at) + 64:
+            self._heap = [(due, queued_id) for queued_id, due in self._due_at.items()]
+            heapq.heapify(self._heap)
+
+    def remove(self, source_id: ObjectId) -> None:
+        self._due_at.pop(source_id, None)
+
+    def _discard_stale_head(self) -> None:
+        while len(self._heap) > 0:
+            due_at, source_id = self._heap[0]
+            if self._due_at.get(source_id) == due_at:
+                return
+            heapq.heappop(self._heap)
+
+    def next_due_at(self) -> datetime | None:
+        self._discard_stale_head()
+        return self._heap[0][0] if len(self._heap) > 0 else None
+
+    def pop_due(self, now: datetime) -> list[ObjectId]:
+        """Remove and return every source due at or before ``now``, earliest first."""
+
+        due_source_ids: list[ObjectId] = []
+
+        self._discard_stale_head()
+        while len(self._heap) > 0 and self._heap[0][0] <= now:
+            _, source_id = heapq.heappop(self._heap)
+            del self._due_at[source_id]
+            due_source_ids.append(source_id)
+            self._discard_stale_head()
+
+        return due_source_ids
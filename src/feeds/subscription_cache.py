@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from threading import Lock
+from time import monotonic
+from typing import Any
+import logging
+
+from bson import ObjectId
+from pymongo.collection import Collection
+
+
+class SubscriptionCache:
+    """In-memory feed id to subscriber ids map built from ``user_feed_subscriptions``.
+
+    The map is loaded with one scan and reloaded at most every
+    ``max_age_seconds``; readers that find it stale together share one
+    reload. In between, ``add`` and ``remove`` apply single subscription
+    changes, keyed by subscription ``_id`` so deletes that only carry a
+    document key can be applied. Changes made while a reload is scanning are
+    replayed onto its result, so an older snapshot never drops them. Safe to
+    share between threads.
+    """
+
+    def __init__(self, collection: Collection | None, max_age_seconds: float) -> None:
+        self.collection = collection
+        self.max_age_seconds = max_age_seconds
+        self._lock = Lock()
+        # Held for a whole reload, so only one scan runs at a time
+        self._reload_lock = Lock()
+        self._subscriptions: dict[ObjectId, tuple[ObjectId, str]] = {}
+        self._users_by_feed: dict[ObjectId, set[str]] = {}
+        self._loaded_at_monotonic: float | None = None
+        # Changes applied during the running reload, as (subscription id, entry or None for a removal)
+        self._changes_during_reload: list[tuple[ObjectId, tuple[ObjectId, str] | None]] | None = None
+
+    def reload(self) -> None:
+        """Replace the map with the current contents of the collection."""
+
+        with self._reload_lock:
+            self._reload_locked()
+
+    def _reload_locked(self) -> None:
+        if self.collection is None:
+            return
+
+        with self._lock:
+            self._changes_during_reload = []
+
+        try:
+            subscriptions: dict[ObjectId, tuple[ObjectId, str]] = {}
+            for subscription in self.collection.find({}, {"_id": 1, "feed_id": 1, "user_id": 1}):
+                entry = _subscription_entry(subscription)
+                if entry is not None:
+                    subscriptions[subscription["_id"]] = entry
+
+            users_by_feed: dict[ObjectId, set[str]] = {}
+            for feed_id, user_id in subscriptions.values():
+                users_by_feed.setdefault(feed_id, set()).add(user_id)
+
+            with self._lock:
+                changes = self._changes_during_reload
+                self._subscriptions = subscriptions
+                self._users_by_feed = users_by_feed
+                for subscription_id, change_entry in changes:
+                    self._remove_locked(subscription_id)
+                    if change_entry is not None:
+                        self._add_locked(subscription_id, change_entry)
+                self._loaded_at_monotonic = monotonic()
+        finally:
+            with self._lock:
+                self._changes_during_reload = None
+
+        logging.debug(
+            f"Subscription cache loaded {len(subscriptions)} subscriptions, replayed {len(changes)} changes"
+        )
+
+    def _is_stale(self) -> bool:
+        with self._lock:
+            loaded_at = self._loaded_at_monotonic
+
+        return loaded_at is None or monotonic() - loaded_at >= self.max_age_seconds
+
+    def _ensure_fresh(self) -> None:
+        if not self._is_stale():
+            return
+
+        with self._reload_lock:
+            # Another reader may have reloaded while this one waited
+            if self._is_stale():
+                self._reload_locked()
+
+    def add(self, subscription: Mapping[str, Any]) -> None:
+        """Apply an inserted or replaced subscription document."""
+
+        entry = _subscription_entry(subscription)
+        if entry is None:
+            return
+
+        with self._lock:
+            self._remove_locked(subscription["_id"])
+            self._add_locked(subscription["_id"], entry)
+            if self._changes_during_reload is not None:
+                self._changes_during_reload.append((subscription["_id"], entry))
+
+    def remove(self, subscription_id: ObjectId) -> None:
+        """Apply a deleted subscription."""
+
+        with self._lock:
+            self._remove_locked(subscription_id)
+            if self._changes_during_reload is not None:
+                self._changes_during_reload.append((subscription_id, None))
+
+    def _add_locked(self, subscription_id: ObjectId, entry: tuple[ObjectId, str]) -> None:
+        self._subscriptions[subscription_id] = entry
+        self._users_by_feed.setdefault(entry[0], set()).add(entry[1])
+
+    def _remove_locked(self, subscription_id: ObjectId) -> None:
+        entry = self._subscriptions.pop(subscription_id, None)
+        if entry is None:
+            return
+
+        # Subscriptions are unique per (user_id, feed_id), so the user is gone from the feed
+        feed_id, user_id = entry
+        users = self._users_by_feed.get(feed_id)
+        if users is not None:
+            users.discard(user_id)
+            if len(users) == 0:
+                del self._users_by_feed[feed_id]
+
+    def feed_user_map(self) -> dict[ObjectId, set[str]]:
+        """Return a copy of the feed id to subscriber ids map."""
+
+        self._ensure_fresh()
+        with self._lock:
+            return {feed_id: set(users) for feed_id, users in self._users_by_feed.items()}
+
+    def feed_ids(self) -> list[ObjectId]:
+        """Return the ids of feeds with at least one subscriber."""
+
+        self._ensure_fresh()
+        with self._lock:
+            return list(self._users_by_feed)
+
+    def subscribers(self, feed_id: ObjectId) -> list[str]:
+        """Return the ids of users subscribed to ``feed_id``."""
+
+        self._ensure_fresh()
+        with self._lock:
+            return list(self._users_by_feed.get(feed_id, ()))
+
+
+def _subscription_entry(subscription: Mapping[str, Any]) -> tuple[ObjectId, str] | None:
+    subscription_id = subscription.get("_id")
+    feed_id = subscription.get("feed_id")
+    user_id = subscription.get("user_id")
+    if (
+        not isinstance(subscription_id, ObjectId)
+        or not isinstance(feed_id, ObjectId)
+        or not isinstance(user_id, str)
+    ):
+        return None
+
+    return feed_id, user_id
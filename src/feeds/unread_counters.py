@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+import logging
+
+from bson import ObjectId
+from pymongo.operations import DeleteOne, UpdateOne
+
+from database import track_db_operation
+
+from . import (
+    FEED_ARTICLES_COLLECTION,
+    USER_ARTICLE_STATES_COLLECTION,
+    USER_FEED_SUBSCRIPTIONS_COLLECTION,
+    USER_FEED_UNREAD_COUNTS_COLLECTION,
+)
+
+# Article field holding how many subscribers of its feed have not read it
+UNREAD_COUNTER_FIELD = "unread_subscriber_count"
+
+
+@dataclass(frozen=True, slots=True)
+class ReadStateChange:
+    """One user's read flag on one article flipping; ``delta`` is -1 for read, +1 for unread."""
+
+    user_id: str
+    article_id: ObjectId
+    delta: int
+
+
+def read_users_by_article(article_ids: list[ObjectId]) -> dict[ObjectId, set[str]]:
+    """Return the users who have read each article, from one aggregation."""
+
+    if USER_ARTICLE_STATES_COLLECTION is None or len(article_ids) == 0:
+        return {}
+
+    readers_by_article: dict[ObjectId, set[str]] = {}
+    for row in USER_ARTICLE_STATES_COLLECTION.aggregate(
+        [
+            {
+                "$match": {
+                    "article_id": {"$in": article_ids},
+                    "is_read": True,
+                }
+            },
+            {"$group": {"_id": "$article_id", "readers": {"$addToSet": "$user_id"}}},
+        ]
+    ):
+        readers_by_article[row["_id"]] = set(row.get("readers", []))
+
+    return readers_by_article
+
+
+def record_articles_inserted(feed_id: ObjectId, subscriber_ids: Iterable[str], inserted_count: int) -> None:
+    """Count newly inserted articles as unread for every subscriber of their feed.
+
+    The articles themselves get their counter from ``$setOnInsert`` in the upsert.
+    """
+
+    subscriber_ids = list(subscriber_ids)
+    if USER_FEED_UNREAD_COUNTS_COLLECTION is None or inserted_count <= 0 or len(subscriber_ids) == 0:
+        return
+
+    now = datetime.now(timezone.utc)
+    USER_FEED_UNREAD_COUNTS_COLLECTION.bulk_write(
+        [
+            UpdateOne(
+                {"user_id": user_id, "feed_id": feed_id},
+                {"$inc": {"unread_count": inserted_count}, "$set": {"updated_at": now}},
+                upsert=True,
+            )
+            for user_id in subscriber_ids
+        ],
+        ordered=False,
+    )
+
+
+@track_db_operation("unread_counters.record_read_state_changes")
+def record_read_state_changes(changes: list[ReadStateChange]) -> None:
+    """Apply read/unread flips to the article and user/feed counters.
+
+    Only flips by users subscribed to the article's feed count. Counters are
+    never taken below zero, and articles without a counter yet, or with a
+    counter that already disagrees with the flip, are left for
+    ``reconcile_unread_counters``.
+    """
+
+    if (
+        FEED_ARTICLES_COLLECTION is None
+        or USER_FEED_SUBSCRIPTIONS_COLLECTION is None
+        or USER_FEED_UNREAD_COUNTS_COLLECTION is None
+        or len(changes) == 0
+    ):
+        return
+
+    articles_by_id = {
+        article["_id"]: article
+        for article in FEED_ARTICLES_COLLECTION.find(
+            {"_id": {"$in": list({change.article_id for change in changes})}},
+            {"_id": 1, "feed_id": 1, "is_deleted": 1, UNREAD_COUNTER_FIELD: 1},
+        )
+    }
+    feed_ids = list({article.get("feed_id") for article in articles_by_id.values()})
+    subscriptions = {
+        (subscription.get("user_id"), subscription.get("feed_id"))
+        for subscription in USER_FEED_SUBSCRIPTIONS_COLLECTION.find(
+            {
+                "user_id": {"$in": list({change.user_id for change in changes})},
+                "feed_id": {"$in": feed_ids},
+            },
+            {"_id": 0, "user_id": 1, "feed_id": 1},
+        )
+    }
+
+    now = datetime.now(timezone.utc)
+    article_operations: list[UpdateOne] = []
+    count_operations: list[UpdateOne] = []
+    for change in changes:
+        article = articles_by_id.get(change.article_id)
+        if article is None or (change.user_id, article.get("feed_id")) not in subscriptions:
+            continue
+
+        unread_subscriber_count = article.get(UNREAD_COUNTER_FIELD)
+        if not isinstance(unread_subscriber_count, int) or (change.delta < 0 and unread_subscriber_count <= 0):
+            continue
+        article[UNREAD_COUNTER_FIELD] = unread_subscriber_count + change.delta
+
+        floor = {"$gt": 0} if change.delta < 0 else {"$type": "number"}
+        article_operations.append(
+            UpdateOne(
+                {"_id": change.article_id, UNREAD_COUNTER_FIELD: floor},
+                {"$inc": {UNREAD_COUNTER_FIELD: change.delta}},
+            )
+        )
+        if not bool(article.get("is_deleted")):
+            count_operations.append(
+                UpdateOne(
+                    {
+                        "user_id": change.user_id,
+                        "feed_id": article.get("feed_id"),
+                        "unread_count": floor,
+                    },
+                    {"$inc": {"unread_count": change.delta}, "$set": {"updated_at": now}},
+                )
+            )
+
+    if len(article_operations) > 0:
+        FEED_ARTICLES_COLLECTION.bulk_write(article_operations, ordered=False)
+    if len(count_operations) > 0:
+        USER_FEED_UNREAD_COUNTS_COLLECTION.bulk_write(count_operations, ordered=False)
+
+
+@track_db_operation("unread_counters.record_subscription_added")
+def record_subscription_added(feed_id: ObjectId, user_id: str) -> None:
+    """Count a feed's live articles as unread for a new subscriber.
+
+    A returning subscriber's earlier reads are not subtracted here; the
+    overcount only delays retention until the next reconcile.
+    """
+
+    if FEED_ARTICLES_COLLECTION is None or USER_FEED_UNREAD_COUNTS_COLLECTION is None:
+        return
+
+    live_query = {"feed_id": feed_id, "is_deleted": False}
+    FEED_ARTICLES_COLLECTION.update_many(
+        {**live_query, UNREAD_COUNTER_FIELD: {"$type": "number"}},
+        {"$inc": {UNREAD_COUNTER_FIELD: 1}},
+    )
+    USER_FEED_UNREAD_COUNTS_COLLECTION.update_one(
+        {"user_id": user_id, "feed_id": feed_id},
+        {
+            "$set": {
+                "unread_count": FEED_ARTICLES_COLLECTION.count_documents(live_query),
+                "updated_at": datetime.now(timezone.utc),
+            }
+        },
+        upsert=True,
+    )
+
+
+def _batched(docs: Iterable[dict[str, Any]], batch_size: int) -> Iterator[list[dict[str, Any]]]:
+    batch: list[dict[str, Any]] = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if len(batch) > 0:
+        yield batch
+
+
+@track_db_operation("unread_counters.reconcile_unread_counters")
+def reconcile_unread_counters(
+    feed_user_map: dict[ObjectId, set[str]],
+    batch_size: int,
+) -> tuple[int, int]:
+    """Recompute every live article's counter and every user/feed count from read states.
+
+    Only values that drifted are written. Returns the number of article
+    counters and user/feed counts repaired.
+    """
+
+    if FEED_ARTICLES_COLLECTION is None or USER_FEED_UNREAD_COUNTS_COLLECTION is None:
+        return 0, 0
+
+    unread_counts: Counter[tuple[str, ObjectId]] = Counter()
+    articles_repaired = 0
+    for feed_id, subscriber_ids in feed_user_map.items():
+        # Subscribers with nothing unread still get a row
+        for user_id in subscriber_ids:
+            unread_counts.setdefault((user_id, feed_id), 0)
+
+        cursor = FEED_ARTICLES_COLLECTION.find(
+            {"feed_id": feed_id, "is_deleted": False},
+            {"_id": 1, UNREAD_COUNTER_FIELD: 1},
+            batch_size=batch_size,
+        )
+        for batch in _batched(cursor, batch_size):
+            readers_by_article = read_users_by_article([article["_id"] for article in batch])
+            operations: list[UpdateOne] = []
+            for article in batch:
+                unread_user_ids = subscriber_ids - readers_by_article.get(article["_id"], set())
+                for user_id in unread_user_ids:
+                    unread_counts[(user_id, feed_id)] += 1
+                if article.get(UNREAD_COUNTER_FIELD) != len(unread_user_ids):
+                    operations.append(
+                        UpdateOne(
+                            {"_id": article["_id"]},
+                            {"$set": {UNREAD_COUNTER_FIELD: len(unread_user_ids)}},
+                        )
+                    )
+
+            if len(operations) > 0:
+                FEED_ARTICLES_COLLECTION.bulk_write(operations, ordered=False)
+                articles_repaired += len(operations)
+
+    unsubscribed_result = FEED_ARTICLES_COLLECTION.update_many(
+        {
+            "feed_id": {"$nin": list(feed_user_map)},
+            "is_deleted": False,
+            UNREAD_COUNTER_FIELD: {"$ne": 0},
+        },
+        {"$set": {UNREAD_COUNTER_FIELD: 0}},
+    )
+    articles_repaired += unsubscribed_result.modified_count
+
+    now = datetime.now(timezone.utc)
+    count_operations: list[UpdateOne | DeleteOne] = []
+    for row in USER_FEED_UNREAD_COUNTS_COLLECTION.find(
+        {},
+        {"_id": 1, "user_id": 1, "feed_id": 1, "unread_count": 1},
+    ):
+        key = (row.get("user_id"), row.get("feed_id"))
+        if key not in unread_counts:
+            count_operations.append(DeleteOne({"_id": row["_id"]}))
+        elif row.get("unread_count") == unread_counts[key]:
+            del unread_counts[key]
+
+    for (user_id, feed_id), unread_count in unread_counts.items():
+        count_operations.append(
+            UpdateOne(
+                {"user_id": user_id, "feed_id": feed_id},
+                {"$set": {"unread_count": unread_count, "updated_at": now}},
+                upsert=True,
+            )
+        )
+
+    if len(count_operations) > 0:
+        USER_FEED_UNREAD_COUNTS_COLLECTION.bulk_write(count_operations, ordered=False)
+
+    logging.debug(
+        "Unread counter reconcile: articles_repaired=%d counts_repaired=%d",
+        articles_repaired,
+        len(count_operations),
+    )
+    return articles_repaired, len(count_operations)
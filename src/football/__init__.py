@@ -3,6 +3,7 @@ import logging
 import sys
 from pathlib import Path
 
+import aiohttp
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -50,7 +51,7 @@ def _log_football_api_response(response: requests.Response, *_args, **_kwargs) -
 
     return response
 
-mongo_db = BackendDatabase()
+mongo_db = BackendDatabase("football")
 
 pl_match_collection = mongo_db.get_collection(
     pl_matches_collection_name(), db_name=PL_DATABASE
@@ -115,10 +116,30 @@ def close_requests_session() -> None:
 
 atexit.register(close_requests_session)
 
+# aiohttp session for the asyncio runtime, created on first use inside the event loop
+_aiohttp_session: aiohttp.ClientSession | None = None
+
+def get_aiohttp_session() -> aiohttp.ClientSession:
+    global _aiohttp_session
+    if _aiohttp_session is None or _aiohttp_session.closed:
+        _aiohttp_session = aiohttp.ClientSession(
+            headers={
+                'X-Auth-Token': api_key,
+                'X-Api-Version': 'v4.1',
+            }
+        )
+    return _aiohttp_session
+
+async def close_aiohttp_session() -> None:
+    if _aiohttp_session is not None and not _aiohttp_session.closed:
+        await _aiohttp_session.close()
+
 from .football import Football
-from .football_main import football_loop
+from .football_main import football_loop, register_football
 
 __all__ = [
     'Football',
+    'close_aiohttp_session',
     'football_loop',
+    'register_football',
 ]
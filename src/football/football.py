@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from datetime import datetime, time, timedelta, timezone
 from enum import Enum, auto
+import asyncio
 import logging
 from zoneinfo import ZoneInfo
 import json
@@ -11,6 +12,7 @@ from pymongo import ASCENDING
 from pymongo.operations import UpdateOne
 
 from . import (
+    get_aiohttp_session,
     requests_session,
     pl_match_collection,
     pl_table_collection,
@@ -30,7 +32,8 @@ from .models import (
     MatchStatus,
 )
 
-from task_scheduler import TaskScheduler
+from database import track_db_operation
+from task_scheduler import TaskScheduler, WorkloadScheduler
 
 from utils.network_utils import (
     FOOTBALL_API_MIN_INTERVAL,
@@ -38,6 +41,7 @@ from utils.network_utils import (
     LivePollPeriodTracker,
     get_last_football_api_failure,
     get_request,
+    get_request_async,
 )
 
 from .push_notifications import (
@@ -142,7 +146,11 @@ class TableUpdate:
 
 
 class Football:
-    def __init__(self, scheduler: TaskScheduler, daily_retry: DailyApiRetryScheduler) -> None:
+    def __init__(
+        self,
+        scheduler: TaskScheduler | WorkloadScheduler,
+        daily_retry: DailyApiRetryScheduler,
+    ) -> None:
         self.scheduler = scheduler
         self.daily_retry = daily_retry
         self._live_poll_period = LivePollPeriodTracker("PL")
@@ -194,10 +202,25 @@ class Football:
             self._schedule_daily_retry("get_season_matches", self.get_season_matches)
 
     def get_todays_matches(self) -> None:
-        matches = self.get_matches_between_dates(
-            datetime.now(timezone.utc), datetime.now(timezone.utc)
+        self._update_todays_matches(
+            self.get_matches_between_dates(
+                datetime.now(timezone.utc), datetime.now(timezone.utc)
+            )
         )
 
+    async def get_todays_matches_async(self) -> None:
+        """Event-loop variant of get_todays_matches used by AsyncTaskScheduler."""
+        now = datetime.now(timezone.utc)
+        content = await get_request_async(self._matches_url(now, now), get_aiohttp_session())
+
+        # Parsing, notifications and database writes stay off the event loop
+        matches = None
+        if content is not None:
+            matches = await asyncio.to_thread(self._store_matches, content)
+
+        await asyncio.to_thread(self._update_todays_matches, matches)
+
+    def _update_todays_matches(self, matches: list[Match] | None) -> None:
         if matches is None:
             logging.warning("Live match update failed; next poll at normal interval")
             self.update_live_table(None)
@@ -237,74 +260,77 @@ class Football:
     ) -> list[Match] | None:
         logging.debug("Getting Matches")
 
-        match_list: list[Match] = []
+        response = get_request(self._matches_url(from_date, to_date), requests_session)
+
+        if response is None:
+            return None
 
-        # Ensure times are in UTC and add one day to the end time as it is not inclusive
+        return self._store_matches(response.content)
+
+    def _matches_url(self, from_date: datetime, to_date: datetime) -> str:
+        # Ensure times are in UTC
         from_date = from_date.astimezone(timezone.utc)
         to_date = to_date.astimezone(timezone.utc)
 
-        response = get_request(
-            f"https://api.football-data.org/v4/competitions/PL/matches?dateFrom={from_date.date()}&dateTo={to_date.date()}",
-            requests_session
-        )
+        return f"https://api.football-data.org/v4/competitions/PL/matches?dateFrom={from_date.date()}&dateTo={to_date.date()}"
 
-        if response is not None:
-            logging.debug("Parsing Matches")
+    def _store_matches(self, content: bytes) -> list[Match] | None:
+        """Parse a matches response, notify on state changes and write the matches."""
+        logging.debug("Parsing Matches")
 
-            try:
-                matches = Matches.model_validate_json(response.content)
-            except ValidationError as e:
-                logging.error(f"Failed to Parse Matches: {response.content}")
-                logging.error(e.json(indent=2))
-                return None
-
-            match_list = [match for match in matches.matches]
-
-            # If a match utc time is midnight, set it to 3pm in the Europe/London timezone
-            for match in match_list:
-                # Check if the time is midnight
-                if match.utc_date.time() == time(hour=0):
-                    # Set the time to 3pm in the Europe/London timezone as timezone UTC
-                    match.utc_date = datetime(
-                        match.utc_date.year,
-                        match.utc_date.month,
-                        match.utc_date.day,
-                        15,
-                        tzinfo=ZoneInfo("Europe/London"),
-                    ).astimezone(timezone.utc)
-
-                    # Log the change
-                    logging.debug(f"Match Time Changed: {match.utc_date}")
-
-                # Compare the current match state with the previous match state
-                if pl_match_collection is not None:
-                    previous_match = pl_match_collection.find_one({"id": match.id})
-                    if previous_match is not None:
-                        previous_match = Match.model_validate(previous_match)
-
-                    self.CompareMatchStates(previous_match, match)
-
-            logging.debug("Creating Operations")
-            operations = [
-                UpdateOne({"id": match.id}, {"$set": match.model_dump()}, upsert=True)
-                for match in match_list
-            ]
+        try:
+            matches = Matches.model_validate_json(content)
+        except ValidationError as e:
+            logging.error(f"Failed to Parse Matches: {content}")
+            logging.error(e.json(indent=2))
+            return None
 
-            if pl_match_collection is None:
-                logging.error("No Database Connection")
-            elif not operations:
-                logging.debug("No Matches to Write")
-            else:
-                logging.debug(f"Writing {len(operations)} Entries")
+        match_list = [match for match in matches.matches]
+
+        # If a match utc time is midnight, set it to 3pm in the Europe/London timezone
+        for match in match_list:
+            # Check if the time is midnight
+            if match.utc_date.time() == time(hour=0):
+                # Set the time to 3pm in the Europe/London timezone as timezone UTC
+                match.utc_date = datetime(
+                    match.utc_date.year,
+                    match.utc_date.month,
+                    match.utc_date.day,
+                    15,
+                    tzinfo=ZoneInfo("Europe/London"),
+                ).astimezone(timezone.utc)
+
+                # Log the change
+                logging.debug(f"Match Time Changed: {match.utc_date}")
+
+            # Compare the current match state with the previous match state
+            if pl_match_collection is not None:
+                previous_match = pl_match_collection.find_one({"id": match.id})
+                if previous_match is not None:
+                    previous_match = Match.model_validate(previous_match)
+
+                self.CompareMatchStates(previous_match, match)
+
+        logging.debug("Creating Operations")
+        operations = [
+            UpdateOne({"id": match.id}, {"$set": match.model_dump()}, upsert=True)
+            for match in match_list
+        ]
+
+        if pl_match_collection is None:
+            logging.error("No Database Connection")
+        elif not operations:
+            logging.debug("No Matches to Write")
+        else:
+            logging.debug(f"Writing {len(operations)} Entries")
 
-                try:
+            try:
+                with track_db_operation("Football._store_matches"):
                     pl_match_collection.bulk_write(operations)
-                except:
-                    logging.error("Failed to Write Matches to DB")
+            except:
+                logging.error("Failed to Write Matches to DB")
 
-                logging.debug("Matches Added")
-        else:
-            return None
+            logging.debug("Matches Added")
 
         return match_list
 
@@ -411,7 +437,8 @@ class Football:
                     )
                     for table_entry in table.standings[0].table
                 ]
-                pl_table_collection.bulk_write(operations)
+                with track_db_operation("Football.get_table"):
+                    pl_table_collection.bulk_write(operations)
             except:
                 logging.error("Failed to Write Table to DB")
             else:
@@ -570,7 +597,8 @@ class Football:
                         )
                         for table_entry in table_list
                     ]
-                    live_pl_table_collection.bulk_write(operations)
+                    with track_db_operation("Football.update_live_table"):
+                        live_pl_table_collection.bulk_write(operations)
                 except:
                     logging.error("Failed to Write Live Table to DB")
                 else:
@@ -3,7 +3,7 @@ from datetime import datetime, timezone
 from threading import Event
 import logging
 
-from task_scheduler import TaskScheduler
+from task_scheduler import TaskScheduler, WorkloadScheduler
 from utils.network_utils import DailyApiRetryScheduler, FOOTBALL_API_MIN_INTERVAL
 
 from . import Football
@@ -29,7 +29,7 @@ def _wrap_bootstrap_task(
 
 
 def schedule_football_bootstrap(
-    scheduler: TaskScheduler,
+    scheduler: TaskScheduler | WorkloadScheduler,
     football: Football,
 ) -> None:
     now = datetime.now(timezone.utc)
@@ -46,14 +46,21 @@ def schedule_football_bootstrap(
         )
 
 
-def football_loop(terminate_event: Event, log_level: int) -> None:
-    logging.basicConfig(format='Football: %(asctime)s - %(levelname)s - %(message)s', level=log_level)
-
-    scheduler = TaskScheduler()
+def register_football(scheduler: TaskScheduler | WorkloadScheduler) -> Football:
+    """Create the football worker and schedule its tasks on ``scheduler``."""
     daily_retry = DailyApiRetryScheduler(scheduler)
 
     football = Football(scheduler, daily_retry)
     # World Cup 2026 is in museum mode — do not schedule WC API sync/live polls.
     schedule_football_bootstrap(scheduler, football)
 
+    return football
+
+
+def football_loop(terminate_event: Event, log_level: int) -> None:
+    logging.basicConfig(format='Football: %(asctime)s - %(levelname)s - %(message)s', level=log_level)
+
+    scheduler = TaskScheduler()
+    register_football(scheduler)
+
     scheduler.run(terminate_event)
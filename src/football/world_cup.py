@@ -11,7 +11,8 @@ from zoneinfo import ZoneInfo
 from pydantic import ValidationError
 from pymongo.operations import UpdateOne
 
-from task_scheduler import TaskScheduler
+from database import track_db_operation
+from task_scheduler import TaskScheduler, WorkloadScheduler
 from utils.network_utils import (
     FOOTBALL_API_MIN_INTERVAL,
     DailyApiRetryScheduler,
@@ -116,7 +117,11 @@ def _match_in_live_window(match: Match, now: datetime) -> bool:
 
 
 class WorldCup:
-    def __init__(self, scheduler: TaskScheduler, daily_retry: DailyApiRetryScheduler) -> None:
+    def __init__(
+        self,
+        scheduler: TaskScheduler | WorkloadScheduler,
+        daily_retry: DailyApiRetryScheduler,
+    ) -> None:
         self.scheduler = scheduler
         self.daily_retry = daily_retry
         self.edition = WC_EDITION
@@ -254,7 +259,8 @@ class WorldCup:
         elif wc_standings_collection is None:
             logging.error("No World Cup standings collection configured")
         else:
-            wc_standings_collection.bulk_write(operations)
+            with track_db_operation("WorldCup._write_standings_operations"):
+                wc_standings_collection.bulk_write(operations)
             logging.debug("Wrote %s World Cup group standings", len(operations))
 
         self.update_live_standings(None)
@@ -423,7 +429,8 @@ class WorldCup:
             logging.debug("No World Cup matches to write")
             return
 
-        wc_match_collection.bulk_write(operations)
+        with track_db_operation("WorldCup._write_matches"):
+            wc_match_collection.bulk_write(operations)
         logging.debug("Wrote %s World Cup matches", len(operations))
 
     def _any_group_matches_newly_finished(
@@ -674,7 +681,8 @@ class WorldCup:
             return
 
         try:
-            live_wc_standings_collection.bulk_write(operations)
+            with track_db_operation("WorldCup.update_live_standings"):
+                live_wc_standings_collection.bulk_write(operations)
         except Exception:
             logging.error("Failed to write World Cup live standings to DB")
         else:
@@ -1,14 +1,34 @@
-from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION, Future
 from threading import Event
-from time import sleep
 from signal import signal, SIGTERM, SIGINT, Signals
 from types import FrameType
+from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
+import os
 
-from football import football_loop
-from dyn_dns import dyn_dns_loop
-from feeds.feeds_main import feeds_loop
+from football import close_aiohttp_session, register_football
+from dyn_dns import register_dyn_dns
+from feeds.feeds import Feeds
+from feeds.feeds_main import register_feeds
+from database import log_command_metrics
 from database.index_bootstrap import ensure_backend_indexes
+from task_scheduler import (
+    AsyncTaskScheduler,
+    MisfirePolicy,
+    OverrunPolicy,
+    TaskPolicy,
+    TaskPriority,
+    TaskScheduler,
+)
+
+# Worker threads shared by every subsystem's tasks
+BACKEND_WORKER_THREADS = max(2, int(os.getenv("BACKEND_WORKER_THREADS", "4")))
+
+# "threads" runs tasks on the worker pool, "asyncio" runs them on an event loop
+BACKEND_RUNTIME = os.getenv("BACKEND_RUNTIME", "threads").strip().lower()
+
+# How often the scheduler logs per-task lag and run time metrics; 0 disables the summary
+SCHEDULER_METRICS_LOG_SECONDS = max(0, int(os.getenv("BACKEND_SCHEDULER_METRICS_LOG_SECONDS", "300")))
 
 
 def terminate(signal: int, _: FrameType | None) -> None:
@@ -22,25 +42,23 @@ def terminate(signal: int, _: FrameType | None) -> None:
             sig_type = "UNKNOWN"
 
     # Log the reason for exiting
-    logging.info(f"Exiting Threads due to {sig_type}")
+    logging.info(f"Exiting scheduler due to {sig_type}")
 
-    # Set the terminate event
+    # Set the terminate event and wake the scheduler so it notices straight away
     terminate_event.set()
+    scheduler.wake()
 
-    # Wait for the threads to finish
-    for future in futures:
-        while not future.done():
-            sleep(0.0001)
 
-    # Log that the threads have exited
-    logging.info("Threads Exited")
+async def run_async(scheduler: AsyncTaskScheduler, terminate_event: Event, feeds: Feeds) -> None:
+    try:
+        await scheduler.run(terminate_event)
+    finally:
+        await close_aiohttp_session()
+        await feeds.aclose()
 
 
 if __name__ == "__main__":
-    # Initialise an empty futures array
-    futures: list[Future] = []
-
-    # Event to terminate threads
+    # Event to terminate the scheduler
     terminate_event = Event()
 
     # Initialise logging
@@ -49,6 +67,19 @@ if __name__ == "__main__":
         format="Backend: %(asctime)s - %(levelname)s - %(message)s", level=log_level
     )
 
+    # One scheduler for every subsystem
+    metrics_log_interval = (
+        timedelta(seconds=SCHEDULER_METRICS_LOG_SECONDS) if SCHEDULER_METRICS_LOG_SECONDS > 0 else None
+    )
+    scheduler: TaskScheduler | AsyncTaskScheduler
+    if BACKEND_RUNTIME == "asyncio":
+        scheduler = AsyncTaskScheduler(metrics_log_interval=metrics_log_interval)
+    else:
+        scheduler = TaskScheduler(
+            max_workers=BACKEND_WORKER_THREADS,
+            metrics_log_interval=metrics_log_interval,
+        )
+
     # Handle SIGTERM and SIGINT
     signal(SIGTERM, terminate)
     signal(SIGINT, terminate)
@@ -56,18 +87,52 @@ if __name__ == "__main__":
     # Log that the backend is intialised
     logging.info("Backend Initialising")
 
-    # Ensure required indexes exist before worker loops start.
+    # Ensure required indexes exist before worker tasks are scheduled.
     ensure_backend_indexes()
 
-    # Submit the futures
-    with ThreadPoolExecutor() as executor:
-        futures.append(executor.submit(football_loop, terminate_event, log_level))
-        futures.append(executor.submit(dyn_dns_loop, terminate_event, log_level))
-        futures.append(executor.submit(feeds_loop, terminate_event, log_level))
-
-        # If any of the threads raises an exception then exit to output it
-        wait(futures, return_when=FIRST_EXCEPTION)
+    # Register each subsystem's tasks. Football tasks share state, so they run
+    # one at a time and queue behind each other rather than being dropped.
+    # Periodic tasks get jitter so ticks of different subsystems do not align.
+    register_football(
+        scheduler.workload(
+            "football",
+            TaskPriority.HIGH,
+            TaskPolicy(
+                concurrency_key="football",
+                overrun=OverrunPolicy.DEFER,
+                jitter=timedelta(seconds=15),
+            ),
+        )
+    )
+    feeds = register_feeds(scheduler.workload("feeds", TaskPriority.NORMAL))
+    register_dyn_dns(
+        scheduler.workload(
+            "dyn_dns",
+            TaskPriority.LOW,
+            TaskPolicy(
+                concurrency_key="dyn_dns",
+                misfire=MisfirePolicy.SKIP,
+                jitter=timedelta(seconds=2),
+            ),
+        )
+    )
 
-        for future in futures:
-            # Print the results, including any exceptions
-            print(future.result())
+    # Log where Mongo time goes alongside the scheduler metrics
+    if metrics_log_interval is not None:
+        scheduler.schedule_task(
+            datetime.now(timezone.utc) + metrics_log_interval,
+            log_command_metrics,
+            metrics_log_interval,
+            priority=TaskPriority.LOW,
+        )
+
+    # Run the dispatch loop on the main thread until terminated
+    if isinstance(scheduler, AsyncTaskScheduler):
+        logging.info("Scheduler running on the asyncio runtime")
+        asyncio.run(run_async(scheduler, terminate_event, feeds))
+    else:
+        logging.info(f"Scheduler running with {BACKEND_WORKER_THREADS} worker threads")
+        scheduler.run(terminate_event)
+
+    # Log that the scheduler has exited
+    logging.info("Scheduler Exited")
@@ -1,5 +1,17 @@
+from .async_task_scheduler import AsyncTaskScheduler
+from .metrics import HistogramSnapshot, TaskMetricsSnapshot
+from .task_queue import MisfirePolicy, OverrunPolicy, TaskPolicy, TaskPriority
 from .task_scheduler import TaskScheduler
+from .workload_scheduler import WorkloadScheduler
 
 __all__ = [
+    'AsyncTaskScheduler',
+    'HistogramSnapshot',
+    'MisfirePolicy',
+    'OverrunPolicy',
+    'TaskPolicy',
+    'TaskMetricsSnapshot',
+    'TaskPriority',
     'TaskScheduler',
+    'WorkloadScheduler',
 ]
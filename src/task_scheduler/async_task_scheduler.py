@@ -0,0 +1,260 @@
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from threading import Event, Lock
+from time import monotonic
+from typing import Any, Awaitable, Callable, Hashable
+import asyncio
+import inspect
+import logging
+
+from .task_queue import (
+    OverrunPolicy,
+    Task,
+    TaskPolicy,
+    TaskPriority,
+    TaskQueue,
+    make_task,
+)
+from .metrics import SchedulerMetrics, TaskMetricsSnapshot
+from .workload_scheduler import WorkloadScheduler
+
+# terminate_event is a threading.Event, so cap idle waits to notice shutdown promptly
+MAX_IDLE_WAIT = timedelta(seconds=1)
+
+# Suffix of a coroutine method used in place of a scheduled synchronous method
+ASYNC_VARIANT_SUFFIX = "_async"
+
+
+def resolve_async_callable(function: Callable) -> Callable[[], Awaitable[Any]] | None:
+    """Return the coroutine function to await for a scheduled callback, if any.
+
+    Coroutine functions are used as-is. A bound method ``obj.name`` is swapped for
+    ``obj.name_async`` when that exists and is a coroutine function, so subsystems
+    can schedule their usual callbacks and still run natively on the event loop.
+    """
+    if inspect.iscoroutinefunction(function):
+        return function
+
+    owner = getattr(function, "__self__", None)
+    name = getattr(function, "__name__", None)
+    if owner is None or name is None:
+        return None
+
+    async_variant = getattr(owner, f"{name}{ASYNC_VARIANT_SUFFIX}", None)
+    if async_variant is not None and inspect.iscoroutinefunction(async_variant):
+        return async_variant
+
+    return None
+
+
+class AsyncTaskScheduler:
+    """asyncio counterpart of TaskScheduler.
+
+    Coroutine callbacks run concurrently on the event loop. Other callbacks run
+    in the loop's default thread pool. Tasks can be scheduled from any thread.
+    """
+
+    def __init__(self, metrics_log_interval: timedelta | None = None) -> None:
+        self._metrics = SchedulerMetrics(metrics_log_interval)
+        self._queue = TaskQueue(on_missed_slots=self._metrics.record_missed_slots)
+        self._lock = Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+
+        self._running: dict[Hashable, int] = {}
+        self._deferred: dict[Hashable, list[Task]] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def workload(
+        self,
+        name: str,
+        priority: int = TaskPriority.NORMAL,
+        default_policy: TaskPolicy | None = None,
+    ) -> WorkloadScheduler:
+        """Return a view that schedules tasks for one subsystem on this scheduler."""
+        return WorkloadScheduler(self, name, priority, default_policy)
+
+    @property
+    def task_list(self) -> list[Task]:
+        """Pending tasks in due-time order."""
+        with self._lock:
+            return self._queue.tasks()
+
+    def _update_queue(self, update: Callable[[TaskQueue], bool]) -> bool:
+        """Apply a queue change, waking the run loop if the earliest deadline moved."""
+        with self._lock:
+            previous_next_time = self._queue.next_time()
+            result = update(self._queue)
+            moved = self._queue.next_time() != previous_next_time
+
+        if moved:
+            self.wake()
+        return result
+
+    def wake(self) -> None:
+        """Wake the run loop; safe to call from any thread."""
+        if self._loop is None or self._wakeup is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def schedule_task(
+        self,
+        time: datetime,
+        function: Callable,
+        interval: timedelta | None = None,
+        *,
+        policy: TaskPolicy | None = None,
+        priority: int = TaskPriority.NORMAL,
+    ) -> bool:
+        task = make_task(time, function, interval, policy, priority)
+
+        def push(queue: TaskQueue) -> bool:
+            queue.push(task)
+            return True
+
+        return self._update_queue(push)
+
+    def schedule_earlier_task(
+        self,
+        time: datetime,
+        function: Callable,
+        interval: timedelta | None = None,
+        *,
+        policy: TaskPolicy | None = None,
+        priority: int = TaskPriority.NORMAL,
+    ) -> bool:
+        """Schedule a task, keeping at most one pending task per callback.
+
+        Same semantics as TaskScheduler.schedule_earlier_task.
+        """
+        task = make_task(time, function, interval, policy, priority)
+        return self._update_queue(lambda queue: queue.schedule_earlier(task))
+
+    def cancel_task(self, function: Callable) -> bool:
+        """Cancel every pending task for ``function``."""
+        return self._update_queue(lambda queue: queue.cancel(function) > 0)
+
+    def metrics_snapshot(self) -> dict[str, TaskMetricsSnapshot]:
+        """Return per-callback dispatch lag, run time and overrun metrics."""
+        return self._metrics.snapshot()
+
+    def get_runnable_tasks(self) -> list[Task]:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            return self._queue.pop_due(now)
+
+    def _seconds_until_next_task(self) -> float:
+        with self._lock:
+            next_time = self._queue.next_time()
+
+        if next_time is None:
+            return MAX_IDLE_WAIT.total_seconds()
+
+        wait_seconds = (next_time - datetime.now(timezone.utc)).total_seconds()
+        return max(0.0, min(MAX_IDLE_WAIT.total_seconds(), wait_seconds))
+
+    def _start(self, task: Task) -> None:
+        """Start a due task, applying its concurrency policy."""
+        policy = task.effective_policy
+        key = task.concurrency_key
+
+        if policy.max_concurrency is not None and self._running.get(key, 0) >= policy.max_concurrency:
+            if task.overrun_policy is OverrunPolicy.DEFER:
+                existing_tasks = self._deferred.get(key, [])
+                deferred_tasks = []
+                due_time = task.scheduled_time
+                for deferred_task in existing_tasks:
+                    if deferred_task.function == task.function:
+                        # The coalesced run stands in for the earliest waiting one
+                        due_time = min(due_time, deferred_task.scheduled_time)
+                    else:
+                        deferred_tasks.append(deferred_task)
+                self._metrics.record_deferred(
+                    task, coalesced=len(deferred_tasks) < len(existing_tasks)
+                )
+                deferred_tasks.append(replace(task, interval=None, due_time=due_time))
+                self._deferred[key] = deferred_tasks
+                logging.debug(f"Task {task.name} deferred until the running task finishes")
+            else:
+                self._metrics.record_skipped(task)
+                logging.info(f"Task {task.name} skipped, previous run still in progress")
+            return
+
+        self._running[key] = self._running.get(key, 0) + 1
+        asyncio_task = asyncio.create_task(self._run_task(task), name=task.name)
+        self._tasks.add(asyncio_task)
+        asyncio_task.add_done_callback(self._tasks.discard)
+
+    async def _run_task(self, task: Task) -> None:
+        started_at = monotonic()
+        timeout = task.effective_policy.timeout
+        async_callable = resolve_async_callable(task.function)
+        self._metrics.record_start(task, started_at)
+        failed = True
+
+        try:
+            if async_callable is not None:
+                # Coroutines can be cancelled, so a timeout is enforced here
+                timeout_seconds = timeout.total_seconds() if timeout is not None else None
+                try:
+                    async with asyncio.timeout(timeout_seconds) as deadline:
+                        await async_callable()
+                    failed = False
+                except TimeoutError:
+                    # A TimeoutError the task raised itself is an ordinary failure
+                    if not deadline.expired():
+                        raise
+                    logging.warning(f"Task {task.name} cancelled after exceeding its {timeout} timeout")
+            else:
+                await asyncio.to_thread(task.function)
+                failed = False
+        except Exception as exc:
+            logging.error(f"Task {task.name} raised an exception", exc_info=exc)
+        finally:
+            elapsed = monotonic() - started_at
+            self._metrics.record_finish(task, elapsed, failed)
+            if async_callable is None and timeout is not None and elapsed > timeout.total_seconds():
+                logging.warning(
+                    f"Task {task.name} took {elapsed:.1f}s, exceeding its {timeout} timeout"
+                )
+            self._finish(task)
+
+    def _finish(self, task: Task) -> None:
+        key = task.concurrency_key
+        remaining = self._running.get(key, 0) - 1
+        if remaining > 0:
+            self._running[key] = remaining
+        else:
+            self._running.pop(key, None)
+
+        deferred_tasks = self._deferred.pop(key, [])
+        if len(deferred_tasks) > 0:
+            with self._lock:
+                for deferred_task in deferred_tasks:
+                    deferred_task.time = datetime.now(timezone.utc)
+                    self._queue.schedule_earlier(deferred_task, keep_periodic=True)
+            self.wake()
+
+    async def run(self, terminate_event: Event) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+
+        try:
+            # Loop until the terminate event gets set
+            while not terminate_event.is_set():
+                # Start due tasks, highest priority first
+                for task in sorted(self.get_runnable_tasks(), key=lambda task: task.priority):
+                    self._start(task)
+
+                self._metrics.log_summary_if_due()
+
+                # Sleep until the next task is due or an earlier one is scheduled
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._seconds_until_next_task())
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # Let in-flight tasks finish so they are not cut off mid-write
+            if len(self._tasks) > 0:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,198 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from time import monotonic
+import logging
+
+from .task_queue import Task
+
+# Upper bounds in seconds shared by every histogram; a final bucket catches the rest
+HISTOGRAM_BUCKETS_SECONDS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0,
+)
+
+@dataclass(frozen=True)
+class HistogramSnapshot:
+    """Point-in-time copy of a histogram; ``counts`` has one extra overflow bucket."""
+
+    counts: tuple[int, ...]
+    count: int
+    total: float
+    max: float
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count > 0 else None
+
+    def quantile(self, q: float) -> float | None:
+        """Return the upper bound of the bucket holding the ``q`` quantile.
+
+        Values in the overflow bucket report the largest value seen.
+        """
+        if self.count == 0:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count > 0:
+                if index < len(HISTOGRAM_BUCKETS_SECONDS):
+                    return min(HISTOGRAM_BUCKETS_SECONDS[index], self.max)
+                return self.max
+        return self.max
+
+@dataclass
+class _Histogram:
+    counts: list[int] = field(default_factory=lambda: [0] * (len(HISTOGRAM_BUCKETS_SECONDS) + 1))
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def observe(self, value: float) -> None:
+        value = max(0.0, value)
+        self.counts[bisect_left(HISTOGRAM_BUCKETS_SECONDS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> HistogramSnapshot:
+        return HistogramSnapshot(tuple(self.counts), self.count, self.total, self.max)
+
+@dataclass(frozen=True)
+class TaskMetricsSnapshot:
+    """Point-in-time metrics for one callback.
+
+    ``lag`` is how late each run started against its scheduled time,
+    ``interval`` the gap between consecutive starts and ``duration`` the run
+    time. ``skipped`` counts due runs dropped because the previous run was
+    still in progress; ``deferred`` counts runs queued behind it, of which
+    ``coalesced`` replaced an already deferred run. ``missed_slots`` counts
+    periodic slots dropped or folded into one run by the misfire policy.
+    """
+
+    name: str
+    runs: int
+    errors: int
+    skipped: int
+    deferred: int
+    coalesced: int
+    missed_slots: int
+    lag: HistogramSnapshot
+    interval: HistogramSnapshot
+    duration: HistogramSnapshot
+
+@dataclass
+class _TaskMetrics:
+    runs: int = 0
+    errors: int = 0
+    skipped: int = 0
+    deferred: int = 0
+    coalesced: int = 0
+    missed_slots: int = 0
+    lag: _Histogram = field(default_factory=_Histogram)
+    interval: _Histogram = field(default_factory=_Histogram)
+    duration: _Histogram = field(default_factory=_Histogram)
+    last_started_at: float | None = None
+
+class SchedulerMetrics:
+    """Per-callback dispatch and run metrics, keyed by callback qualified name.
+
+    Safe to update from the run loop and worker threads at once.
+    """
+
+    def __init__(self, log_interval: timedelta | None = None) -> None:
+        self._lock = Lock()
+        self._metrics: dict[str, _TaskMetrics] = {}
+        self._log_interval = log_interval
+        self._next_log_at = (
+            monotonic() + log_interval.total_seconds() if log_interval is not None else None
+        )
+
+    def _task_metrics(self, task: Task) -> _TaskMetrics:
+        return self._metrics.setdefault(task.name, _TaskMetrics())
+
+    def record_start(self, task: Task, started_at: float) -> None:
+        """Record a run starting at monotonic time ``started_at``."""
+        lag = (datetime.now(timezone.utc) - task.scheduled_time).total_seconds()
+        with self._lock:
+            metrics = self._task_metrics(task)
+            metrics.lag.observe(lag)
+            if metrics.last_started_at is not None:
+                metrics.interval.observe(started_at - metrics.last_started_at)
+            metrics.last_started_at = started_at
+
+    def record_finish(self, task: Task, duration: float, failed: bool) -> None:
+        with self._lock:
+            metrics = self._task_metrics(task)
+            metrics.runs += 1
+            metrics.duration.observe(duration)
+            if failed:
+                metrics.errors += 1
+
+    def record_skipped(self, task: Task) -> None:
+        with self._lock:
+            self._task_metrics(task).skipped += 1
+
+    def record_deferred(self, task: Task, coalesced: bool) -> None:
+        with self._lock:
+            metrics = self._task_metrics(task)
+            metrics.deferred += 1
+            if coalesced:
+                metrics.coalesced += 1
+
+    def record_missed_slots(self, task: Task, missed_slots: int) -> None:
+        with self._lock:
+            self._task_metrics(task).missed_slots += missed_slots
+
+    def snapshot(self) -> dict[str, TaskMetricsSnapshot]:
+        """Return a copy of the metrics for every callback seen so far."""
+        with self._lock:
+            return {
+                name: TaskMetricsSnapshot(
+                    name,
+                    metrics.runs,
+                    metrics.errors,
+                    metrics.skipped,
+                    metrics.deferred,
+                    metrics.coalesced,
+                    metrics.missed_slots,
+                    metrics.lag.snapshot(),
+                    metrics.interval.snapshot(),
+                    metrics.duration.snapshot(),
+                )
+                for name, metrics in self._metrics.items()
+            }
+
+    def log_summary_if_due(self) -> None:
+        """Log a one-line summary per callback once the log interval has elapsed."""
+        if self._log_interval is None or self._next_log_at is None:
+            return
+
+        now = monotonic()
+        if now < self._next_log_at:
+            return
+        self._next_log_at = now + self._log_interval.total_seconds()
+
+        for snapshot in sorted(self.snapshot().values(), key=lambda snapshot: snapshot.name):
+            logging.info(format_task_metrics(snapshot))
+
+def _format_seconds(value: float | None) -> str:
+    return "-" if value is None else f"{value:.3f}s"
+
+def format_task_metrics(snapshot: TaskMetricsSnapshot) -> str:
+    """Format a callback's metrics as a single log line."""
+    def summary(histogram: HistogramSnapshot) -> str:
+        return (
+            f"p50={_format_seconds(histogram.quantile(0.5))} "
+            f"p95={_format_seconds(histogram.quantile(0.95))} "
+            f"max={_format_seconds(histogram.max if histogram.count > 0 else None)}"
+        )
+
+    return (
+        f"Task metrics {snapshot.name}: runs={snapshot.runs} errors={snapshot.errors} "
+        f"skipped={snapshot.skipped} deferred={snapshot.deferred} "
+        f"coalesced={snapshot.coalesced} missed_slots={snapshot.missed_slots} | lag {summary(snapshot.lag)} | "
+        f"interval {summary(snapshot.interval)} | duration {summary(snapshot.duration)}"
+    )
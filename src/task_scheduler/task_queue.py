@@ -0,0 +1,307 @@
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from enum import Enum, IntEnum
+from itertools import count
+from typing import Callable, Hashable
+import hashlib
+import heapq
+import logging
+
+# Rebuild the heap once cancelled entries outnumber live ones (and exceed this floor)
+COMPACTION_MIN_CANCELLED = 64
+
+class TaskPriority(IntEnum):
+    """Dispatch order for due tasks competing for workers; lower runs first."""
+
+    HIGH = 0
+    NORMAL = 50
+    LOW = 100
+
+class OverrunPolicy(Enum):
+    """What to do with a due run while the concurrency limit is reached."""
+
+    # Drop the run; periodic tasks simply wait for their next tick
+    SKIP = "skip"
+    # Run once the in-flight run finishes, coalescing repeated overruns into one
+    DEFER = "defer"
+
+class MisfirePolicy(Enum):
+    """How a periodic task recovers slots that passed while it was not dispatched."""
+
+    # Run once now for all missed slots, then continue on the original alignment
+    COALESCE = "coalesce"
+    # Drop the missed slots and wait for the next aligned slot
+    SKIP = "skip"
+    # Run missed slots back-to-back, at most ``max_catch_up`` in a row, then skip
+    CATCH_UP = "catch_up"
+
+@dataclass(frozen=True)
+class TaskPolicy:
+    """Execution limits applied when the scheduler runs tasks on worker threads.
+
+    ``max_concurrency`` caps in-flight runs sharing ``concurrency_key`` (the
+    callback itself when unset). ``overrun`` defaults to SKIP for periodic tasks
+    and DEFER for one-shot tasks so a one-shot run is never lost. Threads cannot
+    be interrupted, so exceeding ``timeout`` is logged and the run keeps its slot.
+
+    For periodic tasks, ``misfire`` decides what happens to slots missed after a
+    stall, and ``jitter`` shifts every slot by a fixed offset below it, derived
+    from the callback name, so tasks sharing an interval do not fire together.
+    """
+
+    max_concurrency: int | None = 1
+    timeout: timedelta | None = None
+    overrun: OverrunPolicy | None = None
+    concurrency_key: Hashable | None = None
+    misfire: MisfirePolicy = MisfirePolicy.COALESCE
+    max_catch_up: int = 3
+    jitter: timedelta | None = None
+
+DEFAULT_TASK_POLICY = TaskPolicy()
+
+@dataclass
+class Task:
+    time: datetime
+    function: Callable
+    interval: timedelta | None = None
+    policy: TaskPolicy | None = None
+    priority: int = TaskPriority.NORMAL
+    # Unjittered slot of a periodic task; ``time`` is the slot plus jitter
+    slot: datetime | None = None
+    # Consecutive catch-up runs under MisfirePolicy.CATCH_UP
+    catch_up_runs: int = 0
+    # Original due time of a deferred run; ``time`` is when it was re-queued
+    due_time: datetime | None = None
+
+    @property
+    def scheduled_time(self) -> datetime:
+        """The time this run was first due, used to measure dispatch lag."""
+        return self.due_time if self.due_time is not None else self.time
+
+    @property
+    def name(self) -> str:
+        return getattr(self.function, "__qualname__", repr(self.function))
+
+    @property
+    def effective_policy(self) -> TaskPolicy:
+        return self.policy if self.policy is not None else DEFAULT_TASK_POLICY
+
+    @property
+    def concurrency_key(self) -> Hashable:
+        policy = self.effective_policy
+        return policy.concurrency_key if policy.concurrency_key is not None else self.function
+
+    @property
+    def overrun_policy(self) -> OverrunPolicy:
+        policy = self.effective_policy
+        if policy.overrun is not None:
+            return policy.overrun
+        return OverrunPolicy.SKIP if self.interval is not None else OverrunPolicy.DEFER
+
+@dataclass(order=True)
+class _HeapEntry:
+    """Heap item ordering tasks by due time, then by insertion order."""
+
+    time: datetime
+    sequence: int
+    task: Task = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+def utc_task_time(time: datetime) -> datetime:
+    """Convert a task time to UTC, clamping times in the past to now."""
+    utc_time = time.astimezone(timezone.utc)
+    if utc_time < datetime.now(timezone.utc):
+        utc_time = datetime.now(timezone.utc)
+    return utc_time
+
+def jitter_offset(task: Task) -> timedelta:
+    """Return the fixed jitter for ``task``; stable across runs and restarts."""
+    jitter = task.effective_policy.jitter
+    if task.interval is None or jitter is None or jitter <= timedelta(0):
+        return timedelta(0)
+
+    digest = hashlib.sha256(task.name.encode("utf-8")).digest()
+    jitter_microseconds = int(jitter / timedelta(microseconds=1))
+    return timedelta(
+        microseconds=int.from_bytes(digest[:8], "big") % (jitter_microseconds + 1)
+    )
+
+def make_task(
+    time: datetime,
+    function: Callable,
+    interval: timedelta | None = None,
+    policy: TaskPolicy | None = None,
+    priority: int = TaskPriority.NORMAL,
+) -> Task:
+    """Build a task due at ``time``, shifted by its jitter when periodic."""
+    task = Task(utc_task_time(time), function, interval, policy, priority)
+    if interval is not None:
+        task.slot = task.time
+        task.time = task.slot + jitter_offset(task)
+    return task
+
+def next_periodic_task(task: Task, now: datetime) -> tuple[Task, int, bool]:
+    """Return the follow-up run of a periodic task popped at ``now``.
+
+    Also returns how many slots the misfire policy dropped or folded into this
+    run, and whether this run itself should still go ahead.
+    """
+    assert task.interval is not None
+    interval = task.interval
+    policy = task.effective_policy
+    offset = jitter_offset(task)
+    slot = task.slot if task.slot is not None else task.time - offset
+
+    # Later slots that have also passed while this one waited
+    late_slots = max(0, int((now - (slot + offset)) / interval))
+
+    if late_slots == 0:
+        next_slot = slot + interval
+        next_task = replace(
+            task, time=utc_task_time(next_slot + offset), slot=next_slot, catch_up_runs=0
+        )
+        return next_task, 0, True
+
+    if policy.misfire is MisfirePolicy.CATCH_UP and task.catch_up_runs < policy.max_catch_up:
+        next_task = replace(
+            task, time=now, slot=slot + interval, catch_up_runs=task.catch_up_runs + 1
+        )
+        return next_task, 0, True
+
+    next_slot = slot + (late_slots + 1) * interval
+    next_task = replace(
+        task, time=utc_task_time(next_slot + offset), slot=next_slot, catch_up_runs=0
+    )
+
+    if policy.misfire is MisfirePolicy.SKIP:
+        # This run is at least one interval late too, so it is dropped with the rest
+        return next_task, late_slots + 1, False
+
+    # Coalesce, or catch-up past its cap: this run stands in for every missed slot
+    return next_task, late_slots, True
+
+class TaskQueue:
+    """Min-heap of pending tasks keyed on due time, indexed by callback.
+
+    The index is keyed by the callback itself, so separate accesses of the
+    same bound method (equal, but distinct objects) match. Replaced or
+    cancelled entries are only flagged and are discarded when they reach the
+    top of the heap. Not thread-safe; schedulers guard it with their own lock.
+
+    ``on_missed_slots`` is called with a periodic task and the number of slots
+    its misfire policy skipped or coalesced.
+    """
+
+    def __init__(self, on_missed_slots: Callable[[Task, int], None] | None = None) -> None:
+        self._on_missed_slots = on_missed_slots
+        self._heap: list[_HeapEntry] = []
+        self._sequence = count()
+        self._entries_by_callback: dict[Callable, list[_HeapEntry]] = {}
+        self._cancelled_count = 0
+
+    def tasks(self) -> list[Task]:
+        """Pending tasks in due-time order."""
+        return [entry.task for entry in sorted(self._heap) if not entry.cancelled]
+
+    def next_time(self) -> datetime | None:
+        """Return the due time of the earliest pending task."""
+        self._discard_cancelled_head()
+        if len(self._heap) == 0:
+            return None
+        return self._heap[0].time
+
+    def push(self, task: Task) -> None:
+        entry = _HeapEntry(task.time, next(self._sequence), task)
+        heapq.heappush(self._heap, entry)
+        self._entries_by_callback.setdefault(task.function, []).append(entry)
+
+    def schedule_earlier(self, task: Task, *, keep_periodic: bool = False) -> bool:
+        """Add ``task`` unless the same callback is already pending at an earlier or equal time.
+
+        With ``keep_periodic`` only pending one-shot runs are compared and
+        replaced, so a one-shot run never drops a periodic task's next slot.
+        """
+        entries = self._entries_by_callback.get(task.function)
+        if keep_periodic and entries:
+            entries = [entry for entry in entries if entry.task.interval is None]
+        if entries:
+            existing_entry = min(entries)
+
+            if task.time >= existing_entry.task.time:
+                logging.debug("Task ignored (existing task is earlier or equal)")
+                return False
+
+            # Invalidate the later entry and re-add at the earlier time
+            self._cancel_entry(existing_entry)
+            self.push(task)
+            logging.debug("Task replaced with earlier time")
+            return True
+
+        self.push(task)
+        logging.debug("Task added")
+        return True
+
+    def cancel(self, function: Callable) -> int:
+        """Cancel every pending task for ``function`` and return how many were cancelled."""
+        entries = list(self._entries_by_callback.get(function, []))
+        for entry in entries:
+            self._cancel_entry(entry)
+        return len(entries)
+
+    def pop_due(self, now: datetime) -> list[Task]:
+        """Remove and return tasks due before ``now``, re-queueing periodic ones."""
+        due_tasks: list[Task] = []
+
+        self._discard_cancelled_head()
+        while len(self._heap) > 0 and self._heap[0].time < now:
+            entry = heapq.heappop(self._heap)
+            self._unindex_entry(entry)
+            task = entry.task
+            runnable = True
+
+            # Re-queue periodic tasks after removing the runnable one — otherwise
+            # schedule_earlier sees the same callback still pending and ignores.
+            # Follow-ups due now are not popped again, as only times before now are due.
+            if task.interval is not None:
+                next_task, missed_slots, runnable = next_periodic_task(task, now)
+                self.schedule_earlier(next_task)
+                if missed_slots > 0:
+                    logging.debug(f"Task {task.name} missed {missed_slots} slot(s)")
+                    if self._on_missed_slots is not None:
+                        self._on_missed_slots(task, missed_slots)
+
+            if runnable:
+                due_tasks.append(task)
+
+            self._discard_cancelled_head()
+
+        return due_tasks
+
+    def _unindex_entry(self, entry: _HeapEntry) -> None:
+        key = entry.task.function
+        entries = self._entries_by_callback.get(key)
+        if entries is None:
+            return
+
+        entries.remove(entry)
+        if len(entries) == 0:
+            del self._entries_by_callback[key]
+
+    def _cancel_entry(self, entry: _HeapEntry) -> None:
+        """Invalidate an entry in place; it is dropped lazily from the heap."""
+        entry.cancelled = True
+        self._unindex_entry(entry)
+        self._cancelled_count += 1
+
+        if (
+            self._cancelled_count >= COMPACTION_MIN_CANCELLED
+            and self._cancelled_count * 2 > len(self._heap)
+        ):
+            self._heap = [heap_entry for heap_entry in self._heap if not heap_entry.cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled_count = 0
+
+    def _discard_cancelled_head(self) -> None:
+        while len(self._heap) > 0 and self._heap[0].cancelled:
+            heapq.heappop(self._heap)
+            self._cancelled_count -= 1
@@ -1,91 +1,385 @@
-from threading import Event
-from time import sleep
-from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Condition, Event
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta, timezone
-from typing import Callable
+from itertools import count
+from time import monotonic
+from typing import Callable, Hashable
+import heapq
 import logging
 
-@dataclass
-class Task:
+from .task_queue import (
+    OverrunPolicy,
+    Task,
+    TaskPolicy,
+    TaskPriority,
+    TaskQueue,
+    make_task,
+)
+from .metrics import SchedulerMetrics, TaskMetricsSnapshot
+from .workload_scheduler import WorkloadScheduler
+
+# terminate_event cannot notify the scheduler condition, so cap idle waits to
+# notice shutdown promptly while still sleeping through quiet periods.
+MAX_IDLE_WAIT = timedelta(seconds=1)
+
+@dataclass(order=True)
+class _ReadyEntry:
+    """Due task waiting for a worker, ordered by priority then due time."""
+
+    priority: int
     time: datetime
-    function: Callable
-    interval: timedelta | None = None
+    sequence: int
+    task: Task = field(compare=False)
+
+@dataclass(eq=False)
+class _RunningTask:
+    """A task currently executing on a worker thread."""
+
+    task: Task
+    started_at: float
+    deadline: float | None
+    timed_out: bool = False
 
 class TaskScheduler:
-    def __init__(self) -> None:
-        # Initialise an empty list of tasks
-        self.task_list: list[Task] = []
-
-    @staticmethod
-    def _utc_task_time(time: datetime) -> datetime:
-        utc_time = time.astimezone(timezone.utc)
-        if utc_time < datetime.now(timezone.utc):
-            utc_time = datetime.now(timezone.utc)
-        return utc_time
-
-    def schedule_task(self, time: datetime, function: Callable, interval: timedelta | None = None) -> bool:
-        utc_time = self._utc_task_time(time)
-        self.task_list.append(Task(utc_time, function, interval))
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        metrics_log_interval: timedelta | None = None,
+    ) -> None:
+        """Create a scheduler.
+
+        Args:
+            max_workers (int | None, optional): Run tasks on a pool of this many
+                worker threads so long tasks do not hold up dispatch. Defaults to
+                None, which runs tasks inline on the ``run`` thread.
+            metrics_log_interval (timedelta | None, optional): Log a per-callback
+                metrics summary this often from the run loop. Defaults to None,
+                which only records metrics for ``metrics_snapshot``.
+        """
+        self._metrics = SchedulerMetrics(metrics_log_interval)
+
+        # Min-heap of pending tasks keyed on due time
+        self._queue = TaskQueue(on_missed_slots=self._metrics.record_missed_slots)
+        self._sequence = count()
+
+        # Guards the heap and wakes the run loop when the earliest deadline changes
+        self._condition = Condition()
+
+        # Executor-backed mode state. Due tasks wait in the ready heap until a
+        # worker is free, so priorities decide who runs when capacity is short.
+        self._max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        if max_workers is not None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="task-scheduler"
+            )
+        self._ready: list[_ReadyEntry] = []
+        self._active_workers = 0
+        self._running: dict[Hashable, list[_RunningTask]] = {}
+        self._deferred: dict[Hashable, list[Task]] = {}
+
+    def workload(
+        self,
+        name: str,
+        priority: int = TaskPriority.NORMAL,
+        default_policy: TaskPolicy | None = None,
+    ) -> WorkloadScheduler:
+        """Return a view that schedules tasks for one subsystem on this scheduler."""
+        return WorkloadScheduler(self, name, priority, default_policy)
+
+    @property
+    def task_list(self) -> list[Task]:
+        """Pending tasks in due-time order."""
+        with self._condition:
+            return self._queue.tasks()
+
+    def _update_queue(self, update: Callable[[TaskQueue], bool]) -> bool:
+        """Apply a queue change, waking the run loop if the earliest deadline moved."""
+        with self._condition:
+            previous_next_time = self._queue.next_time()
+            result = update(self._queue)
+            if self._queue.next_time() != previous_next_time:
+                self._condition.notify_all()
+            return result
+
+    def _push_task(self, task: Task) -> None:
+        def push(queue: TaskQueue) -> bool:
+            queue.push(task)
+            return True
+
+        self._update_queue(push)
+
+    def schedule_task(
+        self,
+        time: datetime,
+        function: Callable,
+        interval: timedelta | None = None,
+        *,
+        policy: TaskPolicy | None = None,
+        priority: int = TaskPriority.NORMAL,
+    ) -> bool:
+        self._push_task(make_task(time, function, interval, policy, priority))
         logging.debug(f'Task added')
         return True
 
     def schedule_earlier_task(
-        self, time: datetime, function: Callable, interval: timedelta | None = None
+        self,
+        time: datetime,
+        function: Callable,
+        interval: timedelta | None = None,
+        *,
+        policy: TaskPolicy | None = None,
+        priority: int = TaskPriority.NORMAL,
     ) -> bool:
         """Schedule a task, keeping at most one pending task per callback.
 
         If no task exists for ``function``, add one. If a task exists and the new
         time is earlier, replace it. If the new time is equal or later, ignore.
         """
-        utc_time = self._utc_task_time(time)
-
-        for index, task in enumerate(self.task_list):
-            if task.function is not function:
-                continue
+        task = make_task(time, function, interval, policy, priority)
+        return self._update_queue(lambda queue: queue.schedule_earlier(task))
 
-            if utc_time >= task.time:
-                logging.debug("Task ignored (existing task is earlier or equal)")
-                return False
+    def cancel_task(self, function: Callable) -> bool:
+        """Cancel every pending task for ``function``.
 
-            self.task_list[index] = Task(utc_time, function, interval)
-            logging.debug("Task replaced with earlier time")
+        Returns True when at least one pending task was cancelled.
+        """
+        if self._update_queue(lambda queue: queue.cancel(function) > 0):
+            logging.debug("Task cancelled")
             return True
 
-        self.task_list.append(Task(utc_time, function, interval))
-        logging.debug("Task added")
-        return True
+        return False
 
     def get_runnable_tasks(self) -> list[Task]:
-        # Initialise an empty list of runnable tasks
-        runnable_tasks:list[Task] = []
+        now = datetime.now(timezone.utc)
+
+        with self._condition:
+            return self._queue.pop_due(now)
+
+    def seconds_until_next_task(self) -> float | None:
+        """Return the time until the earliest pending task, or None when idle."""
+        with self._condition:
+            return self._seconds_until_next_task_locked()
+
+    def _seconds_until_next_task_locked(self) -> float | None:
+        next_time = self._queue.next_time()
+        if next_time is None:
+            return None
+        return max(0.0, (next_time - datetime.now(timezone.utc)).total_seconds())
+
+    def _seconds_until_next_overrun_locked(self) -> float | None:
+        deadlines = [
+            running_task.deadline
+            for running_tasks in self._running.values()
+            for running_task in running_tasks
+            if running_task.deadline is not None and not running_task.timed_out
+        ]
+        if len(deadlines) == 0:
+            return None
+        return max(0.0, min(deadlines) - monotonic())
+
+    def _wait_for_next_task(self) -> None:
+        """Sleep until the earliest deadline or until an earlier task is scheduled."""
+        with self._condition:
+            wait_seconds = MAX_IDLE_WAIT.total_seconds()
+            candidates = [self._seconds_until_next_overrun_locked()]
+            # With ready tasks queued for a busy pool, only a finishing worker
+            # (which notifies) or a new overrun deadline needs the loop.
+            if not self._ready_tasks_blocked_locked():
+                candidates.append(self._seconds_until_next_task_locked())
+            for candidate in candidates:
+                if candidate is not None:
+                    wait_seconds = min(wait_seconds, candidate)
 
-        # Check the list of tasks to see which are runnable, use a copy as we are going to remove old tasks
-        for task in list(self.task_list):
+            if wait_seconds > 0:
+                self._condition.wait(wait_seconds)
 
-            # If the task time is in the past it is runnable
-            if task.time < datetime.now(timezone.utc):
+    def metrics_snapshot(self) -> dict[str, TaskMetricsSnapshot]:
+        """Return per-callback dispatch lag, run time and overrun metrics."""
+        return self._metrics.snapshot()
 
-                runnable_tasks.append(task)
-                self.task_list.remove(task)
+    def running_task_count(self) -> int:
+        """Return the number of tasks currently executing on worker threads."""
+        with self._condition:
+            return sum(len(running_tasks) for running_tasks in self._running.values())
 
-                # Re-queue periodic tasks after removing the runnable one — otherwise
-                # schedule_earlier_task sees the same callback still pending and ignores.
-                if task.interval is not None:
-                    self.schedule_earlier_task(
-                        task.time + task.interval, task.function, task.interval
+    def ready_task_count(self) -> int:
+        """Return the number of due tasks waiting for a free worker."""
+        with self._condition:
+            return len(self._ready)
+
+    def wake(self) -> None:
+        """Wake the run loop, e.g. after setting its terminate event."""
+        with self._condition:
+            self._condition.notify_all()
+
+    def _ready_tasks_blocked_locked(self) -> bool:
+        return (
+            len(self._ready) > 0
+            and self._max_workers is not None
+            and self._active_workers >= self._max_workers
+        )
+
+    def _queue_ready(self, task: Task) -> None:
+        with self._condition:
+            heapq.heappush(
+                self._ready,
+                _ReadyEntry(task.priority, task.time, next(self._sequence), task),
+            )
+
+    def _dispatch_ready(self) -> None:
+        """Hand ready tasks to free workers, highest priority first."""
+        while True:
+            with self._condition:
+                if len(self._ready) == 0:
+                    return
+                if self._max_workers is not None and self._active_workers >= self._max_workers:
+                    return
+                task = heapq.heappop(self._ready).task
+
+            self._dispatch(task)
+
+    def _dispatch(self, task: Task) -> None:
+        """Submit a due task to the executor, applying its concurrency policy."""
+        assert self._executor is not None
+
+        policy = task.effective_policy
+        key = task.concurrency_key
+
+        with self._condition:
+            running_tasks = self._running.setdefault(key, [])
+            if policy.max_concurrency is not None and len(running_tasks) >= policy.max_concurrency:
+                if task.overrun_policy is OverrunPolicy.DEFER:
+                    # Coalesce repeat overruns of the same callback into one run
+                    existing_tasks = self._deferred.get(key, [])
+                    deferred_tasks = []
+                    due_time = task.scheduled_time
+                    for deferred_task in existing_tasks:
+                        if deferred_task.function == task.function:
+                            # The coalesced run stands in for the earliest waiting one
+                            due_time = min(due_time, deferred_task.scheduled_time)
+                        else:
+                            deferred_tasks.append(deferred_task)
+                    self._metrics.record_deferred(
+                        task, coalesced=len(deferred_tasks) < len(existing_tasks)
+                    )
+                    deferred_tasks.append(replace(task, interval=None, due_time=due_time))
+                    self._deferred[key] = deferred_tasks
+                    logging.debug(f"Task {task.name} deferred until the running task finishes")
+                else:
+                    self._metrics.record_skipped(task)
+                    logging.info(f"Task {task.name} skipped, previous run still in progress")
+                return
+
+            self._active_workers += 1
+
+            started_at = monotonic()
+            deadline = None
+            if policy.timeout is not None:
+                deadline = started_at + policy.timeout.total_seconds()
+
+            running_task = _RunningTask(task, started_at, deadline)
+            running_tasks.append(running_task)
+
+        self._metrics.record_start(task, started_at)
+
+        future = self._executor.submit(task.function)
+        future.add_done_callback(
+            lambda completed, running_task=running_task: self._finish(running_task, completed)
+        )
+
+    def _finish(self, running_task: _RunningTask, future: Future) -> None:
+        """Release a finished task's slot and re-queue a deferred run if one is waiting."""
+        task = running_task.task
+        key = task.concurrency_key
+
+        failed = not future.cancelled() and future.exception() is not None
+        self._metrics.record_finish(task, monotonic() - running_task.started_at, failed)
+
+        if failed:
+            logging.error(
+                f"Task {task.name} raised an exception",
+                exc_info=future.exception(),
+            )
+
+        if running_task.timed_out:
+            logging.info(
+                f"Task {task.name} finished after {monotonic() - running_task.started_at:.1f}s"
+            )
+
+        with self._condition:
+            self._active_workers -= 1
+            running_tasks = self._running.get(key, [])
+            if running_task in running_tasks:
+                running_tasks.remove(running_task)
+            if len(running_tasks) == 0:
+                self._running.pop(key, None)
+
+            # A one-shot run of the same callback already pending covers the
+            # deferred one, so only the earlier of the two is kept
+            for deferred_task in self._deferred.pop(key, []):
+                deferred_task.time = datetime.now(timezone.utc)
+                self._queue.schedule_earlier(deferred_task, keep_periodic=True)
+
+            self._condition.notify_all()
+
+    def _check_overruns(self) -> None:
+        """Log running tasks that have exceeded their policy timeout."""
+        now = monotonic()
+        with self._condition:
+            for running_tasks in self._running.values():
+                for running_task in running_tasks:
+                    if running_task.deadline is None or running_task.timed_out:
+                        continue
+                    if now < running_task.deadline:
+                        continue
+
+                    running_task.timed_out = True
+                    logging.warning(
+                        f"Task {running_task.task.name} has exceeded its "
+                        f"{running_task.task.effective_policy.timeout} timeout and is still running"
                     )
 
-        return runnable_tasks
+    def _run_inline(self, task: Task) -> None:
+        started_at = monotonic()
+        self._metrics.record_start(task, started_at)
+        failed = True
+        try:
+            task.function()
+            failed = False
+        finally:
+            self._metrics.record_finish(task, monotonic() - started_at, failed)
+
+        timeout = task.effective_policy.timeout
+        if timeout is not None and monotonic() - started_at > timeout.total_seconds():
+            logging.warning(
+                f"Task {task.name} took {monotonic() - started_at:.1f}s, exceeding its {timeout} timeout"
+            )
 
     def run(self, terminate_event: Event) -> None:
-        # Infinite loop until the terminate event gets set
-        while not terminate_event.is_set():
-            # Get the list of runnable tasks
-            task_list = self.get_runnable_tasks()
+        try:
+            # Infinite loop until the terminate event gets set
+            while not terminate_event.is_set():
+                # Get the list of runnable tasks, highest priority first
+                task_list = sorted(self.get_runnable_tasks(), key=lambda task: task.priority)
+
+                # Run the tasks, handing them to workers in executor-backed mode
+                for task in task_list:
+                    if self._executor is None:
+                        self._run_inline(task)
+                    else:
+                        self._queue_ready(task)
+
+                if self._executor is not None:
+                    self._dispatch_ready()
+                    self._check_overruns()
 
-            # Run the tasks
-            for task in task_list:
-                task.function()
+                self._metrics.log_summary_if_due()
 
-            # Sleep for a time
-            sleep(0.01)
+                # Sleep until the next task is due
+                self._wait_for_next_task()
+        finally:
+            if self._executor is not None:
+                # Let in-flight tasks finish so they are not cut off mid-write
+                self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable
+
+from .task_queue import TaskPolicy, TaskPriority
+
+if TYPE_CHECKING:
+    from .async_task_scheduler import AsyncTaskScheduler
+    from .task_scheduler import TaskScheduler
+
+
+class WorkloadScheduler:
+    """Schedule one subsystem's tasks on a shared scheduler.
+
+    Tasks inherit the workload's priority, and its default policy when the
+    caller does not pass one, so subsystems keep the TaskScheduler API while
+    sharing worker capacity with the rest of the process.
+    """
+
+    def __init__(
+        self,
+        scheduler: "TaskScheduler | AsyncTaskScheduler",
+        name: str,
+        priority: int = TaskPriority.NORMAL,
+        default_policy: TaskPolicy | None = None,
+    ) -> None:
+        self.scheduler = scheduler
+        self.name = name
+        self.priority = priority
+        self.default_policy = default_policy
+
+    def schedule_task(
+        self,
+        time: datetime,
+        function: Callable,
+        interval: timedelta | None = None,
+        *,
+        policy: TaskPolicy | None = None,
+    ) -> bool:
+        return self.scheduler.schedule_task(
+            time,
+            function,
+            interval,
+            policy=policy if policy is not None else self.default_policy,
+            priority=self.priority,
+        )
+
+    def schedule_earlier_task(
+        self,
+        time: datetime,
+        function: Callable,
+        interval: timedelta | None = None,
+        *,
+        policy: TaskPolicy | None = None,
+    ) -> bool:
+        return self.scheduler.schedule_earlier_task(
+            time,
+            function,
+            interval,
+            policy=policy if policy is not None else self.default_policy,
+            priority=self.priority,
+        )
+
+    def cancel_task(self, function: Callable) -> bool:
+        return self.scheduler.cancel_task(function)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import unittest
+from unittest import mock
+
+from database.client_registry import (
+    MongoClientRegistry,
+    MongoClientSettings,
+    available_compressors,
+    client_settings_from_env,
+    write_concern_from_env,
+)
+
+
+class ClientSettingsFromEnvTests(unittest.TestCase):
+    def test_workload_setting_overrides_global_setting(self) -> None:
+        env = {
+            "MONGO_MAX_POOL_SIZE": "30",
+            "MONGO_FEEDS_MAX_POOL_SIZE": "8",
+            "MONGO_SERVER_SELECTION_TIMEOUT_MS": "2000",
+        }
+        with mock.patch.dict(os.environ, env):
+            feeds_settings = client_settings_from_env("feeds")
+            football_settings = client_settings_from_env("football")
+
+        self.assertEqual(feeds_settings.max_pool_size, 8)
+        self.assertEqual(football_settings.max_pool_size, 30)
+        self.assertEqual(feeds_settings.server_selection_timeout_ms, 2000)
+
+    def test_invalid_value_keeps_default(self) -> None:
+        with mock.patch.dict(os.environ, {"MONGO_MAX_POOL_SIZE": "many"}):
+            settings = client_settings_from_env()
+
+        self.assertEqual(settings.max_pool_size, MongoClientSettings().max_pool_size)
+
+    def test_unset_write_concern_uses_server_default(self) -> None:
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(write_concern_from_env("feeds"))
+
+    def test_write_concern_is_configured_per_workload(self) -> None:
+        env = {
+            "MONGO_FEEDS_WRITE_CONCERN_W": "1",
+            "MONGO_FEEDS_WRITE_CONCERN_JOURNAL": "false",
+            "MONGO_DYN_DNS_WRITE_CONCERN_W": "majority",
+        }
+        with mock.patch.dict(os.environ, env):
+            feeds_concern = write_concern_from_env("feeds")
+            dns_concern = write_concern_from_env("dyn_dns")
+
+        assert feeds_concern is not None and dns_concern is not None
+        self.assertEqual(feeds_concern.document, {"w": 1, "j": False})
+        self.assertEqual(dns_concern.document, {"w": "majority"})
+
+
+class CompressorTests(unittest.TestCase):
+    def test_unknown_and_duplicate_compressors_are_dropped(self) -> None:
+        with self.assertLogs(level="WARNING"):
+            compressors = available_compressors("zlib, lz4, zlib")
+
+        self.assertEqual(compressors, ("zlib",))
+
+    def test_compressors_without_installed_support_are_skipped(self) -> None:
+        with mock.patch("database.client_registry.find_spec", return_value=None):
+            self.assertEqual(available_compressors("zstd,snappy,zlib"), ("zlib",))
+
+
+class MongoClientRegistryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = MongoClientRegistry()
+
+    def tearDown(self) -> None:
+        self.registry.close_all()
+
+    def test_equal_settings_share_one_client(self) -> None:
+        first = self.registry.get_client(MongoClientSettings(), "localhost")
+        second = self.registry.get_client(MongoClientSettings(), "localhost")
+
+        self.assertIs(first, second)
+        self.assertEqual(self.registry.client_count(), 1)
+
+    def test_different_pool_settings_get_separate_clients(self) -> None:
+        first = self.registry.get_client(MongoClientSettings(), "localhost")
+        second = self.registry.get_client(MongoClientSettings(max_pool_size=5), "localhost")
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.options.pool_options.max_pool_size, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+import unittest
+
+from database.command_metrics import (
+    LATENCY_BUCKETS_MS,
+    UNATTRIBUTED,
+    CommandMetricsListener,
+    track_db_operation,
+)
+
+
+def _started(request_id: int, command_name: str, command: dict, database_name: str = "feeds"):
+    return SimpleNamespace(
+        command_name=command_name,
+        command={command_name: command.pop("collection", None), **command},
+        database_name=database_name,
+        connection_id=("mongo", 27017),
+        request_id=request_id,
+    )
+
+
+def _finished(request_id: int, duration_ms: float, reply: dict | None = None):
+    return SimpleNamespace(
+        connection_id=("mongo", 27017),
+        request_id=request_id,
+        duration_micros=int(duration_ms * 1000),
+        reply=reply or {},
+    )
+
+
+class CommandMetricsListenerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.listener = CommandMetricsListener(slow_command_ms=100)
+
+    def test_commands_are_attributed_to_the_enclosing_operation(self) -> None:
+        with track_db_operation("Feeds._upsert_article"):
+            self.listener.started(_started(1, "update", {"collection": "feed_articles", "updates": [{}, {}]}))
+        self.listener.started(_started(2, "find", {"collection": "feed_sources"}))
+
+        self.listener.succeeded(_finished(1, 4, {"n": 2}))
+        self.listener.succeeded(_finished(2, 1, {"cursor": {"firstBatch": [{}, {}, {}]}}))
+
+        snapshots = {snapshot.operation: snapshot for snapshot in self.listener.snapshot()}
+        upsert = snapshots["Feeds._upsert_article"]
+        self.assertEqual(upsert.namespace, "feeds.feed_articles")
+        self.assertEqual(upsert.command, "update")
+        self.assertEqual(upsert.count, 1)
+        self.assertEqual(upsert.documents, 2)
+        self.assertEqual(upsert.latency_counts[LATENCY_BUCKETS_MS.index(5)], 1)
+        self.assertEqual(snapshots[UNATTRIBUTED].documents, 3)
+
+    def test_decorated_function_attributes_its_commands(self) -> None:
+        @track_db_operation("Feeds._apply_retention")
+        def apply_retention() -> None:
+            self.listener.started(_started(1, "delete", {"collection": "feed_articles", "deletes": [{}]}))
+
+        apply_retention()
+        self.listener.succeeded(_finished(1, 20, {"n": 40}))
+
+        self.assertEqual(self.listener.time_by_operation(), {"Feeds._apply_retention": 20.0})
+        self.assertEqual(self.listener.snapshot()[0].documents, 40)
+
+    def test_slow_and_failed_commands_are_logged_and_counted(self) -> None:
+        with track_db_operation("Football.get_table"):
+            self.listener.started(_started(1, "update", {"collection": "pl_table"}, "web_database"))
+
+        with self.assertLogs(level="WARNING") as logs:
+            self.listener.failed(_finished(1, 250))
+
+        snapshot = self.listener.snapshot()[0]
+        self.assertEqual(snapshot.failures, 1)
+        self.assertEqual(snapshot.max_ms, 250)
+        self.assertIn("Football.get_table", logs.output[0])
+
+    def test_finish_without_start_is_ignored(self) -> None:
+        self.listener.succeeded(_finished(7, 1))
+        self.assertEqual(self.listener.snapshot(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
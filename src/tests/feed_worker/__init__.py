@@ -0,0 +1,4 @@
+import os
+
+# Feeds starts a change watcher thread by default; these tests drive its callbacks directly
+os.environ.setdefault("FEEDS_CHANGE_WATCH", "0")
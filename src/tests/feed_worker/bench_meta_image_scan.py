@@ -0,0 +1,128 @@
+"""Compare the streaming meta-image scanner against the previous regex scan.
+
+Run from the repository root::
+
+    PYTHONPATH=src python -m tests.feed_worker.bench_meta_image_scan [--corpus DIR] [--repeat N]
+
+``--corpus`` points at a directory of saved article pages (``*.html``); each
+file is cut to ``ARTICLE_IMAGE_SCAN_MAX_CHARS`` like a live scrape. Without it
+a built-in set of page heads shaped like common news and blog CMS output is
+used. Not collected by pytest.
+"""
+
+from __future__ import annotations
+
+from html import unescape
+from pathlib import Path
+from time import perf_counter
+import argparse
+import re
+
+from feeds.feeds import ARTICLE_IMAGE_SCAN_MAX_CHARS
+from feeds.meta_image_scanner import (
+    META_IMAGE_NAME_VALUES,
+    META_IMAGE_PROPERTY_VALUES,
+    normalize_meta_image_url,
+    scan_meta_image_url,
+)
+
+PAGE_URL = "https://news.example.com/2026/10/17/story"
+CHUNK_CHARS = 16_384
+
+# The regex path extract_meta_image_url used before the scanner
+META_TAG_RE = re.compile(r"<meta\b[^>]*>", re.IGNORECASE)
+META_ATTR_RE = re.compile(
+    r"\b([a-zA-Z_:][-a-zA-Z0-9_:.]*)\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s\"'=<>`]+))",
+    re.IGNORECASE,
+)
+
+
+def regex_meta_image_url(page_html: str, page_url: str) -> str | None:
+    for meta_match in META_TAG_RE.finditer(page_html):
+        attributes: dict[str, str] = {}
+        for match in META_ATTR_RE.finditer(meta_match.group(0)):
+            raw_value = next((value.strip() for value in match.groups()[1:] if value and value.strip()), "")
+            if raw_value != "":
+                attributes[match.group(1).lower()] = unescape(raw_value)
+
+        content_value = attributes.get("content", "").strip()
+        if content_value == "":
+            continue
+
+        if (
+            attributes.get("property", "").strip().lower() in META_IMAGE_PROPERTY_VALUES
+            or attributes.get("name", "").strip().lower() in META_IMAGE_NAME_VALUES
+            or attributes.get("itemprop", "").strip().lower() == "image"
+        ):
+            normalized = normalize_meta_image_url(content_value, page_url)
+            if normalized is not None:
+                return normalized
+
+    return None
+
+
+def _builtin_corpus() -> dict[str, str]:
+    inline_script = "<script>window.__STATE__ = " + '{"k": "v", "items": [1, 2, 3]}, ' * 400 + "{};</script>\n"
+    json_ld = (
+        '<script type="application/ld+json">{"@context": "https://schema.org", "@type": "NewsArticle", '
+        '"headline": "Story", "image": ["https://cdn.example.com/ld.jpg"]}</script>\n'
+    )
+    preloads = "".join(
+        f'<link rel="preload" href="/static/chunk-{index}.js" as="script">\n' for index in range(60)
+    )
+    filler_meta = "".join(f'<meta name="x-meta-{index}" content="value {index}">\n' for index in range(40))
+    og = '<meta property="og:image" content="https://cdn.example.com/og.jpg?w=1200&amp;h=630">\n'
+    twitter = '<meta name="twitter:image" content="https://cdn.example.com/twitter.jpg">\n'
+    body = "<body>" + "<p>Paragraph text for the article body.</p>\n" * 3000 + "</body></html>"
+
+    return {
+        "og-early": f"<html><head><meta charset='utf-8'>{og}{twitter}{preloads}{inline_script}</head>{body}",
+        "og-after-scripts": f"<html><head>{preloads}{inline_script}{json_ld}{filler_meta}{og}</head>{body}",
+        "twitter-only": f"<html><head>{filler_meta}{preloads}{twitter}{inline_script}</head>{body}",
+        "no-image": f"<html><head>{filler_meta}{preloads}{json_ld}</head>{body}",
+        "no-head-close": f"<html><head>{filler_meta}{inline_script}{twitter}{body}",
+    }
+
+
+def _load_corpus(corpus_dir: Path | None) -> dict[str, str]:
+    if corpus_dir is None:
+        return _builtin_corpus()
+
+    return {
+        path.name: path.read_text(encoding="utf-8", errors="replace")
+        for path in sorted(corpus_dir.glob("*.html"))
+    }
+
+
+def _chunks(page_html: str) -> list[str]:
+    return [page_html[index : index + CHUNK_CHARS] for index in range(0, len(page_html), CHUNK_CHARS)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, default=None)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = _load_corpus(args.corpus)
+    print(f"{'page':<24} {'regex us':>10} {'scanner us':>11} {'speedup':>8}  result")
+    for name, page_html in corpus.items():
+        prefix = page_html[:ARTICLE_IMAGE_SCAN_MAX_CHARS]
+        chunks = _chunks(prefix)
+
+        started_at = perf_counter()
+        for _ in range(args.repeat):
+            regex_result = regex_meta_image_url(prefix, PAGE_URL)
+        regex_us = (perf_counter() - started_at) / args.repeat * 1e6
+
+        started_at = perf_counter()
+        for _ in range(args.repeat):
+            scanner_result = scan_meta_image_url(chunks, PAGE_URL)
+        scanner_us = (perf_counter() - started_at) / args.repeat * 1e6
+
+        result = scanner_result if scanner_result == regex_result else f"{regex_result} -> {scanner_result}"
+        print(f"{name:<24} {regex_us:>10.1f} {scanner_us:>11.1f} {regex_us / scanner_us:>7.2f}x  {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from typing import Any, cast
 import unittest
 
 from bson import ObjectId
+from pymongo.operations import UpdateOne
 
 import feeds.feeds as feeds_module
 from feeds.feeds import Feeds, normalize_article_identity_url
@@ -24,9 +25,15 @@ class _FakeUpdateResult:
         self.upserted_id = upserted_id
 
 
+class _FakeBulkWriteResult:
+    def __init__(self, upserted_ids: dict[int, ObjectId]) -> None:
+        self.upserted_ids = upserted_ids
+
+
 class _FakeFeedArticlesCollection:
     def __init__(self) -> None:
         self.docs: list[dict[str, Any]] = []
+        self.calls: list[str] = []
 
     def _matches(self, doc: dict[str, Any], query: dict[str, Any]) -> bool:
         for key, value in query.items():
@@ -37,37 +44,71 @@ class _FakeFeedArticlesCollection:
                     return False
                 continue
 
+            if isinstance(value, dict) and "$in" in value:
+                if doc.get(key) not in value["$in"]:
+                    return False
+                continue
+
             if doc.get(key) != value:
                 return False
 
         return True
 
+    def _project(self, doc: dict[str, Any], projection: dict[str, int] | None) -> dict[str, Any]:
+        if projection is None:
+            return dict(doc)
+
+        projected: dict[str, Any] = {}
+        for field, include in projection.items():
+            if include and field in doc:
+                projected[field] = doc[field]
+
+        return projected
+
+    def find(
+        self,
+        query: dict[str, Any],
+        projection: dict[str, int] | None = None,
+    ) -> list[dict[str, Any]]:
+        self.calls.append("find")
+        return [self._project(doc, projection) for doc in self.docs if self._matches(doc, query)]
+
     def find_one(
         self,
         query: dict[str, Any],
         projection: dict[str, int] | None = None,
     ) -> dict[str, Any] | None:
+        self.calls.append("find_one")
         for doc in self.docs:
-            if not self._matches(doc, query):
-                continue
+            if self._matches(doc, query):
+                return self._project(doc, projection)
 
-            if projection is None:
-                return dict(doc)
-
-            projected: dict[str, Any] = {}
-            for field, include in projection.items():
-                if include and field in doc:
-                    projected[field] = doc[field]
+        return None
 
-            return projected
+    def bulk_write(self, operations: list[UpdateOne], ordered: bool = True) -> _FakeBulkWriteResult:
+        self.calls.append("bulk_write")
+        upserted_ids: dict[int, ObjectId] = {}
+        for index, operation in enumerate(operations):
+            result = self._apply_update(operation._filter, operation._doc, operation._upsert)
+            if result.upserted_id is not None:
+                upserted_ids[index] = result.upserted_id
 
-        return None
+        return _FakeBulkWriteResult(upserted_ids)
 
     def update_one(
         self,
         query: dict[str, Any],
         update: dict[str, Any],
         upsert: bool = False,
+    ) -> _FakeUpdateResult:
+        self.calls.append("update_one")
+        return self._apply_update(query, update, upsert)
+
+    def _apply_update(
+        self,
+        query: dict[str, Any],
+        update: dict[str, Any],
+        upsert: bool,
     ) -> _FakeUpdateResult:
         for index, doc in enumerate(self.docs):
             if not self._matches(doc, query):
@@ -96,12 +137,16 @@ class FeedArticleDeduplicationTests(unittest.TestCase):
         self.original_articles_collection = feeds_module.FEED_ARTICLES_COLLECTION
         self.fake_articles_collection = _FakeFeedArticlesCollection()
         feeds_module.FEED_ARTICLES_COLLECTION = self.fake_articles_collection
+        # No subscribers, so inserts leave the unread counts alone
+        self.original_subscriptions_collection = feeds_module.USER_FEED_SUBSCRIPTIONS_COLLECTION
+        feeds_module.USER_FEED_SUBSCRIPTIONS_COLLECTION = None
 
         self.worker = Feeds(cast(TaskScheduler, _NoopScheduler()))
         self.feed_id = ObjectId()
 
     def tearDown(self) -> None:
         feeds_module.FEED_ARTICLES_COLLECTION = self.original_articles_collection
+        feeds_module.USER_FEED_SUBSCRIPTIONS_COLLECTION = self.original_subscriptions_collection
 
     def test_same_url_with_title_correction_updates_single_article(self) -> None:
         original_entry = {
@@ -190,6 +235,90 @@ class FeedArticleDeduplicationTests(unittest.TestCase):
         self.assertEqual(len(self.fake_articles_collection.docs), 1)
         self.assertEqual(self.fake_articles_collection.docs[0].get("title"), "Revised title")
 
+    def test_batch_upsert_uses_one_prefetch_and_one_bulk_write(self) -> None:
+        existing = self.worker._parse_feed_entry(
+            SOURCE_URL,
+            {"link": "https://example.com/articles/1", "title": "Existing"},
+        )
+        assert existing is not None
+        self.worker._upsert_article(self.feed_id, existing)
+        self.fake_articles_collection.calls.clear()
+
+        parsed_entries = [
+            self.worker._parse_feed_entry(
+                SOURCE_URL,
+                {"link": f"https://example.com/articles/{index}", "title": f"Article {index}"},
+            )
+            for index in range(1, 21)
+        ]
+        scrape_jobs = self.worker._upsert_articles(
+            self.feed_id,
+            [parsed for parsed in parsed_entries if parsed is not None],
+        )
+
+        self.assertEqual(self.fake_articles_collection.calls, ["find", "bulk_write"])
+        self.assertEqual(len(self.fake_articles_collection.docs), 20)
+        self.assertEqual(self.fake_articles_collection.docs[0].get("title"), "Article 1")
+        # Only newly inserted articles without a media image are queued for scraping
+        self.assertEqual(len(scrape_jobs), 19)
+        inserted_ids = {doc["_id"] for doc in self.fake_articles_collection.docs[1:]}
+        self.assertEqual({job.article_id for job in scrape_jobs}, inserted_ids)
+
+    def test_batch_upsert_resolves_repeated_identity_like_sequential_upserts(self) -> None:
+        link = "https://www.bbc.com/sport/formula1/articles/c75kg9vrd3xo"
+        parsed_original = self.worker._parse_feed_entry(SOURCE_URL, {"link": link, "title": "First"})
+        parsed_corrected = self.worker._parse_feed_entry(SOURCE_URL, {"link": link, "title": "Second"})
+        assert parsed_original is not None
+        assert parsed_corrected is not None
+
+        scrape_jobs = self.worker._upsert_articles(self.feed_id, [parsed_original, parsed_corrected])
+
+        self.assertEqual(len(self.fake_articles_collection.docs), 1)
+        self.assertEqual(self.fake_articles_collection.docs[0].get("title"), "Second")
+        self.assertEqual(len(scrape_jobs), 1)
+
+    def test_batch_upsert_skips_unchanged_articles(self) -> None:
+        parsed_entries = [
+            self.worker._parse_feed_entry(
+                SOURCE_URL,
+                {"link": f"https://example.com/articles/{index}", "title": f"Article {index}"},
+            )
+            for index in range(3)
+        ]
+        batch = [parsed for parsed in parsed_entries if parsed is not None]
+        self.worker._upsert_articles(self.feed_id, batch)
+        self.fake_articles_collection.calls.clear()
+
+        scrape_jobs = self.worker._upsert_articles(self.feed_id, batch)
+
+        self.assertEqual(self.fake_articles_collection.calls, ["find"])
+        self.assertEqual(scrape_jobs, [])
+
+    def test_batch_upsert_rewrites_changed_and_revives_deleted_articles(self) -> None:
+        link = "https://example.com/articles/1"
+        original = self.worker._parse_feed_entry(SOURCE_URL, {"link": link, "title": "Original"})
+        other = self.worker._parse_feed_entry(SOURCE_URL, {"link": f"{link}/other", "title": "Other"})
+        assert original is not None
+        assert other is not None
+        self.worker._upsert_articles(self.feed_id, [original, other])
+        deleted_doc, unchanged_doc = self.fake_articles_collection.docs
+        deleted_doc["is_deleted"] = True
+        deleted_doc["deleted_at"] = datetime.now(timezone.utc)
+        stale_fetched_at = datetime.now(timezone.utc) - feeds_module.ARTICLE_FETCHED_AT_REFRESH_AFTER
+        unchanged_doc["fetched_at"] = stale_fetched_at
+
+        self.worker._upsert_articles(self.feed_id, [original, other])
+
+        self.assertFalse(self.fake_articles_collection.docs[0].get("is_deleted"))
+        self.assertGreater(self.fake_articles_collection.docs[1]["fetched_at"], stale_fetched_at)
+
+        corrected = self.worker._parse_feed_entry(SOURCE_URL, {"link": link, "title": "Corrected"})
+        assert corrected is not None
+        self.worker._upsert_articles(self.feed_id, [corrected, other])
+
+        self.assertEqual(len(self.fake_articles_collection.docs), 2)
+        self.assertEqual(self.fake_articles_collection.docs[0].get("title"), "Corrected")
+
     def test_normalize_article_identity_url_preserves_query_and_drops_fragment(self) -> None:
         normalized = normalize_article_identity_url(
             "HTTPS://WWW.BBC.COM/sport/formula1/articles/c75kg9vrd3xo?at_medium=RSS&at_campaign=rss#fragment",
@@ -1,12 +1,32 @@
 from __future__ import annotations
 
-from feeds.feeds import extract_meta_image_url, parse_retry_after_seconds
+from typing import Any, cast
 import unittest
 
+import requests
+
+from feeds.feeds import (
+    decode_html_chunks,
+    extract_meta_image_url,
+    iter_html_head_chunks,
+    parse_retry_after_seconds,
+)
+
 
 ARTICLE_URL = "https://example.com/news/story"
 
 
+class _StreamedResponse:
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = chunks
+        self.chunks_read = 0
+
+    def iter_content(self, chunk_size: int) -> Any:
+        for chunk in self.chunks:
+            self.chunks_read += 1
+            yield chunk
+
+
 class ArticleImageScrapeSafetyTests(unittest.TestCase):
     """Validate article meta-image extraction and retry header parsing."""
 
@@ -81,6 +101,37 @@ class ArticleImageScrapeSafetyTests(unittest.TestCase):
 
         self.assertIsNone(parse_retry_after_seconds("not-a-valid-header"))
 
+    def test_iter_html_head_chunks_stops_at_closing_head_tag(self) -> None:
+        """Streaming should stop after </head> even when it spans two chunks."""
+
+        response = _StreamedResponse(
+            [b"<html><head><meta property='og:image' content='/a.jpg'></he", b"ad><body>", b"x" * 1000]
+        )
+
+        body = b"".join(iter_html_head_chunks(cast(requests.Response, response), 10_000))
+
+        self.assertTrue(body.endswith(b"</head>"))
+        self.assertEqual(response.chunks_read, 2)
+
+    def test_iter_html_head_chunks_stops_at_byte_budget(self) -> None:
+        """Pages without a closing head tag should be cut at the byte budget."""
+
+        response = _StreamedResponse([b"a" * 600, b"b" * 600, b"c" * 600])
+
+        body = b"".join(iter_html_head_chunks(cast(requests.Response, response), 1000))
+
+        self.assertEqual(len(body), 1000)
+        self.assertEqual(response.chunks_read, 2)
+
+    def test_decode_html_chunks_prefers_header_then_meta_charset(self) -> None:
+        """Header charsets should win over meta charsets, with UTF-8 as the fallback."""
+
+        body = "<meta charset='iso-8859-1'><title>caf\u00e9</title>".encode("iso-8859-1")
+
+        self.assertIn("caf\u00e9", "".join(decode_html_chunks([body], "text/html")))
+        self.assertIn("caf\ufffd", "".join(decode_html_chunks([body], "text/html; charset=utf-8")))
+        self.assertIn("caf\u00e9", "".join(decode_html_chunks([b"caf\xc3", b"\xa9"], None)))
+
 
 if __name__ == "__main__":
     unittest.main()
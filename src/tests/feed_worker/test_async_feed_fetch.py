@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from unittest import mock
+import unittest
+
+from aiohttp import web
+
+import feeds.async_fetch as async_fetch_module
+from feeds.async_fetch import AsyncFeedFetcher, FeedFetchError
+
+
+def _block_private_path(url: str) -> str | None:
+    # The test server is on localhost, so only the /private path counts as non-public
+    return "Blocked non-public URL" if "/private" in url else None
+
+
+class AsyncFeedFetcherTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.request_headers: list[dict[str, str]] = []
+        self.flaky_calls = 0
+
+        async def feed(request: web.Request) -> web.Response:
+            self.request_headers.append(dict(request.headers))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304)
+            return web.Response(body=b"<rss/>", headers={"ETag": '"v1"'})
+
+        async def moved(_request: web.Request) -> web.Response:
+            raise web.HTTPMovedPermanently("/feed.xml")
+
+        async def to_private(_request: web.Request) -> web.Response:
+            raise web.HTTPFound("/private/feed.xml")
+
+        async def loop(_request: web.Request) -> web.Response:
+            raise web.HTTPFound("/loop")
+
+        async def flaky(_request: web.Request) -> web.Response:
+            self.flaky_calls += 1
+            if self.flaky_calls == 1:
+                return web.Response(status=503)
+            return web.Response(body=b"<rss/>")
+
+        app = web.Application()
+        app.router.add_get("/feed.xml", feed)
+        app.router.add_get("/moved", moved)
+        app.router.add_get("/to-private", to_private)
+        app.router.add_get("/loop", loop)
+        app.router.add_get("/flaky", flaky)
+
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        self.base_url = f"http://127.0.0.1:{port}"
+
+        self.fetcher = AsyncFeedFetcher(
+            concurrency=4,
+            per_host_concurrency=2,
+            timeout_seconds=5,
+            max_redirects=3,
+            headers={"User-Agent": "test-agent"},
+        )
+        patcher = mock.patch.object(
+            async_fetch_module,
+            "explain_public_http_url_block",
+            side_effect=_block_private_path,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self) -> None:
+        await self.fetcher.close()
+        await self.runner.cleanup()
+
+    async def test_follows_redirects_and_sends_conditional_headers(self) -> None:
+        response = await self.fetcher.get_with_redirects(f"{self.base_url}/moved", {"If-None-Match": '"v1"'})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.url, f"{self.base_url}/feed.xml")
+        self.assertEqual(response.history, [f"{self.base_url}/moved"])
+        self.assertEqual(self.request_headers[0]["User-Agent"], "test-agent")
+
+        fresh = await self.fetcher.get_with_redirects(f"{self.base_url}/feed.xml", {})
+        self.assertEqual(fresh.content, b"<rss/>")
+        self.assertEqual(fresh.headers.get("etag"), '"v1"')
+
+    async def test_redirect_to_blocked_url_is_refused(self) -> None:
+        with self.assertRaisesRegex(FeedFetchError, "Blocked"):
+            await self.fetcher.get_with_redirects(f"{self.base_url}/to-private", {})
+
+    async def test_redirect_limit_is_enforced(self) -> None:
+        with self.assertRaisesRegex(FeedFetchError, "redirect limit"):
+            await self.fetcher.get_with_redirects(f"{self.base_url}/loop", {})
+
+    async def test_transient_status_is_retried(self) -> None:
+        with mock.patch.object(async_fetch_module, "RETRY_BACKOFF_SECONDS", 0):
+            response = await self.fetcher.get_with_redirects(f"{self.base_url}/flaky", {})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.flaky_calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
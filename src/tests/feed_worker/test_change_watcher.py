@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from threading import Event
+from types import SimpleNamespace
+from typing import Any, cast
+import unittest
+from unittest import mock
+
+from bson import ObjectId
+from pymongo.database import Database
+from pymongo.errors import OperationFailure
+
+import feeds.feeds as feeds_module
+from feeds.change_watcher import FeedChangeWatcher
+from feeds.feeds import Feeds
+from feeds.unread_counters import ReadStateChange
+from task_scheduler import TaskScheduler
+
+
+class _RecordingScheduler:
+    def __init__(self) -> None:
+        self.earlier_tasks: list[tuple[datetime, Any]] = []
+        self.policies: dict[Any, Any] = {}
+
+    def schedule_task(self, _time: datetime, function: Any, *_args: Any, **kwargs: Any) -> None:
+        self.policies[function] = kwargs.get("policy")
+
+    def schedule_earlier_task(self, time: datetime, function: Any, *_args: Any, **kwargs: Any) -> None:
+        self.earlier_tasks.append((time, function))
+        self.policies[function] = kwargs.get("policy")
+
+
+class _StandaloneDatabase:
+    def watch(self, *_args: Any, **_kwargs: Any) -> Any:
+        raise OperationFailure("The $changeStream stage is only supported on replica sets", code=40573)
+
+
+class _FakeSourcesCollection:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self.docs = docs
+
+    def find(self, query: dict[str, Any], _projection: dict[str, int] | None = None) -> list[dict[str, Any]]:
+        source_ids = query.get("_id", {}).get("$in")
+        return [
+            dict(doc)
+            for doc in self.docs
+            if (source_ids is None or doc["_id"] in source_ids) and doc.get("is_subscribed") is not False
+        ]
+
+
+class FeedChangeWatcherTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.changed: list[list[ObjectId]] = []
+        self.subscribed: list[list[Any]] = []
+        self.unsubscribed: list[list[ObjectId]] = []
+        self.read_state_changes: list[ReadStateChange] = []
+        self.pending_ids = [ObjectId()]
+        self.polled = Event()
+
+        def poll_pending_sources() -> list[ObjectId]:
+            self.polled.set()
+            return self.pending_ids
+
+        self.watcher = FeedChangeWatcher(
+            cast(Database, _StandaloneDatabase()),
+            "feed_sources",
+            "user_feed_subscriptions",
+            "user_article_states",
+            on_sources_changed=self.changed.append,
+            on_subscriptions_added=self.subscribed.append,
+            on_subscriptions_removed=self.unsubscribed.append,
+            on_read_states_changed=self.read_state_changes.extend,
+            poll_pending_sources=poll_pending_sources,
+            poll_interval_seconds=60,
+        )
+
+    def test_changes_are_dispatched_by_collection(self) -> None:
+        source_id, subscription_id = ObjectId(), ObjectId()
+        subscription = {"_id": subscription_id, "feed_id": ObjectId(), "user_id": "alice"}
+
+        self.watcher.handle_change({"ns": {"coll": "feed_sources"}, "documentKey": {"_id": source_id}})
+        self.watcher.handle_change(
+            {"ns": {"coll": "user_feed_subscriptions"}, "operationType": "insert", "fullDocument": subscription}
+        )
+        self.watcher.handle_change(
+            {
+                "ns": {"coll": "user_feed_subscriptions"},
+                "operationType": "delete",
+                "documentKey": {"_id": subscription_id},
+            }
+        )
+        self.watcher.handle_change({"ns": {"coll": "feed_articles"}, "documentKey": {"_id": ObjectId()}})
+
+        self.assertEqual(self.changed, [[source_id]])
+        self.assertEqual(self.subscribed, [[subscription]])
+        self.assertEqual(self.unsubscribed, [[subscription_id]])
+
+    def test_read_flag_changes_become_counter_deltas(self) -> None:
+        article_id = ObjectId()
+        state = {"user_id": "alice", "article_id": article_id}
+
+        self.watcher.handle_change(
+            {"ns": {"coll": "user_article_states"}, "operationType": "insert", "fullDocument": state}
+        )
+        self.watcher.handle_change(
+            {
+                "ns": {"coll": "user_article_states"},
+                "operationType": "update",
+                "fullDocument": state,
+                "updateDescription": {"updatedFields": {"is_read": False}},
+            }
+        )
+        # The state was deleted before the update lookup ran
+        self.watcher.handle_change(
+            {
+                "ns": {"coll": "user_article_states"},
+                "operationType": "update",
+                "fullDocument": None,
+                "updateDescription": {"updatedFields": {"is_read": True}},
+            }
+        )
+
+        self.assertEqual(
+            self.read_state_changes,
+            [ReadStateChange("alice", article_id, -1), ReadStateChange("alice", article_id, 1)],
+        )
+
+    def test_falls_back_to_polling_without_change_streams(self) -> None:
+        with self.assertLogs(level="INFO"):
+            self.watcher.start()
+            self.assertTrue(self.polled.wait(5))
+            self.watcher.stop(5)
+
+        self.assertTrue(self.watcher.polling)
+        self.assertEqual(self.changed, [self.pending_ids])
+
+
+class RequestedSourceFetchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        now = datetime.now(timezone.utc)
+        self.forced_source = {
+            "_id": ObjectId(),
+            "normalized_url": "https://example.com/forced.xml",
+            "last_fetched_at": now - timedelta(minutes=1),
+            "next_refresh_at": now + timedelta(minutes=10),
+            "force_refresh_requested_at": now,
+        }
+        self.fresh_source = {
+            "_id": ObjectId(),
+            "normalized_url": "https://example.com/fresh.xml",
+            "last_fetched_at": now,
+            "next_refresh_at": now + timedelta(minutes=10),
+        }
+        self.sources = _FakeSourcesCollection([self.forced_source, self.fresh_source])
+        patcher = mock.patch.object(feeds_module, "FEED_SOURCES_COLLECTION", self.sources)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.scheduler = _RecordingScheduler()
+        self.worker = Feeds(cast(TaskScheduler, self.scheduler))
+
+    def test_requests_share_one_run_of_due_sources(self) -> None:
+        self.worker.request_source_fetch([self.forced_source["_id"]])
+        self.worker.request_source_fetch([self.fresh_source["_id"]])
+
+        callbacks = {callback for _, callback in self.scheduler.earlier_tasks}
+        self.assertEqual(callbacks, {self.worker.run_requested_sources})
+
+        requested_sources = self.worker._take_requested_sources()
+
+        self.assertEqual([source["_id"] for source in requested_sources], [self.forced_source["_id"]])
+        self.assertEqual(self.worker._take_requested_sources(), [])
+
+    def test_source_fetch_runs_share_one_concurrency_key(self) -> None:
+        self.worker.request_source_fetch([self.forced_source["_id"]])
+        self.worker._update_due_queue([self.forced_source])
+        self.worker._schedule_due_run()
+
+        keys = {
+            self.scheduler.policies[callback].concurrency_key
+            for callback in (self.worker.run_cycle, self.worker.run_due_sources, self.worker.run_requested_sources)
+        }
+        self.assertEqual(keys, {feeds_module.SOURCE_FETCH_CONCURRENCY_KEY})
+
+    def test_empty_request_schedules_nothing(self) -> None:
+        self.worker.request_source_fetch([])
+
+        self.assertEqual(self.scheduler.earlier_tasks, [])
+
+
+class _FakeSubscriptionsCursor(list):
+    def sort(self, keys: list[tuple[str, int]]) -> "_FakeSubscriptionsCursor":
+        return _FakeSubscriptionsCursor(sorted(self, key=lambda doc: doc["_id"]))
+
+
+class _FakeSubscriptionsCollection:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self.docs = docs
+
+    def find(self, query: dict[str, Any], _projection: dict[str, int] | None = None) -> _FakeSubscriptionsCursor:
+        after = query.get("_id", {}).get("$gt")
+        return _FakeSubscriptionsCursor(
+            dict(doc) for doc in self.docs if after is None or doc["_id"] > after
+        )
+
+    def find_one(self, _query: dict[str, Any], _projection: dict[str, int], sort: list[Any]) -> dict[str, Any] | None:
+        return max(self.docs, key=lambda doc: doc["_id"], default=None)
+
+
+class _FlaggedSourcesCollection:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self.docs = docs
+
+    def update_many(self, query: dict[str, Any], update: dict[str, Any]) -> SimpleNamespace:
+        ids = query["_id"]
+        flag = update["$set"]["is_subscribed"]
+        modified = 0
+        for doc in self.docs:
+            selected = doc["_id"] in ids["$in"] if "$in" in ids else doc["_id"] not in ids["$nin"]
+            if selected and doc.get("is_subscribed") != flag:
+                doc["is_subscribed"] = flag
+                modified += 1
+        return SimpleNamespace(modified_count=modified)
+
+
+class SubscribedSourceSyncTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.source = {"_id": ObjectId(), "is_subscribed": True}
+        self.subscription = {"_id": ObjectId(), "feed_id": self.source["_id"], "user_id": "alice"}
+        self.sources = _FlaggedSourcesCollection([self.source])
+        self.subscriptions = _FakeSubscriptionsCollection([self.subscription])
+        for name, value in (
+            ("FEED_SOURCES_COLLECTION", self.sources),
+            ("USER_FEED_SUBSCRIPTIONS_COLLECTION", self.subscriptions),
+            ("record_subscription_added", mock.Mock()),
+        ):
+            patcher = mock.patch.object(feeds_module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.scheduler = _RecordingScheduler()
+        self.worker = Feeds(cast(TaskScheduler, self.scheduler))
+
+    def test_resubscribed_source_is_flagged_before_the_next_full_sync(self) -> None:
+        self.assertTrue(self.worker._sync_subscribed_sources())
+
+        self.subscriptions.docs.clear()
+        self.assertTrue(self.worker._sync_subscribed_sources(force=True))
+        self.assertFalse(self.source["is_subscribed"])
+
+        self.subscriptions.docs.append({"_id": ObjectId(), "feed_id": self.source["_id"], "user_id": "alice"})
+        self.assertFalse(self.worker._sync_subscribed_sources())
+
+        self.assertTrue(self.source["is_subscribed"])
+        self.assertEqual(self.worker.subscription_cache.subscribers(self.source["_id"]), ["alice"])
+        self.assertEqual([callback for _, callback in self.scheduler.earlier_tasks], [self.worker.run_requested_sources])
+
+        # Already applied subscriptions are not replayed
+        self.assertFalse(self.worker._sync_subscribed_sources())
+        self.assertEqual(len(self.scheduler.earlier_tasks), 1)
+
+    def test_subscription_inserted_before_a_full_sync_is_still_applied(self) -> None:
+        self.assertTrue(self.worker._sync_subscribed_sources())
+
+        new_subscription = {"_id": ObjectId(), "feed_id": self.source["_id"], "user_id": "bob"}
+        self.subscriptions.docs.append(new_subscription)
+        self.assertTrue(self.worker._sync_subscribed_sources(force=True))
+
+        cast(mock.Mock, feeds_module.record_subscription_added).assert_called_once_with(self.source["_id"], "bob")
+        self.assertEqual([callback for _, callback in self.scheduler.earlier_tasks], [self.worker.run_requested_sources])
+        self.assertEqual(self.worker._subscription_high_water_id, new_subscription["_id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, cast
+import unittest
+
+from pymongo.collection import Collection
+from pymongo.errors import ServerSelectionTimeoutError
+
+from feeds.image_result_cache import ArticleImageResultCache
+
+
+class _FakeResultsCollection:
+    def __init__(self) -> None:
+        self.docs: dict[str, dict[str, Any]] = {}
+        self.find_count = 0
+
+    def find_one(self, query: dict[str, Any], _projection: dict[str, int] | None = None) -> dict[str, Any] | None:
+        self.find_count += 1
+        doc = self.docs.get(query["_id"])
+        if doc is None or doc["expires_at"] <= query["expires_at"]["$gt"]:
+            return None
+        return dict(doc)
+
+    def update_one(self, query: dict[str, Any], update: dict[str, Any], upsert: bool = False) -> None:
+        self.docs.setdefault(query["_id"], {"_id": query["_id"]}).update(update["$set"])
+
+
+class _FailingResultsCollection:
+    def find_one(self, *_args: Any, **_kwargs: Any) -> None:
+        raise ServerSelectionTimeoutError("down")
+
+    def update_one(self, *_args: Any, **_kwargs: Any) -> None:
+        raise ServerSelectionTimeoutError("down")
+
+
+class ArticleImageResultCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.collection = _FakeResultsCollection()
+
+    def _cache(self, collection: Any = None, max_entries: int = 100) -> ArticleImageResultCache:
+        return ArticleImageResultCache(
+            cast(Collection, collection if collection is not None else self.collection),
+            ttl_seconds=3600,
+            max_entries=max_entries,
+        )
+
+    def test_results_survive_a_new_cache_instance(self) -> None:
+        self._cache().put("https://example.com/a", "https://cdn.example.com/a.jpg")
+        self._cache().put("https://example.com/b", None)
+
+        restarted = self._cache()
+
+        self.assertEqual(restarted.get("https://example.com/a"), (True, "https://cdn.example.com/a.jpg"))
+        self.assertEqual(restarted.get("https://example.com/b"), (True, None))
+        self.assertEqual(restarted.get("https://example.com/c"), (False, None))
+
+    def test_memory_hits_skip_mongo(self) -> None:
+        cache = self._cache()
+        cache.put("https://example.com/a", "https://cdn.example.com/a.jpg")
+
+        cache.get("https://example.com/a")
+        cache.get("https://example.com/a")
+
+        self.assertEqual(self.collection.find_count, 0)
+
+    def test_expired_mongo_results_are_ignored(self) -> None:
+        self.collection.docs["https://example.com/a"] = {
+            "_id": "https://example.com/a",
+            "media_image_url": "https://cdn.example.com/a.jpg",
+            "expires_at": datetime.now(timezone.utc) - timedelta(seconds=1),
+        }
+
+        self.assertEqual(self._cache().get("https://example.com/a"), (False, None))
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache = ArticleImageResultCache(None, ttl_seconds=3600, max_entries=2)
+        cache.put("https://example.com/a", None)
+        cache.put("https://example.com/b", None)
+        cache.get("https://example.com/a")
+        cache.put("https://example.com/c", None)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("https://example.com/b"), (False, None))
+        self.assertEqual(cache.get("https://example.com/a"), (True, None))
+
+    def test_mongo_errors_fall_back_to_memory(self) -> None:
+        cache = self._cache(_FailingResultsCollection())
+        cache.put("https://example.com/a", "https://cdn.example.com/a.jpg")
+
+        self.assertEqual(cache.get("https://example.com/a"), (True, "https://cdn.example.com/a.jpg"))
+        self.assertEqual(cache.get("https://example.com/b"), (False, None))
+
+    def test_zero_ttl_disables_cache(self) -> None:
+        cache = ArticleImageResultCache(cast(Collection, self.collection), ttl_seconds=0, max_entries=100)
+        cache.put("https://example.com/a", None)
+
+        self.assertEqual(cache.get("https://example.com/a"), (False, None))
+        self.assertEqual(self.collection.docs, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+import unittest
+
+from feeds.meta_image_scanner import MetaImageScanner, scan_meta_image_url
+
+
+PAGE_URL = "https://example.com/news/story"
+
+
+class MetaImageScannerTests(unittest.TestCase):
+    def test_og_image_outranks_earlier_twitter_image(self) -> None:
+        html = """
+        <head>
+          <meta name="twitter:image" content="https://cdn.example.com/twitter.jpg">
+          <meta property="og:image" content="https://cdn.example.com/og.jpg">
+        </head>
+        """
+
+        self.assertEqual(scan_meta_image_url([html], PAGE_URL), "https://cdn.example.com/og.jpg")
+
+    def test_twitter_image_is_used_without_og_image(self) -> None:
+        html = """
+        <head>
+          <meta itemprop="image" content="/itemprop.jpg">
+          <meta name="twitter:image:src" content="/twitter.jpg">
+        </head>
+        """
+
+        self.assertEqual(scan_meta_image_url([html], PAGE_URL), "https://example.com/twitter.jpg")
+
+    def test_stops_reading_chunks_after_first_og_image(self) -> None:
+        chunks_read: list[str] = []
+
+        def chunks() -> Iterator[str]:
+            for chunk in [
+                "<head><meta property='og:image' ",
+                "content='/og.jpg'><meta name='description' content='x'>",
+                "<meta name='twitter:image' content='/late.jpg'>",
+            ]:
+                chunks_read.append(chunk)
+                yield chunk
+
+        self.assertEqual(scan_meta_image_url(chunks(), PAGE_URL), "https://example.com/og.jpg")
+        self.assertEqual(len(chunks_read), 2)
+
+    def test_ignores_meta_tags_after_head_and_inside_scripts(self) -> None:
+        scanner = MetaImageScanner(PAGE_URL)
+        scanner.feed("<head><script>var t = '<meta property=\"og:image\" content=\"/script.jpg\">';</script>")
+        scanner.feed("</head><body><meta property='og:image' content='/body.jpg'>")
+        scanner.close()
+
+        self.assertTrue(scanner.done)
+        self.assertIsNone(scanner.image_url)
+
+    def test_unescapes_attribute_values(self) -> None:
+        html = "<meta property='og:image' content='https://cdn.example.com/a.jpg?w=1&amp;h=2'>"
+
+        self.assertEqual(
+            scan_meta_image_url([html], PAGE_URL),
+            "https://cdn.example.com/a.jpg?w=1&h=2",
+        )
+
+    def test_skips_rejected_og_image_for_next_candidate(self) -> None:
+        html = """
+        <meta property="og:image" content="http://127.0.0.1/internal.png">
+        <meta property="og:image:secure_url" content="https://cdn.example.com/ok.jpg">
+        """
+
+        self.assertEqual(scan_meta_image_url([html], PAGE_URL), "https://cdn.example.com/ok.jpg")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
+from typing import Any
 import unittest
 
 from feeds.feed_refresh_policy import (
     MIN_REFRESH_INTERVAL,
     resolve_source_refresh_interval,
     source_needs_fetch,
+    source_next_due_at,
 )
+from feeds.feeds import build_due_sources_query
 
 
 class SourceRefreshPolicyTests(unittest.TestCase):
@@ -131,6 +134,111 @@ class SourceRefreshPolicyTests(unittest.TestCase):
 
         self.assertFalse(source_needs_fetch(source_doc, self.now, self.fetch_interval))
 
+    def test_next_due_at_is_when_source_needs_fetch_turns_true(self) -> None:
+        source_docs = [
+            {"last_fetched_at": self.now - timedelta(minutes=1)},
+            {
+                "last_fetched_at": self.now - timedelta(minutes=1),
+                "next_refresh_at": self.now + timedelta(minutes=10),
+            },
+            {
+                "last_fetched_at": self.now - timedelta(minutes=1),
+                "next_refresh_at": self.now + timedelta(hours=1),
+            },
+            {
+                "last_fetched_at": self.now - timedelta(minutes=1),
+                "next_retry_at": self.now + timedelta(minutes=20),
+            },
+            {"next_refresh_at": self.now + timedelta(minutes=3)},
+        ]
+
+        for source_doc in source_docs:
+            due_at = source_next_due_at(source_doc, self.now, self.fetch_interval)
+            self.assertGreater(due_at, self.now)
+            self.assertFalse(
+                source_needs_fetch(source_doc, due_at - timedelta(seconds=1), self.fetch_interval),
+                source_doc,
+            )
+            self.assertTrue(source_needs_fetch(source_doc, due_at, self.fetch_interval), source_doc)
+
+    def test_next_due_at_is_now_for_due_and_force_refreshed_sources(self) -> None:
+        self.assertEqual(source_next_due_at({}, self.now, self.fetch_interval), self.now)
+        self.assertEqual(
+            source_next_due_at(
+                {
+                    "last_fetched_at": self.now - timedelta(seconds=30),
+                    "force_refresh_requested_at": self.now,
+                },
+                self.now,
+                self.fetch_interval,
+            ),
+            self.now,
+        )
+
+
+def _matches(doc: dict[str, Any], query: dict[str, Any]) -> bool:
+    """Evaluate the subset of Mongo query operators the due-source query uses."""
+
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(_matches(doc, clause) for clause in condition):
+                return False
+            continue
+
+        value = doc.get(key)
+        if isinstance(condition, dict):
+            if "$ne" in condition and value == condition["$ne"]:
+                return False
+            if "$lte" in condition and (value is None or value > condition["$lte"]):
+                return False
+        elif value != condition:
+            return False
+
+    return True
+
+
+class DueSourcesQueryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.lag = timedelta(minutes=2)
+        self.query = build_due_sources_query(self.now, self.lag)
+
+    def _is_candidate(self, source_doc: dict[str, Any]) -> bool:
+        return _matches(source_doc, self.query)
+
+    def test_due_sources_are_candidates(self) -> None:
+        due_sources = [
+            {},
+            {
+                "last_fetched_at": self.now - MIN_REFRESH_INTERVAL,
+                "next_refresh_at": self.now - timedelta(seconds=1),
+            },
+            {
+                "last_fetched_at": self.now - timedelta(seconds=30),
+                "force_refresh_requested_at": self.now,
+            },
+            {
+                "last_fetched_at": self.now - timedelta(hours=1),
+                "next_refresh_at": self.now + timedelta(hours=1),
+            },
+        ]
+
+        for source_doc in due_sources:
+            self.assertTrue(source_needs_fetch(source_doc, self.now, MIN_REFRESH_INTERVAL, self.lag))
+            self.assertTrue(self._is_candidate(source_doc), source_doc)
+
+    def test_scheduled_and_unsubscribed_sources_are_not_candidates(self) -> None:
+        self.assertFalse(
+            self._is_candidate(
+                {
+                    "last_fetched_at": self.now - timedelta(minutes=1),
+                    "next_refresh_at": self.now + timedelta(minutes=10),
+                }
+            )
+        )
+        self.assertFalse(self._is_candidate({"is_subscribed": False}))
+        self.assertTrue(self._is_candidate({"is_subscribed": True}))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, cast
+import unittest
+from unittest import mock
+
+from bson import ObjectId
+
+import feeds.feeds as feeds_module
+import feeds.unread_counters as unread_counters_module
+from feeds.feeds import Feeds, find_articles_with_unread_subscribers, iter_retention_batches
+from task_scheduler import TaskScheduler
+
+
+class _FakeStatesCollection:
+    def __init__(self, states: list[dict[str, Any]]) -> None:
+        self.states = states
+        self.pipelines: list[list[dict[str, Any]]] = []
+
+    def aggregate(self, pipeline: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        self.pipelines.append(pipeline)
+        match = pipeline[0]["$match"]
+        article_ids = match["article_id"]["$in"]
+
+        readers: dict[ObjectId, set[str]] = {}
+        for state in self.states:
+            if state["article_id"] in article_ids and state.get("is_read") is True:
+                readers.setdefault(state["article_id"], set()).add(state["user_id"])
+
+        return [{"_id": article_id, "readers": list(users)} for article_id, users in readers.items()]
+
+
+class _NullScheduler:
+    def schedule_task(self, *_args: Any, **_kwargs: Any) -> None:
+        return None
+
+
+class _FakeCursor:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self.docs = docs
+
+    def sort(self, field: str, _direction: int) -> _FakeCursor:
+        return _FakeCursor(sorted(self.docs, key=lambda doc: doc[field]))
+
+    def limit(self, count: int) -> _FakeCursor:
+        return _FakeCursor(self.docs[:count])
+
+    def __iter__(self):
+        return iter(self.docs)
+
+
+class _FakeArticlesCollection:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self.docs = docs
+        self.queries: list[dict[str, Any]] = []
+
+    def find(self, query: dict[str, Any], _projection: dict[str, int], **_kwargs: Any) -> _FakeCursor:
+        self.queries.append(query)
+        after = query.get("_id", {}).get("$gt")
+        return _FakeCursor(
+            [
+                dict(doc)
+                for doc in self.docs
+                if doc["is_deleted"] == query["is_deleted"]
+                and all(
+                    doc.get(field) <= query[field]["$lte"]
+                    for field in ("fetched_at", "deleted_at")
+                    if field in query
+                )
+                and (after is None or doc["_id"] > after)
+            ]
+        )
+
+    def update_many(self, query: dict[str, Any], update: dict[str, Any]) -> None:
+        for doc in self.docs:
+            if doc["_id"] in query["_id"]["$in"]:
+                doc.update(update["$set"])
+
+    def delete_many(self, query: dict[str, Any]) -> None:
+        self.docs = [doc for doc in self.docs if doc["_id"] not in query["_id"]["$in"]]
+
+
+class _NoSubscriptionsCollection:
+    def find(self, *_args: Any, **_kwargs: Any) -> list[dict[str, Any]]:
+        return []
+
+
+class RetentionBatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.feed_id = ObjectId()
+        self.unsubscribed_feed_id = ObjectId()
+        self.feed_user_map = {self.feed_id: {"alice", "bob"}}
+
+        self.read_by_all = ObjectId()
+        self.read_by_one = ObjectId()
+        self.unread = ObjectId()
+        self.orphaned = ObjectId()
+        self.articles = [
+            {"_id": self.read_by_all, "feed_id": self.feed_id},
+            {"_id": self.read_by_one, "feed_id": self.feed_id},
+            {"_id": self.unread, "feed_id": self.feed_id},
+            {"_id": self.orphaned, "feed_id": self.unsubscribed_feed_id},
+        ]
+
+        self.states = _FakeStatesCollection(
+            [
+                {"article_id": self.read_by_all, "user_id": "alice", "is_read": True},
+                {"article_id": self.read_by_all, "user_id": "bob", "is_read": True},
+                {"article_id": self.read_by_one, "user_id": "alice", "is_read": True},
+                {"article_id": self.read_by_one, "user_id": "bob", "is_read": False},
+                # Readers who have since unsubscribed do not count
+                {"article_id": self.unread, "user_id": "carol", "is_read": True},
+            ]
+        )
+        patcher = mock.patch.object(unread_counters_module, "USER_ARTICLE_STATES_COLLECTION", self.states)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_unread_articles_are_found_with_one_query(self) -> None:
+        unread_ids = find_articles_with_unread_subscribers(self.articles, self.feed_user_map)
+
+        self.assertEqual(unread_ids, {self.read_by_one, self.unread})
+        self.assertEqual(len(self.states.pipelines), 1)
+        self.assertNotIn(self.orphaned, self.states.pipelines[0][0]["$match"]["article_id"]["$in"])
+
+    def test_batches_split_removable_and_unread_articles(self) -> None:
+        batches = list(iter_retention_batches(iter(self.articles), self.feed_user_map, batch_size=3))
+
+        self.assertEqual(
+            [(batch.removable_ids, batch.skipped_unread, batch.last_id) for batch in batches],
+            [
+                ([self.read_by_all], 2, self.unread),
+                ([self.orphaned], 0, self.orphaned),
+            ],
+        )
+        self.assertEqual(len(self.states.pipelines), 1)
+
+
+class BudgetedRetentionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        old = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        self.feed_id = ObjectId()
+        self.articles = _FakeArticlesCollection(
+            [
+                {"_id": ObjectId(), "feed_id": self.feed_id, "is_deleted": False, "fetched_at": old}
+                for _ in range(5)
+            ]
+        )
+        for name, collection in (
+            ("FEED_ARTICLES_COLLECTION", self.articles),
+            ("USER_ARTICLE_STATES_COLLECTION", _FakeStatesCollection([])),
+            ("USER_FEED_SUBSCRIPTIONS_COLLECTION", _NoSubscriptionsCollection()),
+        ):
+            patcher = mock.patch.object(feeds_module, name, collection)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        for name, value in (
+            ("RETENTION_BATCH_SIZE", 2),
+            ("RETENTION_MAX_ARTICLES", 6),
+        ):
+            patcher = mock.patch.object(feeds_module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.worker = Feeds(cast(TaskScheduler, _NullScheduler()))
+
+    def test_backlog_is_drained_across_runs_from_a_checkpoint(self) -> None:
+        ids = sorted(doc["_id"] for doc in self.articles.docs)
+
+        self.worker._apply_retention()
+
+        deleted = [doc["_id"] for doc in self.articles.docs if doc["is_deleted"]]
+        self.assertEqual(sorted(deleted), ids[:3])
+        self.assertEqual(self.worker._retention_resume_after["soft"], ids[2])
+
+        self.worker._apply_retention()
+
+        self.assertTrue(all(doc["is_deleted"] for doc in self.articles.docs))
+        self.assertEqual(self.articles.queries[-2]["_id"], {"$gt": ids[2]})
+        self.assertNotIn("soft", self.worker._retention_resume_after)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from time import monotonic
+import unittest
+
+from feeds.scrape_host_queue import HostScrapeQueue
+
+
+class HostScrapeQueueTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ready_at_by_host: dict[str, float] = {}
+        self.queue: HostScrapeQueue[str] = HostScrapeQueue(
+            lambda host: self.ready_at_by_host.get(host, 0.0),
+            global_min_interval_seconds=0.0,
+        )
+
+    def test_ready_host_is_served_before_backed_off_host(self) -> None:
+        self.ready_at_by_host["slow.example.com"] = monotonic() + 3600
+        self.queue.push("slow.example.com", "slow-1")
+        self.queue.push("fast.example.com", "fast-1")
+
+        self.assertEqual(self.queue.take(), ("fast.example.com", "fast-1"))
+        self.assertEqual(len(self.queue), 1)
+
+    def test_host_jobs_run_in_order_one_at_a_time(self) -> None:
+        self.queue.push("a.example.com", "a-1")
+        self.queue.push("a.example.com", "a-2")
+        self.queue.push("b.example.com", "b-1")
+
+        self.assertEqual(self.queue.take(), ("a.example.com", "a-1"))
+        # a.example.com is in flight, so its next job waits for done()
+        self.assertEqual(self.queue.take(), ("b.example.com", "b-1"))
+
+        self.queue.done("a.example.com")
+        self.assertEqual(self.queue.take(), ("a.example.com", "a-2"))
+
+    def test_done_requeues_host_at_its_pace_limit(self) -> None:
+        self.queue.push("a.example.com", "a-1")
+        self.queue.push("a.example.com", "a-2")
+        self.queue.push("b.example.com", "b-1")
+
+        self.queue.take()
+        self.ready_at_by_host["a.example.com"] = monotonic() + 3600
+        self.queue.done("a.example.com")
+
+        self.assertEqual(self.queue.take(), ("b.example.com", "b-1"))
+
+    def test_global_interval_spaces_dispatches_across_hosts(self) -> None:
+        queue: HostScrapeQueue[str] = HostScrapeQueue(lambda _host: 0.0, global_min_interval_seconds=0.05)
+        queue.push("a.example.com", "a-1")
+        queue.push("b.example.com", "b-1")
+
+        queue.take()
+        started_at = monotonic()
+        queue.take()
+
+        self.assertGreaterEqual(monotonic() - started_at, 0.04)
+
+    def test_workers_are_claimed_up_to_pending_jobs_and_released_when_empty(self) -> None:
+        self.queue.push("a.example.com", "a-1")
+        self.queue.push("b.example.com", "b-1")
+
+        self.assertEqual(self.queue.claim_workers(4), 2)
+        self.assertEqual(self.queue.claim_workers(4), 0)
+
+        self.queue.take()
+        self.queue.take()
+        self.assertIsNone(self.queue.take())
+        # The other worker is still counted, so a new job does not start a third
+        self.queue.push("c.example.com", "c-1")
+        self.assertEqual(self.queue.claim_workers(4), 0)
+        self.assertEqual(self.queue.take(), ("c.example.com", "c-1"))
+        self.assertIsNone(self.queue.take())
+
+        self.queue.push("d.example.com", "d-1")
+        self.assertEqual(self.queue.claim_workers(4), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from time import monotonic
+from types import SimpleNamespace
+from typing import Any, cast
+import unittest
+from unittest import mock
+
+from bson import ObjectId
+from pymongo.collection import Collection
+from pymongo.operations import UpdateOne
+
+import feeds.feeds as feeds_module
+from feeds.feeds import Feeds
+from feeds.scrape_job_store import ScrapeJobStore
+from task_scheduler import TaskScheduler
+
+
+class _FakeJobsCollection:
+    """Implements just the queries ScrapeJobStore issues."""
+
+    def __init__(self) -> None:
+        self.docs: dict[str, dict[str, Any]] = {}
+
+    def find(self, query: dict[str, Any], _projection: dict[str, int] | None = None) -> list[dict[str, Any]]:
+        wanted = set(query["article_ids"]["$in"])
+        return [dict(doc) for doc in self.docs.values() if wanted.intersection(doc["article_ids"])]
+
+    def bulk_write(self, operations: list[UpdateOne], ordered: bool = True) -> None:
+        for operation in operations:
+            update = operation._doc
+            doc = self.docs.get(operation._filter["_id"])
+            if doc is None:
+                doc = {"_id": operation._filter["_id"], "article_ids": [], **update["$setOnInsert"]}
+                self.docs[doc["_id"]] = doc
+            for article_id in update["$addToSet"]["article_ids"]["$each"]:
+                if article_id not in doc["article_ids"]:
+                    doc["article_ids"].append(article_id)
+            doc["priority"] = max(doc.get("priority", update["$max"]["priority"]), update["$max"]["priority"])
+
+    def delete_many(self, query: dict[str, Any]) -> None:
+        for url, doc in list(self.docs.items()):
+            if doc["attempts"] >= query["attempts"]["$gte"] and doc["available_at"] <= query["available_at"]["$lte"]:
+                del self.docs[url]
+
+    def find_one_and_update(self, query: dict[str, Any], update: dict[str, Any], **_kwargs: Any) -> dict[str, Any] | None:
+        excluded_urls = query.get("_id", {}).get("$nin", [])
+        excluded_hosts = query.get("host", {}).get("$nin", [])
+        eligible = [
+            doc
+            for doc in self.docs.values()
+            if doc["available_at"] <= query["available_at"]["$lte"]
+            and doc["attempts"] < query["attempts"]["$lt"]
+            and doc["_id"] not in excluded_urls
+            and doc["host"] not in excluded_hosts
+        ]
+        if len(eligible) == 0:
+            return None
+
+        doc = min(eligible, key=lambda item: (-item["priority"], item["available_at"]))
+        doc.update(update["$set"])
+        doc["attempts"] += update["$inc"]["attempts"]
+        return dict(doc)
+
+    def find_one_and_delete(self, query: dict[str, Any], **_kwargs: Any) -> dict[str, Any] | None:
+        doc = self.docs.get(query["_id"])
+        if doc is None or doc["lease_owner"] != query["lease_owner"]:
+            return None
+        return self.docs.pop(query["_id"])
+
+    def update_one(self, query: dict[str, Any], update: dict[str, Any]) -> SimpleNamespace:
+        doc = self.docs.get(query["_id"])
+        if doc is None or doc["lease_owner"] != query["lease_owner"]:
+            return SimpleNamespace(matched_count=0)
+        doc.update(update["$set"])
+        return SimpleNamespace(matched_count=1)
+
+    def delete_one(self, query: dict[str, Any]) -> None:
+        doc = self.docs.get(query["_id"])
+        if doc is not None and doc["lease_owner"] == query["lease_owner"]:
+            del self.docs[query["_id"]]
+
+
+class ScrapeJobStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.collection = _FakeJobsCollection()
+
+    def _store(self, max_attempts: int = 3) -> ScrapeJobStore:
+        return ScrapeJobStore(
+            cast(Collection, self.collection),
+            lease_seconds=600,
+            max_attempts=max_attempts,
+            retry_base_seconds=60,
+        )
+
+    def test_enqueue_merges_jobs_by_url_and_article(self) -> None:
+        store = self._store()
+        first, second = ObjectId(), ObjectId()
+
+        store.enqueue({"https://example.com/a": [first]}, priority=0)
+        store.enqueue({"https://example.com/a": [second], "https://example.com/a?amp=1": [first]}, priority=1)
+
+        self.assertEqual(list(self.collection.docs), ["https://example.com/a"])
+        self.assertEqual(self.collection.docs["https://example.com/a"]["article_ids"], [first, second])
+        self.assertEqual(self.collection.docs["https://example.com/a"]["priority"], 1)
+
+    def test_lease_takes_highest_priority_first_and_hides_leased_jobs(self) -> None:
+        store = self._store()
+        store.enqueue({"https://example.com/low": [ObjectId()]}, priority=0)
+        store.enqueue({"https://example.com/high": [ObjectId()]}, priority=1)
+
+        self.assertEqual([job.article_url for job in store.lease(1)], ["https://example.com/high"])
+        self.assertEqual([job.article_url for job in store.lease(5)], ["https://example.com/low"])
+        self.assertEqual(store.lease(5), [])
+
+    def test_expired_lease_is_picked_up_after_restart(self) -> None:
+        self._store().enqueue({"https://example.com/a": [ObjectId()]}, priority=0)
+        self._store().lease(1)
+        self.collection.docs["https://example.com/a"]["available_at"] = datetime.now(timezone.utc) - timedelta(seconds=1)
+
+        leased = self._store().lease(1)
+
+        self.assertEqual([job.attempts for job in leased], [2])
+
+    def test_complete_returns_articles_merged_after_lease(self) -> None:
+        store = self._store()
+        first, second = ObjectId(), ObjectId()
+        store.enqueue({"https://example.com/a": [first]}, priority=0)
+        [job] = store.lease(1)
+        store.enqueue({"https://example.com/a": [second]}, priority=0)
+
+        self.assertEqual(store.complete(job), [first, second])
+        self.assertEqual(self.collection.docs, {})
+
+    def test_retry_backs_off_then_gives_up(self) -> None:
+        store = self._store(max_attempts=2)
+        store.enqueue({"https://example.com/a": [ObjectId()]}, priority=0)
+
+        [job] = store.lease(1)
+        self.assertTrue(store.retry(job))
+        doc = self.collection.docs["https://example.com/a"]
+        self.assertIsNone(doc["lease_owner"])
+        self.assertGreater(doc["available_at"], datetime.now(timezone.utc) + timedelta(seconds=30))
+
+        doc["available_at"] = datetime.now(timezone.utc)
+        [job] = store.lease(1)
+        self.assertFalse(store.retry(job))
+        self.assertEqual(self.collection.docs, {})
+
+    def test_held_jobs_are_not_leased_again_after_their_lease_runs_out(self) -> None:
+        store = self._store()
+        store.enqueue({"https://example.com/a": [ObjectId()]}, priority=0)
+        [job] = store.lease(1)
+        self.collection.docs["https://example.com/a"]["available_at"] = datetime.now(timezone.utc) - timedelta(seconds=1)
+
+        self.assertEqual(store.lease(5, held_urls={job.article_url}), [])
+        self.assertTrue(store.renew(job))
+        self.assertEqual(self.collection.docs["https://example.com/a"]["attempts"], 1)
+        self.assertGreater(
+            self.collection.docs["https://example.com/a"]["available_at"],
+            datetime.now(timezone.utc) + timedelta(seconds=300),
+        )
+
+    def test_renew_fails_once_another_process_leased_the_job(self) -> None:
+        store = self._store()
+        store.enqueue({"https://example.com/a": [ObjectId()]}, priority=0)
+        [job] = store.lease(1)
+        self.collection.docs["https://example.com/a"]["available_at"] = datetime.now(timezone.utc) - timedelta(seconds=1)
+        self._store().lease(1)
+
+        self.assertFalse(store.renew(job))
+
+    def test_lease_caps_jobs_per_host(self) -> None:
+        store = self._store()
+        store.enqueue({f"https://busy.example.com/{index}": [ObjectId()] for index in range(5)}, priority=1)
+        store.enqueue({"https://other.example.com/a": [ObjectId()]}, priority=0)
+
+        leased = store.lease(5, held_urls={"https://busy.example.com/held"}, max_per_host=2)
+
+        self.assertEqual(
+            sorted(job.article_url for job in leased),
+            ["https://busy.example.com/0", "https://other.example.com/a"],
+        )
+
+
+class ArticleImageScrapePrefetchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.collection = _FakeJobsCollection()
+        patcher = mock.patch.object(feeds_module, "ARTICLE_IMAGE_SCRAPE_JOBS_COLLECTION", self.collection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.worker = Feeds(TaskScheduler())
+        starter = mock.patch.object(self.worker, "_start_article_image_scrape_workers")
+        starter.start()
+        self.addCleanup(starter.stop)
+        self.store = cast(ScrapeJobStore, self.worker.article_image_scrape_store)
+
+    def test_backed_off_host_does_not_block_other_hosts(self) -> None:
+        self.store.enqueue(
+            {f"https://slow.example.com/{index}": [ObjectId()] for index in range(40)},
+            priority=1,
+        )
+        self.worker._fill_article_image_scrape_queue()
+        self.worker._article_image_scrape_host_backoff_until_monotonic["slow.example.com"] = monotonic() + 3600
+
+        self.store.enqueue({"https://fast.example.com/a": [ObjectId()]}, priority=0)
+        self.worker._fill_article_image_scrape_queue()
+
+        held_urls = self.worker._article_image_scrape_held_urls
+        self.assertIn("https://fast.example.com/a", held_urls)
+        self.assertEqual(
+            sum(1 for article_url in held_urls if article_url.startswith("https://slow.example.com/")),
+            feeds_module.ARTICLE_IMAGE_SCRAPE_PREFETCH_PER_HOST,
+        )
+
+    def test_job_taken_by_another_process_is_skipped(self) -> None:
+        self.store.enqueue({"https://example.com/a": [ObjectId()]}, priority=0)
+        self.worker._fill_article_image_scrape_queue()
+        self.collection.docs["https://example.com/a"]["lease_owner"] = "other-process"
+        self.worker._article_image_scrape_queue.claim_workers(1)
+
+        with mock.patch.object(self.worker, "_process_article_image_scrape_job") as process:
+            self.worker._run_article_image_scrape_worker()
+
+        process.assert_not_called()
+        self.assertEqual(self.worker._article_image_scrape_held_urls, set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, cast
+import unittest
+from unittest import mock
+
+from bson import ObjectId
+
+import feeds.feeds as feeds_module
+from feeds.feeds import Feeds
+from feeds.source_due_queue import SourceDueQueue
+from task_scheduler import TaskScheduler
+
+
+class _RecordingScheduler:
+    def __init__(self) -> None:
+        self.earlier_tasks: list[tuple[datetime, Any]] = []
+
+    def schedule_task(self, *_args: Any, **_kwargs: Any) -> None:
+        return None
+
+    def schedule_earlier_task(self, time: datetime, function: Any, *_args: Any, **_kwargs: Any) -> None:
+        self.earlier_tasks.append((time, function))
+
+
+class _FakeSourcesCollection:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self.docs = docs
+
+    def find(self, query: dict[str, Any], _projection: dict[str, int] | None = None) -> list[dict[str, Any]]:
+        source_ids = query.get("_id", {}).get("$in")
+        return [
+            dict(doc)
+            for doc in self.docs
+            if (source_ids is None or doc["_id"] in source_ids) and doc.get("is_subscribed") is not False
+        ]
+
+
+class SourceDueQueueTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.queue = SourceDueQueue()
+
+    def test_pops_due_sources_in_due_order(self) -> None:
+        first, second, later = ObjectId(), ObjectId(), ObjectId()
+        self.queue.update(second, self.now - timedelta(seconds=1))
+        self.queue.update(first, self.now - timedelta(seconds=5))
+        self.queue.update(later, self.now + timedelta(minutes=1))
+
+        self.assertEqual(self.queue.pop_due(self.now), [first, second])
+        self.assertEqual(self.queue.next_due_at(), self.now + timedelta(minutes=1))
+        self.assertEqual(len(self.queue), 1)
+
+    def test_update_replaces_previous_due_time(self) -> None:
+        source_id = ObjectId()
+        self.queue.update(source_id, self.now - timedelta(seconds=1))
+        self.queue.update(source_id, self.now + timedelta(minutes=5))
+
+        self.assertEqual(self.queue.pop_due(self.now), [])
+        self.assertEqual(self.queue.next_due_at(), self.now + timedelta(minutes=5))
+
+    def test_removed_source_is_not_returned(self) -> None:
+        source_id = ObjectId()
+        self.queue.update(source_id, self.now)
+        self.queue.remove(source_id)
+
+        self.assertEqual(self.queue.pop_due(self.now), [])
+        self.assertIsNone(self.queue.next_due_at())
+
+    def test_repeated_updates_keep_heap_bounded(self) -> None:
+        source_id = ObjectId()
+        for seconds in range(1_000):
+            self.queue.update(source_id, self.now + timedelta(seconds=seconds))
+
+        self.assertLess(len(self.queue._heap), 100)
+
+
+class DeadlineSchedulingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        now = datetime.now(timezone.utc)
+        self.due_source = {
+            "_id": ObjectId(),
+            "normalized_url": "https://example.com/due.xml",
+            "last_fetched_at": now - timedelta(hours=1),
+            "next_refresh_at": now - timedelta(seconds=1),
+        }
+        self.rescheduled_source = {
+            "_id": ObjectId(),
+            "normalized_url": "https://example.com/rescheduled.xml",
+            "last_fetched_at": now - timedelta(hours=1),
+            "next_refresh_at": now - timedelta(seconds=1),
+        }
+        self.future_source = {
+            "_id": ObjectId(),
+            "normalized_url": "https://example.com/future.xml",
+            "last_fetched_at": now,
+            "next_refresh_at": now + timedelta(minutes=12),
+        }
+        self.sources = _FakeSourcesCollection(
+            [self.due_source, self.rescheduled_source, self.future_source]
+        )
+        patcher = mock.patch.object(feeds_module, "FEED_SOURCES_COLLECTION", self.sources)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.scheduler = _RecordingScheduler()
+        self.worker = Feeds(cast(TaskScheduler, self.scheduler))
+        self.worker._update_due_queue(self.sources.docs)
+
+    def test_due_run_is_scheduled_for_the_earliest_source(self) -> None:
+        self.worker._schedule_due_run()
+
+        due_at, callback = self.scheduler.earlier_tasks[-1]
+        self.assertLessEqual(due_at, datetime.now(timezone.utc))
+        self.assertEqual(callback, self.worker.run_due_sources)
+
+    def test_take_due_sources_requeues_sources_rescheduled_elsewhere(self) -> None:
+        # Another writer pushed this source's schedule out after it was queued
+        self.rescheduled_source["last_fetched_at"] = datetime.now(timezone.utc)
+        self.rescheduled_source["next_refresh_at"] = datetime.now(timezone.utc) + timedelta(minutes=15)
+
+        due_sources = self.worker._take_due_sources()
+
+        self.assertEqual([source["_id"] for source in due_sources], [self.due_source["_id"]])
+        self.assertEqual(len(self.worker._due_queue), 2)
+        self.assertGreater(self.worker._due_queue.next_due_at(), datetime.now(timezone.utc))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from collections import Counter
+from threading import Lock
+from typing import Any, cast
+import time
+import unittest
+from unittest import mock
+
+from bson import ObjectId
+
+import feeds.feeds as feeds_module
+from feeds.feeds import Feeds, SourceFetchResult
+from task_scheduler import TaskScheduler
+
+
+class _NoopScheduler:
+    def schedule_task(self, *_args: Any, **_kwargs: Any) -> None:
+        return None
+
+
+def _source(url: str) -> dict[str, Any]:
+    return {"_id": ObjectId(), "normalized_url": url}
+
+
+class SourceFetchConcurrencyTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.worker = Feeds(cast(TaskScheduler, _NoopScheduler()))
+        self.lock = Lock()
+        self.in_flight: Counter[str] = Counter()
+        self.peak_by_host: Counter[str] = Counter()
+        self.peak_total = 0
+
+    def _fake_fetch(self, source_doc: dict[str, Any]) -> SourceFetchResult:
+        host = feeds_module.source_fetch_host(source_doc)
+        with self.lock:
+            self.in_flight[host] += 1
+            self.peak_by_host[host] = max(self.peak_by_host[host], self.in_flight[host])
+            self.peak_total = max(self.peak_total, sum(self.in_flight.values()))
+
+        time.sleep(0.05 if host == "slow.example.com" else 0.01)
+
+        with self.lock:
+            self.in_flight[host] -= 1
+        return SourceFetchResult(source_doc, source_doc["_id"], source_doc["normalized_url"])
+
+    def test_fetches_respect_global_and_per_host_caps_and_keep_source_order(self) -> None:
+        sources = [_source(f"https://slow.example.com/feed-{index}.xml") for index in range(6)]
+        sources += [_source(f"https://fast-{index}.example.com/feed.xml") for index in range(6)]
+
+        with (
+            mock.patch.object(feeds_module, "FETCH_CONCURRENCY", 4),
+            mock.patch.object(feeds_module, "FETCH_PER_HOST_CONCURRENCY", 2),
+            mock.patch.object(self.worker, "_fetch_source", side_effect=self._fake_fetch),
+        ):
+            results = list(self.worker._fetch_sources(sources))
+
+        self.assertEqual(
+            [result.source_id for result in results if result is not None],
+            [source["_id"] for source in sources],
+        )
+        self.assertEqual(self.peak_by_host["slow.example.com"], 2)
+        self.assertLessEqual(self.peak_total, 4)
+        self.assertGreater(self.peak_total, 2)
+
+    def test_unexpected_fetch_error_becomes_a_recorded_failure(self) -> None:
+        source = _source("https://broken.example.com/feed.xml")
+
+        with mock.patch.object(self.worker, "_fetch_source", side_effect=RuntimeError("boom")):
+            with self.assertLogs(level="ERROR"):
+                results = list(self.worker._fetch_sources([source]))
+
+        self.assertEqual(len(results), 1)
+        assert results[0] is not None
+        self.assertEqual(results[0].failure_reason, "Fetch error: boom")
+
+
+if __name__ == "__main__":
+    unittest.main()
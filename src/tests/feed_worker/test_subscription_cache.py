@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from threading import Event, Thread
+from typing import Any, Callable, cast
+import unittest
+from unittest import mock
+
+from bson import ObjectId
+from pymongo.collection import Collection
+
+import feeds.subscription_cache as subscription_cache_module
+from feeds.subscription_cache import SubscriptionCache
+
+
+class _FakeSubscriptionsCollection:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self.docs = docs
+        self.find_calls = 0
+        # Runs after the scan has read its snapshot, like a change landing mid-scan
+        self.during_scan: Callable[[], None] | None = None
+
+    def find(self, *_args: Any, **_kwargs: Any) -> list[dict[str, Any]]:
+        self.find_calls += 1
+        snapshot = [dict(doc) for doc in self.docs]
+        if self.during_scan is not None:
+            self.during_scan()
+        return snapshot
+
+
+class SubscriptionCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.feed_id = ObjectId()
+        self.alice_subscription = {"_id": ObjectId(), "feed_id": self.feed_id, "user_id": "alice"}
+        self.collection = _FakeSubscriptionsCollection([self.alice_subscription])
+        self.cache = SubscriptionCache(cast(Collection, self.collection), max_age_seconds=300)
+
+    def test_loads_once_and_serves_every_reader(self) -> None:
+        self.assertEqual(self.cache.feed_ids(), [self.feed_id])
+        self.assertEqual(self.cache.subscribers(self.feed_id), ["alice"])
+        self.assertEqual(self.cache.feed_user_map(), {self.feed_id: {"alice"}})
+
+        self.assertEqual(self.collection.find_calls, 1)
+
+    def test_changes_apply_without_rescanning(self) -> None:
+        bob_subscription = {"_id": ObjectId(), "feed_id": self.feed_id, "user_id": "bob"}
+
+        self.cache.feed_ids()
+        self.cache.add(bob_subscription)
+        self.assertEqual(sorted(self.cache.subscribers(self.feed_id)), ["alice", "bob"])
+
+        self.cache.remove(bob_subscription["_id"])
+        self.cache.remove(self.alice_subscription["_id"])
+
+        self.assertEqual(self.cache.feed_user_map(), {})
+        self.assertEqual(self.collection.find_calls, 1)
+
+    def test_reloads_once_stale(self) -> None:
+        with mock.patch.object(subscription_cache_module, "monotonic", return_value=1_000.0):
+            self.cache.feed_ids()
+        with mock.patch.object(subscription_cache_module, "monotonic", return_value=1_400.0):
+            self.cache.feed_ids()
+
+        self.assertEqual(self.collection.find_calls, 2)
+
+    def test_changes_during_a_reload_survive_the_swap(self) -> None:
+        bob_subscription = {"_id": ObjectId(), "feed_id": self.feed_id, "user_id": "bob"}
+
+        def change_subscriptions() -> None:
+            self.cache.add(bob_subscription)
+            self.cache.remove(self.alice_subscription["_id"])
+
+        self.collection.during_scan = change_subscriptions
+        self.cache.reload()
+
+        self.assertEqual(self.cache.subscribers(self.feed_id), ["bob"])
+
+    def test_concurrent_stale_readers_share_one_reload(self) -> None:
+        scan_started, release_scan = Event(), Event()
+
+        def block_scan() -> None:
+            scan_started.set()
+            release_scan.wait(2)
+
+        self.collection.during_scan = block_scan
+        readers = [Thread(target=self.cache.feed_ids) for _ in range(3)]
+        for reader in readers:
+            reader.start()
+        self.assertTrue(scan_started.wait(2))
+        release_scan.set()
+        for reader in readers:
+            reader.join(2)
+
+        self.assertEqual(self.collection.find_calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any, cast
+import unittest
+from unittest import mock
+
+from bson import ObjectId
+from pymongo.operations import DeleteOne, UpdateOne
+
+import feeds.feeds as feeds_module
+import feeds.unread_counters as unread_counters_module
+from feeds.feeds import Feeds
+from feeds.unread_counters import (
+    UNREAD_COUNTER_FIELD,
+    ReadStateChange,
+    reconcile_unread_counters,
+    record_read_state_changes,
+)
+from task_scheduler import TaskScheduler
+
+
+def _matches(doc: dict[str, Any], query: dict[str, Any]) -> bool:
+    for field, condition in query.items():
+        value = doc.get(field)
+        if isinstance(condition, dict):
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+            if "$nin" in condition and value in condition["$nin"]:
+                return False
+            if "$ne" in condition and value == condition["$ne"]:
+                return False
+            if "$gt" in condition and not (isinstance(value, int) and value > condition["$gt"]):
+                return False
+            if "$type" in condition and not isinstance(value, int):
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class _FakeCollection:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self.docs = docs
+
+    def find(self, query: dict[str, Any], _projection: dict[str, int] | None = None, **_kwargs: Any):
+        return [dict(doc) for doc in self.docs if _matches(doc, query)]
+
+    def update_many(self, query: dict[str, Any], update: dict[str, Any]) -> SimpleNamespace:
+        matched = [doc for doc in self.docs if _matches(doc, query)]
+        for doc in matched:
+            doc.update(update.get("$set", {}))
+            for field, delta in update.get("$inc", {}).items():
+                doc[field] = doc.get(field, 0) + delta
+        return SimpleNamespace(modified_count=len(matched))
+
+    def bulk_write(self, operations: list[UpdateOne | DeleteOne], ordered: bool = True) -> None:
+        for operation in operations:
+            if isinstance(operation, DeleteOne):
+                self.docs = [doc for doc in self.docs if not _matches(doc, operation._filter)]
+                continue
+            if not any(_matches(doc, operation._filter) for doc in self.docs) and operation._upsert:
+                self.docs.append({field: value for field, value in operation._filter.items()})
+            self.update_many(operation._filter, operation._doc)
+
+
+class _FakeStatesCollection(_FakeCollection):
+    def aggregate(self, pipeline: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        readers: dict[ObjectId, set[str]] = {}
+        for state in self.find(pipeline[0]["$match"]):
+            readers.setdefault(state["article_id"], set()).add(state["user_id"])
+        return [{"_id": article_id, "readers": list(users)} for article_id, users in readers.items()]
+
+
+class UnreadCounterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.feed_id = ObjectId()
+        self.other_feed_id = ObjectId()
+        self.read_article = ObjectId()
+        self.unread_article = ObjectId()
+        self.articles = _FakeCollection(
+            [
+                {"_id": self.read_article, "feed_id": self.feed_id, "is_deleted": False, UNREAD_COUNTER_FIELD: 2},
+                {"_id": self.unread_article, "feed_id": self.feed_id, "is_deleted": False},
+            ]
+        )
+        self.states = _FakeStatesCollection(
+            [
+                {"user_id": "alice", "article_id": self.read_article, "is_read": True},
+                {"user_id": "bob", "article_id": self.read_article, "is_read": True},
+            ]
+        )
+        self.subscriptions = _FakeCollection(
+            [
+                {"user_id": "alice", "feed_id": self.feed_id},
+                {"user_id": "bob", "feed_id": self.feed_id},
+            ]
+        )
+        self.counts = _FakeCollection(
+            [
+                {"_id": ObjectId(), "user_id": "alice", "feed_id": self.feed_id, "unread_count": 7},
+                {"_id": ObjectId(), "user_id": "alice", "feed_id": self.other_feed_id, "unread_count": 3},
+            ]
+        )
+        for name, collection in (
+            ("FEED_ARTICLES_COLLECTION", self.articles),
+            ("USER_ARTICLE_STATES_COLLECTION", self.states),
+            ("USER_FEED_SUBSCRIPTIONS_COLLECTION", self.subscriptions),
+            ("USER_FEED_UNREAD_COUNTS_COLLECTION", self.counts),
+        ):
+            patcher = mock.patch.object(unread_counters_module, name, collection)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _unread_counts(self) -> dict[tuple[str, ObjectId], int]:
+        return {(row["user_id"], row["feed_id"]): row["unread_count"] for row in self.counts.docs}
+
+    def test_reconcile_repairs_drifted_counters(self) -> None:
+        reconcile_unread_counters({self.feed_id: {"alice", "bob"}}, batch_size=10)
+
+        counters = {doc["_id"]: doc[UNREAD_COUNTER_FIELD] for doc in self.articles.docs}
+        self.assertEqual(counters, {self.read_article: 0, self.unread_article: 2})
+        self.assertEqual(
+            self._unread_counts(),
+            {("alice", self.feed_id): 1, ("bob", self.feed_id): 1},
+        )
+
+    def test_read_flips_by_subscribers_adjust_counters(self) -> None:
+        reconcile_unread_counters({self.feed_id: {"alice", "bob"}}, batch_size=10)
+
+        record_read_state_changes(
+            [
+                ReadStateChange("alice", self.unread_article, -1),
+                # Not subscribed to the feed, so the flip is ignored
+                ReadStateChange("carol", self.unread_article, -1),
+                # Already counted as read by everyone, so left for the reconcile
+                ReadStateChange("bob", self.read_article, -1),
+            ]
+        )
+
+        counters = {doc["_id"]: doc[UNREAD_COUNTER_FIELD] for doc in self.articles.docs}
+        self.assertEqual(counters, {self.read_article: 0, self.unread_article: 1})
+        self.assertEqual(
+            self._unread_counts(),
+            {("alice", self.feed_id): 0, ("bob", self.feed_id): 1},
+        )
+
+
+class UnreadReconcileScheduleTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.worker = Feeds(TaskScheduler())
+        for target, name, value in (
+            (feeds_module, "reconcile_unread_counters", mock.Mock()),
+            (self.worker, "_feed_collections_configured", mock.Mock(return_value=True)),
+            (self.worker.subscription_cache, "feed_user_map", mock.Mock(return_value={})),
+        ):
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.reconcile = cast(mock.Mock, feeds_module.reconcile_unread_counters)
+
+    def test_every_run_reconciles_without_a_change_stream(self) -> None:
+        self.worker.run_unread_reconcile()
+        self.worker.run_unread_reconcile()
+
+        self.assertEqual(self.reconcile.call_count, 2)
+
+    def test_streamed_read_flips_limit_reconciles_to_the_long_interval(self) -> None:
+        self.worker.change_watcher = cast(Any, SimpleNamespace(polling=False))
+        self.worker.run_unread_reconcile()
+        self.worker.run_unread_reconcile()
+
+        self.assertEqual(self.reconcile.call_count, 1)
+
+        # Falling back to polling means flips are no longer applied as they happen
+        self.worker.change_watcher = cast(Any, SimpleNamespace(polling=True))
+        self.worker.run_unread_reconcile()
+
+        self.assertEqual(self.reconcile.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""Tests for the asyncio football-data.org request helper."""
+
+from __future__ import annotations
+
+from typing import Any, cast
+import unittest
+from unittest import mock
+
+import aiohttp
+
+import utils.network_utils as network_utils
+
+
+class _FakeResponse:
+    def __init__(self, status: int, body: bytes = b"") -> None:
+        self.status = status
+        self.headers: dict[str, str] = {}
+        self._body = body
+
+    async def __aenter__(self) -> "_FakeResponse":
+        return self
+
+    async def __aexit__(self, *_args: Any) -> None:
+        return None
+
+    async def read(self) -> bytes:
+        return self._body
+
+
+class _FakeSession:
+    """Raises or returns the queued outcomes in order, one per GET."""
+
+    def __init__(self, outcomes: list[Any]) -> None:
+        self.outcomes = outcomes
+        self.get_calls = 0
+
+    def get(self, _url: str, **_kwargs: Any) -> _FakeResponse:
+        self.get_calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+class GetRequestAsyncTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.object(network_utils, "ASYNC_REQUEST_BACKOFF_SECONDS", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def _get(self, session: _FakeSession) -> bytes | None:
+        return await network_utils.get_request_async(
+            "https://example.com/matches", cast(aiohttp.ClientSession, session)
+        )
+
+    async def test_transient_errors_are_retried(self) -> None:
+        session = _FakeSession(
+            [
+                aiohttp.ClientConnectionError("reset"),
+                TimeoutError(),
+                _FakeResponse(200, b"{}"),
+            ]
+        )
+
+        self.assertEqual(await self._get(session), b"{}")
+        self.assertEqual(session.get_calls, 3)
+
+    async def test_retries_are_bounded(self) -> None:
+        session = _FakeSession([aiohttp.ClientConnectionError("down")] * 5)
+
+        with self.assertLogs(level="ERROR"):
+            self.assertIsNone(await self._get(session))
+        self.assertEqual(session.get_calls, network_utils.ASYNC_REQUEST_MAX_RETRIES + 1)
+
+    async def test_error_statuses_are_not_retried(self) -> None:
+        session = _FakeSession([_FakeResponse(503), _FakeResponse(200, b"{}")])
+
+        with self.assertLogs(level="ERROR"):
+            self.assertIsNone(await self._get(session))
+        self.assertEqual(session.get_calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
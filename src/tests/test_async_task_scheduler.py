@@ -0,0 +1,191 @@
+import asyncio
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from task_scheduler.async_task_scheduler import (
+    AsyncTaskScheduler,
+    resolve_async_callable,
+)
+from task_scheduler.task_queue import TaskPolicy
+
+
+class _Worker:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def poll(self) -> None:
+        self.calls.append("sync")
+
+    async def poll_async(self) -> None:
+        self.calls.append("async")
+
+    def refresh(self) -> None:
+        self.calls.append("sync")
+
+
+class TestResolveAsyncCallable(unittest.TestCase):
+    def test_prefers_async_sibling_of_bound_method(self) -> None:
+        worker = _Worker()
+        self.assertEqual(resolve_async_callable(worker.poll), worker.poll_async)
+
+    def test_sync_method_without_sibling_is_not_resolved(self) -> None:
+        self.assertIsNone(resolve_async_callable(_Worker().refresh))
+
+    def test_coroutine_function_is_used_directly(self) -> None:
+        async def poll() -> None:
+            pass
+
+        self.assertIs(resolve_async_callable(poll), poll)
+
+
+class TestAsyncTaskScheduler(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.scheduler = AsyncTaskScheduler()
+        self.terminate_event = threading.Event()
+        self.run_task = asyncio.create_task(self.scheduler.run(self.terminate_event))
+        # Let the run loop bind to the event loop before tasks are scheduled
+        await asyncio.sleep(0)
+
+    async def asyncTearDown(self) -> None:
+        self.terminate_event.set()
+        self.scheduler.wake()
+        await asyncio.wait_for(self.run_task, 2)
+
+    async def test_coroutine_tasks_overlap(self) -> None:
+        finished: list[float] = []
+
+        def make_request():
+            async def request() -> None:
+                await asyncio.sleep(0.2)
+                finished.append(time.monotonic())
+
+            return request
+
+        started_at = time.monotonic()
+        now = datetime.now(timezone.utc)
+        for _ in range(20):
+            # Each closure is a distinct callback, so none is treated as an overrun
+            self.scheduler.schedule_task(now, make_request())
+        await asyncio.sleep(0.5)
+
+        self.assertEqual(len(finished), 20)
+        self.assertLess(max(finished) - started_at, 0.45)
+
+    async def test_bound_method_runs_async_sibling(self) -> None:
+        worker = _Worker()
+        self.scheduler.schedule_task(datetime.now(timezone.utc), worker.poll)
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(worker.calls, ["async"])
+
+    async def test_sync_callback_runs_off_the_event_loop(self) -> None:
+        threads: list[threading.Thread] = []
+        self.scheduler.schedule_task(
+            datetime.now(timezone.utc), lambda: threads.append(threading.current_thread())
+        )
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    async def test_schedule_from_another_thread_wakes_loop(self) -> None:
+        ran = asyncio.Event()
+
+        async def callback() -> None:
+            ran.set()
+
+        scheduled_at = time.monotonic()
+        thread = threading.Thread(
+            target=self.scheduler.schedule_task,
+            args=(datetime.now(timezone.utc), callback),
+        )
+        thread.start()
+        thread.join()
+
+        await asyncio.wait_for(ran.wait(), 0.5)
+        self.assertLess(time.monotonic() - scheduled_at, 0.5)
+
+    async def test_coroutine_exceeding_timeout_is_cancelled(self) -> None:
+        cancelled = asyncio.Event()
+
+        async def hang() -> None:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with self.assertLogs(level="WARNING") as logs:
+            self.scheduler.schedule_task(
+                datetime.now(timezone.utc),
+                hang,
+                policy=TaskPolicy(timeout=timedelta(milliseconds=50)),
+            )
+            await asyncio.wait_for(cancelled.wait(), 1)
+            await asyncio.sleep(0)
+
+        self.assertTrue(any("timeout" in message for message in logs.output))
+
+    async def test_timeout_raised_by_a_task_is_reported_as_a_failure(self) -> None:
+        finished = threading.Event()
+
+        def call_with_own_timeout() -> None:
+            finished.set()
+            raise TimeoutError("upstream request timed out")
+
+        with self.assertLogs(level="WARNING") as logs:
+            self.scheduler.schedule_task(
+                datetime.now(timezone.utc),
+                call_with_own_timeout,
+                policy=TaskPolicy(timeout=timedelta(seconds=5)),
+            )
+            await asyncio.to_thread(finished.wait, 1)
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+
+        self.assertTrue(any("raised an exception" in message for message in logs.output))
+        self.assertFalse(any("cancelled after exceeding" in message for message in logs.output))
+
+    async def test_one_shot_overrun_is_deferred_until_running_task_finishes(self) -> None:
+        calls: list[str] = []
+        release = asyncio.Event()
+        second_run = asyncio.Event()
+
+        async def poll() -> None:
+            calls.append("run")
+            if len(calls) == 1:
+                await release.wait()
+            else:
+                second_run.set()
+
+        self.scheduler.schedule_task(datetime.now(timezone.utc), poll)
+        await asyncio.sleep(0.05)
+        self.scheduler.schedule_task(datetime.now(timezone.utc), poll)
+        await asyncio.sleep(0.05)
+        self.assertEqual(len(calls), 1)
+
+        release.set()
+        await asyncio.wait_for(second_run.wait(), 1)
+        self.assertEqual(len(calls), 2)
+
+    async def test_task_exception_is_logged_and_loop_continues(self) -> None:
+        ran = asyncio.Event()
+
+        async def failing() -> None:
+            raise RuntimeError("boom")
+
+        async def after() -> None:
+            ran.set()
+
+        with self.assertLogs(level="ERROR"):
+            self.scheduler.schedule_task(datetime.now(timezone.utc), failing)
+            await asyncio.sleep(0.05)
+
+        self.scheduler.schedule_task(datetime.now(timezone.utc), after)
+        await asyncio.wait_for(ran.wait(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,21 @@
+import threading
+import time
 import unittest
 from datetime import datetime, timedelta, timezone
 
-from task_scheduler.task_scheduler import TaskScheduler
+from task_scheduler.task_queue import (
+    MisfirePolicy,
+    Task,
+    jitter_offset,
+    make_task,
+    next_periodic_task,
+)
+from task_scheduler.task_scheduler import (
+    OverrunPolicy,
+    TaskPolicy,
+    TaskPriority,
+    TaskScheduler,
+)
 
 
 def _task_callback() -> None:
@@ -61,6 +75,77 @@ class TestScheduleEarlierTask(unittest.TestCase):
         self.scheduler.schedule_earlier_task(when, _other_task_callback)
         self.assertEqual(len(self.scheduler.task_list), 2)
 
+    def test_keep_periodic_leaves_the_next_periodic_slot_pending(self) -> None:
+        queue = self.scheduler._queue
+        queue.push(make_task(self.now + timedelta(hours=1), _task_callback, timedelta(hours=1)))
+        queue.push(make_task(self.now + timedelta(hours=2), _task_callback))
+
+        self.assertTrue(
+            queue.schedule_earlier(make_task(self.now, _task_callback), keep_periodic=True)
+        )
+
+        # The later one-shot run is replaced; the periodic slot stays queued
+        self.assertEqual(
+            [task.interval for task in self.scheduler.task_list],
+            [None, timedelta(hours=1)],
+        )
+
+
+class TestCancelTask(unittest.TestCase):
+    def setUp(self) -> None:
+        self.scheduler = TaskScheduler()
+        self.now = datetime.now(timezone.utc)
+
+    def test_cancel_removes_pending_task(self) -> None:
+        self.scheduler.schedule_task(self.now + timedelta(hours=1), _task_callback)
+        self.scheduler.schedule_task(self.now + timedelta(hours=1), _other_task_callback)
+
+        self.assertTrue(self.scheduler.cancel_task(_task_callback))
+        self.assertEqual(len(self.scheduler.task_list), 1)
+        self.assertIs(self.scheduler.task_list[0].function, _other_task_callback)
+
+    def test_cancel_unknown_callback_returns_false(self) -> None:
+        self.assertFalse(self.scheduler.cancel_task(_task_callback))
+
+    def test_cancelled_task_is_not_run(self) -> None:
+        self.scheduler.schedule_task(self.now - timedelta(seconds=1), _task_callback)
+        self.scheduler.cancel_task(_task_callback)
+        self.assertEqual(self.scheduler.get_runnable_tasks(), [])
+        self.assertIsNone(self.scheduler.seconds_until_next_task())
+
+    def test_cancel_stops_periodic_requeue(self) -> None:
+        self.scheduler.schedule_task(
+            self.now - timedelta(seconds=1), _task_callback, timedelta(hours=1)
+        )
+        self.assertEqual(len(self.scheduler.get_runnable_tasks()), 1)
+        self.assertTrue(self.scheduler.cancel_task(_task_callback))
+        self.assertEqual(self.scheduler.task_list, [])
+
+    def test_repeated_replacement_keeps_heap_bounded(self) -> None:
+        for seconds in range(10_000, 0, -1):
+            self.scheduler.schedule_earlier_task(
+                self.now + timedelta(seconds=seconds), _task_callback
+            )
+
+        self.assertEqual(len(self.scheduler.task_list), 1)
+        self.assertLess(len(self.scheduler._queue._heap), 200)
+
+    def test_separate_bound_method_accesses_match(self) -> None:
+        class Worker:
+            def poll(self) -> None:
+                pass
+
+        worker = Worker()
+        self.scheduler.schedule_earlier_task(self.now + timedelta(hours=3), worker.poll)
+        self.scheduler.schedule_earlier_task(self.now + timedelta(hours=2), worker.poll)
+        self.scheduler.schedule_earlier_task(self.now + timedelta(hours=1), worker.poll)
+        self.scheduler.schedule_earlier_task(self.now + timedelta(hours=1), Worker().poll)
+
+        # Equal bound methods replace each other; another instance's does not
+        self.assertEqual(len(self.scheduler.task_list), 2)
+        self.assertTrue(self.scheduler.cancel_task(worker.poll))
+        self.assertEqual(len(self.scheduler.task_list), 1)
+
 
 class TestPeriodicRequeue(unittest.TestCase):
     def test_periodic_task_requeues_after_run(self) -> None:
@@ -73,8 +158,6 @@ class TestPeriodicRequeue(unittest.TestCase):
         start = datetime.now(timezone.utc) - timedelta(seconds=1)
         scheduler.schedule_task(start, periodic, timedelta(milliseconds=50))
 
-        import time
-
         for _ in range(3):
             for task in scheduler.get_runnable_tasks():
                 task.function()
@@ -86,5 +169,570 @@ class TestPeriodicRequeue(unittest.TestCase):
         self.assertIsNotNone(scheduler.task_list[0].interval)
 
 
+class TestMisfirePolicy(unittest.TestCase):
+    def setUp(self) -> None:
+        # Far enough ahead that follow-up times are not clamped to the real clock
+        self.slot = datetime.now(timezone.utc) + timedelta(days=1)
+        self.interval = timedelta(minutes=1)
+        # The scheduler stalled for 3.5 intervals past the popped slot
+        self.now = self.slot + timedelta(minutes=3, seconds=30)
+
+    def _task(self, misfire: MisfirePolicy, catch_up_runs: int = 0) -> Task:
+        return Task(
+            self.slot,
+            _task_callback,
+            self.interval,
+            TaskPolicy(misfire=misfire, max_catch_up=2),
+            slot=self.slot,
+            catch_up_runs=catch_up_runs,
+        )
+
+    def test_on_time_run_keeps_alignment(self) -> None:
+        task = self._task(MisfirePolicy.SKIP)
+        next_task, missed_slots, runnable = next_periodic_task(
+            task, self.slot + timedelta(seconds=5)
+        )
+
+        self.assertTrue(runnable)
+        self.assertEqual(missed_slots, 0)
+        self.assertEqual(next_task.time, self.slot + self.interval)
+
+    def test_coalesce_runs_once_then_resumes_on_next_aligned_slot(self) -> None:
+        next_task, missed_slots, runnable = next_periodic_task(
+            self._task(MisfirePolicy.COALESCE), self.now
+        )
+
+        self.assertTrue(runnable)
+        self.assertEqual(missed_slots, 3)
+        self.assertEqual(next_task.time, self.slot + 4 * self.interval)
+
+    def test_skip_drops_late_run_and_waits_for_next_aligned_slot(self) -> None:
+        next_task, missed_slots, runnable = next_periodic_task(
+            self._task(MisfirePolicy.SKIP), self.now
+        )
+
+        self.assertFalse(runnable)
+        self.assertEqual(missed_slots, 4)
+        self.assertEqual(next_task.time, self.slot + 4 * self.interval)
+
+    def test_catch_up_runs_missed_slots_back_to_back_up_to_cap(self) -> None:
+        next_task, missed_slots, runnable = next_periodic_task(
+            self._task(MisfirePolicy.CATCH_UP), self.now
+        )
+
+        self.assertTrue(runnable)
+        self.assertEqual(missed_slots, 0)
+        self.assertEqual(next_task.time, self.now)
+        self.assertEqual(next_task.slot, self.slot + self.interval)
+        self.assertEqual(next_task.catch_up_runs, 1)
+
+        capped_task, missed_slots, runnable = next_periodic_task(
+            self._task(MisfirePolicy.CATCH_UP, catch_up_runs=2), self.now
+        )
+        self.assertTrue(runnable)
+        self.assertEqual(missed_slots, 3)
+        self.assertEqual(capped_task.time, self.slot + 4 * self.interval)
+        self.assertEqual(capped_task.catch_up_runs, 0)
+
+    def test_skipped_run_is_not_returned_as_runnable(self) -> None:
+        scheduler = TaskScheduler()
+        scheduler.schedule_task(
+            datetime.now(timezone.utc),
+            _task_callback,
+            timedelta(milliseconds=10),
+            policy=TaskPolicy(misfire=MisfirePolicy.SKIP),
+        )
+        time.sleep(0.05)
+
+        self.assertEqual(scheduler.get_runnable_tasks(), [])
+        self.assertEqual(len(scheduler.task_list), 1)
+        self.assertGreaterEqual(
+            scheduler.metrics_snapshot()[_task_callback.__qualname__].missed_slots, 4
+        )
+
+
+class TestJitter(unittest.TestCase):
+    def test_jitter_is_deterministic_and_bounded(self) -> None:
+        policy = TaskPolicy(jitter=timedelta(seconds=5))
+        now = datetime.now(timezone.utc) + timedelta(hours=1)
+
+        first = make_task(now, _task_callback, timedelta(minutes=1), policy)
+        second = make_task(now, _task_callback, timedelta(minutes=1), policy)
+
+        self.assertEqual(first.time, second.time)
+        self.assertEqual(first.slot, now)
+        self.assertGreaterEqual(first.time - now, timedelta(0))
+        self.assertLessEqual(first.time - now, timedelta(seconds=5))
+
+    def test_callbacks_get_different_offsets(self) -> None:
+        policy = TaskPolicy(jitter=timedelta(seconds=5))
+        interval = timedelta(minutes=1)
+        now = datetime.now(timezone.utc)
+
+        self.assertNotEqual(
+            jitter_offset(make_task(now, _task_callback, interval, policy)),
+            jitter_offset(make_task(now, _other_task_callback, interval, policy)),
+        )
+
+    def test_one_shot_tasks_are_not_jittered(self) -> None:
+        now = datetime.now(timezone.utc) + timedelta(hours=1)
+        task = make_task(now, _task_callback, policy=TaskPolicy(jitter=timedelta(seconds=5)))
+
+        self.assertEqual(task.time, now)
+
+    def test_follow_up_keeps_offset_from_aligned_slot(self) -> None:
+        policy = TaskPolicy(jitter=timedelta(seconds=5))
+        interval = timedelta(minutes=1)
+        task = make_task(
+            datetime.now(timezone.utc) + timedelta(hours=1), _task_callback, interval, policy
+        )
+        offset = task.time - task.slot
+
+        next_task, _, _ = next_periodic_task(task, task.time)
+
+        self.assertEqual(next_task.slot, task.slot + interval)
+        self.assertEqual(next_task.time - next_task.slot, offset)
+
+
+class TestHeapOrdering(unittest.TestCase):
+    def test_runnable_tasks_returned_in_due_order(self) -> None:
+        scheduler = TaskScheduler()
+        now = datetime.now(timezone.utc)
+        order: list[str] = []
+
+        def first() -> None:
+            order.append("first")
+
+        def second() -> None:
+            order.append("second")
+
+        def later() -> None:
+            order.append("later")
+
+        scheduler.schedule_task(now + timedelta(hours=1), later)
+        scheduler.schedule_task(now + timedelta(milliseconds=20), second)
+        scheduler.schedule_task(now + timedelta(milliseconds=10), first)
+
+        time.sleep(0.03)
+        for task in scheduler.get_runnable_tasks():
+            task.function()
+
+        self.assertEqual(order, ["first", "second"])
+        self.assertEqual(len(scheduler.task_list), 1)
+        self.assertIs(scheduler.task_list[0].function, later)
+
+    def test_seconds_until_next_task(self) -> None:
+        scheduler = TaskScheduler()
+        self.assertIsNone(scheduler.seconds_until_next_task())
+
+        scheduler.schedule_task(
+            datetime.now(timezone.utc) + timedelta(seconds=30), _task_callback
+        )
+        wait_seconds = scheduler.seconds_until_next_task()
+        self.assertIsNotNone(wait_seconds)
+        assert wait_seconds is not None
+        self.assertGreater(wait_seconds, 29)
+        self.assertLessEqual(wait_seconds, 30)
+
+
+class TestEventDrivenRun(unittest.TestCase):
+    def test_new_task_wakes_idle_loop(self) -> None:
+        scheduler = TaskScheduler()
+        terminate_event = threading.Event()
+        ran = threading.Event()
+
+        # A distant task means the loop would otherwise sleep for its full idle wait
+        scheduler.schedule_task(
+            datetime.now(timezone.utc) + timedelta(hours=1), _task_callback
+        )
+
+        thread = threading.Thread(target=scheduler.run, args=(terminate_event,))
+        thread.start()
+        try:
+            time.sleep(0.05)
+            scheduled_at = time.monotonic()
+            scheduler.schedule_task(datetime.now(timezone.utc), ran.set)
+            self.assertTrue(ran.wait(0.5))
+            self.assertLess(time.monotonic() - scheduled_at, 0.5)
+        finally:
+            terminate_event.set()
+            thread.join(2)
+
+        self.assertFalse(thread.is_alive())
+
+
+class TestExecutorMode(unittest.TestCase):
+    def setUp(self) -> None:
+        self.scheduler = TaskScheduler(max_workers=2)
+        self.terminate_event = threading.Event()
+        self.thread = threading.Thread(
+            target=self.scheduler.run, args=(self.terminate_event,)
+        )
+        self.release = threading.Event()
+
+    def tearDown(self) -> None:
+        self.release.set()
+        self.terminate_event.set()
+        if self.thread.is_alive():
+            self.thread.join(2)
+
+    def _blocking_task(self) -> None:
+        self.release.wait(2)
+
+    def test_long_task_does_not_block_dispatch(self) -> None:
+        quick_ran = threading.Event()
+        now = datetime.now(timezone.utc)
+        self.scheduler.schedule_task(now, self._blocking_task)
+        self.scheduler.schedule_task(now + timedelta(milliseconds=20), quick_ran.set)
+
+        self.thread.start()
+        self.assertTrue(quick_ran.wait(0.5))
+        self.assertEqual(self.scheduler.running_task_count(), 1)
+
+    def test_periodic_overrun_is_skipped(self) -> None:
+        calls: list[int] = []
+
+        def slow_periodic() -> None:
+            calls.append(1)
+            self.release.wait(2)
+
+        self.scheduler.schedule_task(
+            datetime.now(timezone.utc), slow_periodic, timedelta(milliseconds=20)
+        )
+        self.thread.start()
+        time.sleep(0.2)
+
+        self.assertEqual(len(calls), 1)
+
+    def test_one_shot_overrun_is_deferred_until_running_task_finishes(self) -> None:
+        calls: list[str] = []
+        finished = threading.Event()
+
+        def poll() -> None:
+            calls.append("poll")
+            if len(calls) == 1:
+                self.release.wait(2)
+            else:
+                finished.set()
+
+        policy = TaskPolicy(concurrency_key="poll")
+        now = datetime.now(timezone.utc)
+        self.scheduler.schedule_task(now, poll, policy=policy)
+        self.scheduler.schedule_task(now + timedelta(milliseconds=20), poll, policy=policy)
+        self.scheduler.schedule_task(now + timedelta(milliseconds=30), poll, policy=policy)
+
+        self.thread.start()
+        time.sleep(0.1)
+        self.assertEqual(calls, ["poll"])
+
+        self.release.set()
+        self.assertTrue(finished.wait(1))
+        time.sleep(0.05)
+
+        # The two overruns are coalesced into a single follow-up run
+        self.assertEqual(calls, ["poll", "poll"])
+
+    def test_bound_method_overruns_are_coalesced(self) -> None:
+        test = self
+        finished = threading.Event()
+
+        class Worker:
+            def __init__(self) -> None:
+                self.calls = 0
+
+            def poll(self) -> None:
+                self.calls += 1
+                if self.calls == 1:
+                    test.release.wait(2)
+                else:
+                    finished.set()
+
+        worker = Worker()
+        policy = TaskPolicy(concurrency_key="poll")
+        now = datetime.now(timezone.utc)
+        self.scheduler.schedule_task(now, worker.poll, policy=policy)
+        self.scheduler.schedule_task(now + timedelta(milliseconds=20), worker.poll, policy=policy)
+        self.scheduler.schedule_task(now + timedelta(milliseconds=30), worker.poll, policy=policy)
+
+        self.thread.start()
+        time.sleep(0.1)
+        self.release.set()
+        self.assertTrue(finished.wait(1))
+        time.sleep(0.05)
+
+        self.assertEqual(worker.calls, 2)
+
+    def test_deferred_run_replaces_a_later_pending_run(self) -> None:
+        calls: list[int] = []
+
+        def poll() -> None:
+            calls.append(1)
+            if len(calls) == 1:
+                self.release.wait(2)
+
+        policy = TaskPolicy(concurrency_key="poll")
+        now = datetime.now(timezone.utc)
+        self.scheduler.schedule_task(now, poll, policy=policy)
+        self.scheduler.schedule_task(now + timedelta(milliseconds=20), poll, policy=policy)
+        self.scheduler.schedule_task(now + timedelta(milliseconds=300), poll, policy=policy)
+
+        self.thread.start()
+        time.sleep(0.1)
+        self.release.set()
+        time.sleep(0.4)
+
+        # The deferred run stands in for the later one-shot run
+        self.assertEqual(len(calls), 2)
+
+    def test_explicit_skip_policy_drops_one_shot_overrun(self) -> None:
+        calls: list[int] = []
+
+        def poll() -> None:
+            calls.append(1)
+            self.release.wait(2)
+
+        policy = TaskPolicy(overrun=OverrunPolicy.SKIP, concurrency_key="poll")
+        now = datetime.now(timezone.utc)
+        self.scheduler.schedule_task(now, poll, policy=policy)
+        self.scheduler.schedule_task(now + timedelta(milliseconds=20), poll, policy=policy)
+
+        self.thread.start()
+        time.sleep(0.1)
+        self.release.set()
+        time.sleep(0.1)
+
+        self.assertEqual(len(calls), 1)
+
+    def test_timeout_is_reported_while_task_runs(self) -> None:
+        self.scheduler.schedule_task(
+            datetime.now(timezone.utc),
+            self._blocking_task,
+            policy=TaskPolicy(timeout=timedelta(milliseconds=50)),
+        )
+
+        with self.assertLogs(level="WARNING") as captured:
+            self.thread.start()
+            time.sleep(0.2)
+
+        self.assertTrue(any("exceeded" in line for line in captured.output))
+
+    def test_task_exception_is_logged_and_loop_continues(self) -> None:
+        ran = threading.Event()
+
+        def failing() -> None:
+            raise RuntimeError("boom")
+
+        now = datetime.now(timezone.utc)
+        self.scheduler.schedule_task(now, failing)
+        self.scheduler.schedule_task(now + timedelta(milliseconds=20), ran.set)
+
+        with self.assertLogs(level="ERROR"):
+            self.thread.start()
+            self.assertTrue(ran.wait(0.5))
+
+
+class TestSharedScheduler(unittest.TestCase):
+    def test_workload_applies_priority_and_default_policy(self) -> None:
+        scheduler = TaskScheduler()
+        policy = TaskPolicy(concurrency_key="football")
+        football = scheduler.workload("football", TaskPriority.HIGH, policy)
+
+        football.schedule_task(datetime.now(timezone.utc), _task_callback)
+
+        task = scheduler.task_list[0]
+        self.assertEqual(task.priority, TaskPriority.HIGH)
+        self.assertIs(task.policy, policy)
+        self.assertTrue(football.cancel_task(_task_callback))
+
+    def test_priorities_decide_order_when_workers_are_busy(self) -> None:
+        scheduler = TaskScheduler(max_workers=1)
+        terminate_event = threading.Event()
+        release = threading.Event()
+        order: list[str] = []
+        done = threading.Event()
+
+        def blocker() -> None:
+            release.wait(2)
+
+        def dns() -> None:
+            order.append("dns")
+            done.set()
+
+        def feeds() -> None:
+            order.append("feeds")
+
+        def football() -> None:
+            order.append("football")
+
+        now = datetime.now(timezone.utc)
+        scheduler.schedule_task(now, blocker)
+        scheduler.workload("dns", TaskPriority.LOW).schedule_task(
+            now + timedelta(milliseconds=10), dns
+        )
+        scheduler.workload("feeds", TaskPriority.NORMAL).schedule_task(
+            now + timedelta(milliseconds=20), feeds
+        )
+        scheduler.workload("football", TaskPriority.HIGH).schedule_task(
+            now + timedelta(milliseconds=30), football
+        )
+
+        thread = threading.Thread(target=scheduler.run, args=(terminate_event,))
+        thread.start()
+        try:
+            time.sleep(0.1)
+            self.assertEqual(scheduler.running_task_count(), 1)
+            release.set()
+            self.assertTrue(done.wait(1))
+        finally:
+            terminate_event.set()
+            scheduler.wake()
+            thread.join(2)
+
+        self.assertEqual(order, ["football", "feeds", "dns"])
+
+    def test_deferred_runs_are_kept_per_callback_within_a_shared_key(self) -> None:
+        scheduler = TaskScheduler(max_workers=2)
+        terminate_event = threading.Event()
+        release = threading.Event()
+        calls: list[str] = []
+        both_ran = threading.Event()
+        policy = TaskPolicy(concurrency_key="football", overrun=OverrunPolicy.DEFER)
+
+        def blocker() -> None:
+            release.wait(2)
+
+        def table() -> None:
+            calls.append("table")
+
+        def matches() -> None:
+            calls.append("matches")
+            if "table" in calls:
+                both_ran.set()
+
+        now = datetime.now(timezone.utc)
+        scheduler.schedule_task(now, blocker, policy=policy)
+        scheduler.schedule_task(now + timedelta(milliseconds=10), table, policy=policy)
+        scheduler.schedule_task(now + timedelta(milliseconds=20), matches, policy=policy)
+
+        thread = threading.Thread(target=scheduler.run, args=(terminate_event,))
+        thread.start()
+        try:
+            time.sleep(0.1)
+            self.assertEqual(calls, [])
+            release.set()
+            self.assertTrue(both_ran.wait(1))
+        finally:
+            terminate_event.set()
+            scheduler.wake()
+            thread.join(2)
+
+        self.assertEqual(sorted(calls), ["matches", "table"])
+
+
+class TestSchedulerMetrics(unittest.TestCase):
+    def test_inline_runs_record_lag_duration_and_errors(self) -> None:
+        scheduler = TaskScheduler()
+
+        def failing() -> None:
+            raise RuntimeError("boom")
+
+        scheduler.schedule_task(datetime.now(timezone.utc), _task_callback)
+        scheduler.schedule_task(datetime.now(timezone.utc), failing)
+        time.sleep(0.01)
+        for task in scheduler.get_runnable_tasks():
+            try:
+                scheduler._run_inline(task)
+            except RuntimeError:
+                pass
+
+        snapshot = scheduler.metrics_snapshot()
+        callback_metrics = snapshot[_task_callback.__qualname__]
+        self.assertEqual(callback_metrics.runs, 1)
+        self.assertEqual(callback_metrics.errors, 0)
+        self.assertEqual(callback_metrics.lag.count, 1)
+        self.assertGreaterEqual(callback_metrics.lag.max, 0.01)
+        self.assertEqual(callback_metrics.duration.count, 1)
+        self.assertEqual(snapshot[failing.__qualname__].errors, 1)
+
+    def test_periodic_interval_and_skipped_overruns_are_counted(self) -> None:
+        scheduler = TaskScheduler(max_workers=2)
+        terminate_event = threading.Event()
+        release = threading.Event()
+
+        def slow_periodic() -> None:
+            release.wait(2)
+
+        def quick_periodic() -> None:
+            pass
+
+        now = datetime.now(timezone.utc)
+        scheduler.schedule_task(now, slow_periodic, timedelta(milliseconds=20))
+        scheduler.schedule_task(now, quick_periodic, timedelta(milliseconds=50))
+
+        thread = threading.Thread(target=scheduler.run, args=(terminate_event,))
+        thread.start()
+        try:
+            time.sleep(0.3)
+        finally:
+            release.set()
+            terminate_event.set()
+            thread.join(2)
+
+        snapshot = scheduler.metrics_snapshot()
+        self.assertGreater(snapshot[slow_periodic.__qualname__].skipped, 0)
+
+        quick_metrics = snapshot[quick_periodic.__qualname__]
+        self.assertGreater(quick_metrics.interval.count, 0)
+        self.assertGreaterEqual(quick_metrics.interval.quantile(0.5), 0.025)
+
+    def test_deferred_run_lag_is_measured_from_its_original_due_time(self) -> None:
+        scheduler = TaskScheduler(max_workers=2)
+        terminate_event = threading.Event()
+        release = threading.Event()
+        finished = threading.Event()
+        calls: list[int] = []
+
+        def poll() -> None:
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(2)
+            else:
+                finished.set()
+
+        policy = TaskPolicy(concurrency_key="poll")
+        now = datetime.now(timezone.utc)
+        scheduler.schedule_task(now, poll, policy=policy)
+        scheduler.schedule_task(now + timedelta(milliseconds=20), poll, policy=policy)
+
+        thread = threading.Thread(target=scheduler.run, args=(terminate_event,))
+        thread.start()
+        try:
+            time.sleep(0.2)
+            release.set()
+            self.assertTrue(finished.wait(1))
+        finally:
+            terminate_event.set()
+            scheduler.wake()
+            thread.join(2)
+
+        # The deferred run waited behind the first one for about 180ms
+        lag = scheduler.metrics_snapshot()[poll.__qualname__].lag
+        self.assertEqual(lag.count, 2)
+        self.assertGreaterEqual(lag.max, 0.15)
+
+    def test_summary_is_logged_when_interval_elapses(self) -> None:
+        scheduler = TaskScheduler(metrics_log_interval=timedelta(0))
+        scheduler.schedule_task(datetime.now(timezone.utc), _task_callback)
+        for task in scheduler.get_runnable_tasks():
+            scheduler._run_inline(task)
+
+        with self.assertLogs(level="INFO") as captured:
+            scheduler._metrics.log_summary_if_due()
+
+        self.assertTrue(
+            any(f"Task metrics {_task_callback.__qualname__}: runs=1" in line for line in captured.output)
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import threading
 import time
@@ -5,6 +6,7 @@ from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 
+import aiohttp
 from requests import Session, Response, status_codes
 from requests.exceptions import (
     Timeout,
@@ -20,6 +22,9 @@ FOOTBALL_API_MIN_INTERVAL = timedelta(seconds=4)
 # Temporary — set False once football-data.org rate limiting is verified.
 FOOTBALL_API_REQUEST_LOGGING = False
 _DAILY_BACKOFF_SECONDS = (4, 8, 16, 32, 60)
+# Matches the connect/read Retry on the football requests session; statuses are not retried
+ASYNC_REQUEST_MAX_RETRIES = 2
+ASYNC_REQUEST_BACKOFF_SECONDS = 0.5
 _RATE_LIMIT_HEADER_PREFIXES = ("x-request", "x-ratelimit", "retry-after")
 
 
@@ -136,6 +141,28 @@ class FootballApiRateLimiter:
                     time.sleep(wait_seconds)
             cls._last_request_monotonic = time.monotonic()
 
+    @classmethod
+    async def acquire_async(cls, url: str) -> None:
+        """Reserve the next request slot, then sleep on the event loop until it opens."""
+        with cls._lock:
+            now = time.monotonic()
+            request_at = now
+            if cls._last_request_monotonic is not None:
+                request_at = max(
+                    now,
+                    cls._last_request_monotonic + FOOTBALL_API_MIN_INTERVAL.total_seconds(),
+                )
+            cls._last_request_monotonic = request_at
+
+        wait_seconds = request_at - now
+        if wait_seconds > 0:
+            log_football_api_traffic(
+                "Football API rate limit: waiting %.2fs before GET %s",
+                wait_seconds,
+                url,
+            )
+            await asyncio.sleep(wait_seconds)
+
 
 class DailyApiRetryScheduler:
     """Schedule daily football API tasks with exponential backoff until success."""
@@ -214,6 +241,38 @@ def get_last_football_api_failure() -> FootballApiFailure | None:
     return _last_football_api_failure
 
 
+def _log_failed_status(url: str, status_code: int, headers, is_football_api: bool) -> None:
+    """Log a non-OK response and record a 429 for get_last_football_api_failure."""
+    global _last_football_api_failure
+
+    if status_code == status_codes.codes.too_many_requests:
+        rate_headers = football_api_rate_limit_headers(headers)
+        retry_after = parse_retry_after(headers)
+        _last_football_api_failure = FootballApiFailure(
+            retry_after=retry_after,
+            was_rate_limited=True,
+        )
+        logging.warning(
+            "Football API rate limited (429): GET %s Retry-After=%s headers=%s",
+            url,
+            headers.get("Retry-After", "unknown"),
+            rate_headers or "n/a",
+        )
+    elif is_football_api:
+        logging.error(
+            "Football API request failed: GET %s -> %s headers=%s",
+            url,
+            status_code,
+            football_api_rate_limit_headers(headers) or "n/a",
+        )
+    else:
+        logging.error(
+            "Request to %s failed with status code %s.",
+            url,
+            status_code,
+        )
+
+
 def get_request(url: str, session: Session) -> Response | None:
     """
     Perform a GET request to the specified URL using the provided session.
@@ -233,32 +292,7 @@ def get_request(url: str, session: Session) -> Response | None:
         if response.status_code == status_codes.codes.ok:
             return response
 
-        if response.status_code == status_codes.codes.too_many_requests:
-            rate_headers = football_api_rate_limit_headers(response.headers)
-            retry_after = parse_retry_after(response.headers)
-            _last_football_api_failure = FootballApiFailure(
-                retry_after=retry_after,
-                was_rate_limited=True,
-            )
-            logging.warning(
-                "Football API rate limited (429): GET %s Retry-After=%s headers=%s",
-                url,
-                response.headers.get("Retry-After", "unknown"),
-                rate_headers or "n/a",
-            )
-        elif is_football_api:
-            logging.error(
-                "Football API request failed: GET %s -> %s headers=%s",
-                url,
-                response.status_code,
-                football_api_rate_limit_headers(response.headers) or "n/a",
-            )
-        else:
-            logging.error(
-                "Request to %s failed with status code %s.",
-                url,
-                response.status_code,
-            )
+        _log_failed_status(url, response.status_code, response.headers, is_football_api)
     except Timeout:
         if is_football_api:
             logging.error("Football API request timed out: GET %s", url)
@@ -284,3 +318,62 @@ def get_request(url: str, session: Session) -> Response | None:
             logging.error("An error occurred: %s", req_err)
 
     return None
+
+
+async def get_request_async(url: str, session: aiohttp.ClientSession) -> bytes | None:
+    """
+    Perform a GET request to the specified URL on the event loop.
+    Connect and read failures are retried with backoff, like the requests session.
+    Returns the response body if successful, or None if an error occurs.
+    """
+    global _last_football_api_failure
+    _last_football_api_failure = None
+
+    is_football_api = is_football_data_url(url)
+    if is_football_api:
+        await FootballApiRateLimiter.acquire_async(url)
+        log_football_api_traffic("Football API request: GET %s", url)
+
+    for attempt in range(ASYNC_REQUEST_MAX_RETRIES + 1):
+        if attempt > 0:
+            await asyncio.sleep(ASYNC_REQUEST_BACKOFF_SECONDS * 2 ** (attempt - 1))
+
+        try:
+            started_at = time.monotonic()
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                if is_football_api:
+                    log_football_api_traffic(
+                        "Football API GET %s -> %s (%.0f ms) rate=%s",
+                        url,
+                        response.status,
+                        (time.monotonic() - started_at) * 1000,
+                        football_api_rate_limit_headers(response.headers) or "n/a",
+                    )
+
+                if response.status == status_codes.codes.ok:
+                    return await response.read()
+
+                _log_failed_status(url, response.status, response.headers, is_football_api)
+                return None
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as error:
+            if attempt < ASYNC_REQUEST_MAX_RETRIES:
+                logging.debug("Retrying GET %s after %r", url, error)
+                continue
+
+            if isinstance(error, asyncio.TimeoutError):
+                if is_football_api:
+                    logging.error("Football API request timed out: GET %s", url)
+                else:
+                    logging.error("Request to %s timed out.", url)
+            elif is_football_api:
+                logging.error("Football API connection error: GET %s %s", url, error)
+            else:
+                logging.error("Connection error occurred while trying to reach %s: %s", url, error)
+        except aiohttp.ClientError as req_err:
+            if is_football_api:
+                logging.error("Football API request error: GET %s %s", url, req_err)
+            else:
+                logging.error("An error occurred: %s", req_err)
+            return None
+
+    return None